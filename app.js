@@ -62,6 +62,9 @@ class ATBDashboard {
         };
         this.botTrades = {}; // { botId: [{type:'BUY'|'SELL', index, price, timestamp}] }
         this.botMetrics = {}; // { botId: { qty, avgCost, realizedPnl, dailyRealized, lastReset } }
+        this.syncedTrades = {}; // { botId: number of trades the server journal holds }
+        this.tradeBase = {}; // { botId: journal position of botTrades[botId][0]; older trades stay on the server }
+        this.syncedMetrics = {}; // { botId: JSON of the metrics last saved }
         this.restoreBotState();
         this.restoreBacktestConfigs();
         this.syncBotStateFromServer();
@@ -1425,13 +1428,46 @@ class ATBDashboard {
 
     persistBotState() {
         try {
-            const state = { botTrades: this.botTrades, botMetrics: this.botMetrics };
+            const state = { botTrades: this.botTrades, botMetrics: this.botMetrics, tradeBase: this.tradeBase };
             localStorage.setItem('atb_bot_state', JSON.stringify(state));
-            fetch('/api/bots/state', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(state) })
-                .catch(() => {});
+            const botIds = new Set([...Object.keys(this.botTrades), ...Object.keys(this.botMetrics)]);
+            botIds.forEach(botId => this.persistBotTrades(botId));
         } catch (e) {}
     }
 
+    persistBotTrades(botId) {
+        // Send only the trades past those the server already journaled
+        const trades = this.botTrades[botId] || [];
+        const base = this.tradeBase[botId] || 0;
+        const metrics = this.botMetrics[botId];
+        const metricsJson = JSON.stringify(metrics ?? null);
+        const synced = this.syncedTrades[botId] || 0;
+        if (synced === base + trades.length && this.syncedMetrics[botId] === metricsJson) return;
+        if (synced > base + trades.length && base === 0) {
+            // Trades were cleared locally: replace the bot's journal
+            fetch('/api/bots/state', { method: 'POST', headers: { 'Content-Type': 'application/json' },
+                body: JSON.stringify({ botTrades: { [botId]: trades }, botMetrics: metrics ? { [botId]: metrics } : {} }) })
+                .then(resp => resp.ok ? resp.json() : null)
+                .then(result => {
+                    if (!result) return;
+                    this.syncedTrades[botId] = result.counts[botId];
+                    this.syncedMetrics[botId] = metricsJson;
+                })
+                .catch(() => {});
+            return;
+        }
+        const body = { offset: synced, trades: trades.slice(Math.max(synced - base, 0)) };
+        if (metrics) body.metrics = metrics;
+        fetch(`/api/bots/${encodeURIComponent(botId)}/trades`, { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(body) })
+            .then(resp => resp.json())
+            .then(result => {
+                // A 409 reports how many trades the server holds; the next save resends from there
+                if (typeof result.count === 'number') this.syncedTrades[botId] = result.count;
+                if (result.success) this.syncedMetrics[botId] = metricsJson;
+            })
+            .catch(() => {});
+    }
+
     restoreBotState() {
         try {
             const raw = localStorage.getItem('atb_bot_state');
@@ -1439,6 +1475,7 @@ class ATBDashboard {
             const state = JSON.parse(raw);
             this.botTrades = state.botTrades || {};
             this.botMetrics = state.botMetrics || {};
+            this.tradeBase = state.tradeBase || {};
         } catch (e) {}
     }
 
@@ -1465,12 +1502,20 @@ class ATBDashboard {
 
     async syncBotStateFromServer() {
         try {
-            const resp = await fetch('/api/bots/state');
+            // Only each bot's recent trades are loaded; older ones are paged through /api/bots/trades
+            const resp = await fetch('/api/bots/state?recent=200');
             if (!resp.ok) return;
             const state = await resp.json();
             if (state && typeof state === 'object') {
                 this.botTrades = state.botTrades || this.botTrades;
                 this.botMetrics = state.botMetrics || this.botMetrics;
+                const counts = state.botCounts || {};
+                Object.entries(this.botTrades).forEach(([botId, trades]) => {
+                    const count = counts[botId] ?? trades.length;
+                    this.syncedTrades[botId] = count;
+                    this.tradeBase[botId] = count - trades.length;
+                });
+                Object.entries(this.botMetrics).forEach(([botId, metrics]) => { this.syncedMetrics[botId] = JSON.stringify(metrics); });
             }
         } catch (e) {}
     }
@@ -2642,10 +2687,22 @@ class ATBDashboard {
         w.close();
     }
 
+    async fetchMarketReviewPDF(botId) {
+        // Reports render in the background: start a job, poll it, then download the result
+        const query = botId ? `?bot_id=${encodeURIComponent(botId)}` : '';
+        let job = await fetch(`/api/market-review/jobs${query}`, { method: 'POST' }).then(r => r.json());
+        while (job.status === 'queued' || job.status === 'running') {
+            await new Promise(resolve => setTimeout(resolve, 1000));
+            job = await fetch(job.status_url).then(r => r.json());
+        }
+        if (job.status !== 'done') throw new Error(job.error || 'PDF generation failed');
+        const response = await fetch(job.download_url);
+        if (!response.ok) throw new Error('PDF generation failed');
+        return response.blob();
+    }
+
     downloadBotPDF(botId) {
-        const url = `/api/market-review/pdf?bot_id=${encodeURIComponent(botId)}`;
-        fetch(url)
-            .then(r => { if (r.ok) return r.blob(); throw new Error('PDF generation failed'); })
+        this.fetchMarketReviewPDF(botId)
             .then(blob => {
                 const href = URL.createObjectURL(blob);
                 const a = document.createElement('a');
@@ -3166,14 +3223,7 @@ class ATBDashboard {
         this.showLoadingOverlay();
         
         const botId = this.currentReviewBotId || this.currentBot || '';
-        const url = botId ? `/api/market-review/pdf?bot_id=${encodeURIComponent(botId)}` : '/api/market-review/pdf';
-        fetch(url)
-            .then(response => {
-                if (response.ok) {
-                    return response.blob();
-                }
-                throw new Error('PDF generation failed');
-            })
+        this.fetchMarketReviewPDF(botId)
             .then(blob => {
                 const url = window.URL.createObjectURL(blob);
                 const a = document.createElement('a');
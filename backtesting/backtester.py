@@ -2,32 +2,61 @@
 Backtesting engine for testing trading strategies.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Optional
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import yfinance as yf
+
+from backtesting.ledger import BacktestResult, EquityLedger, TradeLedger
+from backtesting.ohlcv_store import OHLCVStore
+from core.indicators import SMA, RSI, MACD
+from core.indicator_cache import IndicatorCache, fingerprint, get_indicator_cache
+
+
+EXECUTION_MODES = ('vectorized', 'loop')
 
 
 class Backtester:
     """Backtesting engine for trading strategies."""
     
-    def __init__(self, initial_balance: float = 100000.0):
+    # Bars skipped at the start of a run so indicators can stabilize
+    WARMUP_PERIODS = 50
+    # Fixed order size used by the built-in execution engines
+    ORDER_QUANTITY = 100
+    
+    def __init__(self, initial_balance: float = 100000.0, execution_mode: str = 'vectorized',
+                 data_store: Optional[OHLCVStore] = None,
+                 indicator_cache: Optional[IndicatorCache] = None):
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution_mode}'")
+        
         self.initial_balance = initial_balance
+        self.execution_mode = execution_mode
+        self.data_store = data_store
+        self.indicator_cache = indicator_cache if indicator_cache is not None else get_indicator_cache()
         self.current_balance = initial_balance
         self.positions: Dict[str, Dict[str, Any]] = {}
-        self.trades: List[Dict[str, Any]] = []
-        self.equity_curve: List[Dict[str, Any]] = []
+        self.trades = TradeLedger()
+        self.equity_curve = EquityLedger()
         
-    def run_backtest(self, strategy, symbol: str, start_date: str, end_date: str) -> Dict[str, Any]:
+    def run_backtest(self, strategy, symbol: str, start_date: str, end_date: str,
+                     interval: str = '1d') -> Dict[str, Any]:
         """Run backtest for a strategy."""
         try:
-            # Download historical data
-            data = self._get_historical_data(symbol, start_date, end_date)
+            # Load historical data
+            data = self._get_historical_data(symbol, start_date, end_date, interval)
             
             if data.empty:
                 return {"error": f"No data available for {symbol}"}
             
+            return self.run_backtest_on_data(strategy, data, symbol)
+            
+        except Exception as e:
+            return {"error": f"Backtest failed: {str(e)}"}
+    
+    def run_backtest_on_data(self, strategy, data: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Run backtest for a strategy on already loaded historical data."""
+        try:
             # Initialize backtest
             self._initialize_backtest()
             
@@ -35,7 +64,10 @@ class Backtester:
             signals = strategy.generate_signals(data)
             
             # Execute trades based on signals
-            self._execute_trades(signals, data)
+            if self.execution_mode == 'loop':
+                self._execute_trades(signals, data, symbol)
+            else:
+                self._execute_trades_vectorized(signals, data, symbol)
             
             # Calculate performance metrics
             performance = self._calculate_performance()
@@ -45,11 +77,14 @@ class Backtester:
         except Exception as e:
             return {"error": f"Backtest failed: {str(e)}"}
     
-    def _get_historical_data(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
-        """Get historical data from Yahoo Finance."""
+    def _get_historical_data(self, symbol: str, start_date: str, end_date: str,
+                             interval: str = '1d') -> pd.DataFrame:
+        """Get historical data from the local OHLCV store, fetching only missing ranges."""
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(start=start_date, end=end_date)
+            if self.data_store is None:
+                self.data_store = OHLCVStore()
+            
+            data = self.data_store.get(symbol, start_date, end_date, interval)
             
             if data.empty:
                 return pd.DataFrame()
@@ -60,27 +95,26 @@ class Backtester:
             return data
             
         except Exception as e:
-            print(f"Error downloading data for {symbol}: {str(e)}")
+            print(f"Error loading data for {symbol}: {str(e)}")
             return pd.DataFrame()
     
     def _add_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Add technical indicators to the data."""
+        close = data['Close'].to_numpy(dtype=np.float64)
+        close_fingerprint = fingerprint(close)
+        cache = self.indicator_cache
+        
         # Simple Moving Averages
-        data['SMA_20'] = data['Close'].rolling(window=20).mean()
-        data['SMA_50'] = data['Close'].rolling(window=50).mean()
+        data['SMA_20'] = cache.batch(SMA(20), close, data_fingerprint=close_fingerprint)
+        data['SMA_50'] = cache.batch(SMA(50), close, data_fingerprint=close_fingerprint)
         
         # RSI
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['RSI'] = 100 - (100 / (1 + rs))
+        data['RSI'] = cache.batch(RSI(14), close, data_fingerprint=close_fingerprint)
         
         # MACD
-        exp1 = data['Close'].ewm(span=12).mean()
-        exp2 = data['Close'].ewm(span=26).mean()
-        data['MACD'] = exp1 - exp2
-        data['MACD_Signal'] = data['MACD'].ewm(span=9).mean()
+        macd, macd_signal, _ = cache.batch(MACD(12, 26, 9), close, data_fingerprint=close_fingerprint)
+        data['MACD'] = macd
+        data['MACD_Signal'] = macd_signal
         
         return data
     
@@ -88,13 +122,20 @@ class Backtester:
         """Initialize backtest state."""
         self.current_balance = self.initial_balance
         self.positions = {}
-        self.trades = []
-        self.equity_curve = []
+        self.trades = TradeLedger()
+        self.equity_curve = EquityLedger()
     
-    def _execute_trades(self, signals: pd.DataFrame, data: pd.DataFrame):
-        """Execute trades based on signals."""
+    def _execute_trades(self, signals: pd.DataFrame, data: pd.DataFrame, symbol: Optional[str] = None):
+        """Execute trades based on signals.
+        
+        Reference engine: walks every bar and updates state one row at a time.
+        `_execute_trades_vectorized` must produce identical trades and equity.
+        """
+        symbol = symbol or data.index.name
+        self.equity_curve.reserve(len(signals) - self.WARMUP_PERIODS)
+        
         for i in range(len(signals)):
-            if i < 50:  # Skip first 50 periods for indicators to stabilize
+            if i < self.WARMUP_PERIODS:  # Skip first periods for indicators to stabilize
                 continue
                 
             current_date = signals.index[i]
@@ -102,15 +143,90 @@ class Backtester:
             
             # Check for buy signal
             if signals.loc[current_date, 'buy_signal']:
-                self._execute_buy(current_date, data.index.name, current_price, 100)
+                self._execute_buy(current_date, symbol, current_price, self.ORDER_QUANTITY)
             
             # Check for sell signal
             if signals.loc[current_date, 'sell_signal']:
-                self._execute_sell(current_date, data.index.name, current_price)
+                self._execute_sell(current_date, symbol, current_price)
             
             # Update equity curve
             self._update_equity_curve(current_date, current_price)
     
+    def _execute_trades_vectorized(self, signals: pd.DataFrame, data: pd.DataFrame, symbol: Optional[str] = None):
+        """Execute trades based on signals using NumPy arrays.
+        
+        Only bars carrying a buy or sell signal are visited to resolve the
+        cash constraint; cash and position size are then forward-filled across
+        all bars and equity is computed as one array expression.
+        """
+        symbol = symbol or data.index.name
+        dates = signals.index[self.WARMUP_PERIODS:]
+        n_bars = len(dates)
+        
+        if n_bars == 0:
+            return
+        
+        closes = data['Close'].reindex(signals.index).to_numpy(dtype=np.float64)[self.WARMUP_PERIODS:]
+        buys = signals['buy_signal'].to_numpy().astype(bool)[self.WARMUP_PERIODS:]
+        sells = signals['sell_signal'].to_numpy().astype(bool)[self.WARMUP_PERIODS:]
+        
+        # State after each signal bar; slot 0 holds the state before the first bar
+        event_idx = np.flatnonzero(buys | sells)
+        event_cash = np.empty(len(event_idx) + 1, dtype=np.float64)
+        event_quantity = np.empty(len(event_idx) + 1, dtype=np.int64)
+        
+        balance = self.current_balance
+        position = self.positions.get(symbol)
+        quantity = position['quantity'] if position else 0
+        position_cost = position['cost'] if position else 0.0
+        avg_price = position['avg_price'] if position else 0.0
+        event_cash[0] = balance
+        event_quantity[0] = quantity
+        
+        for k, i in enumerate(event_idx, start=1):
+            price = closes[i]
+            
+            if buys[i]:
+                cost = price * self.ORDER_QUANTITY
+                if cost <= balance:
+                    balance -= cost
+                    if quantity > 0:
+                        quantity += self.ORDER_QUANTITY
+                        position_cost += cost
+                        avg_price = position_cost / quantity
+                    else:
+                        quantity = self.ORDER_QUANTITY
+                        position_cost = cost
+                        avg_price = price
+                    self.trades.record_buy(dates[i], symbol, self.ORDER_QUANTITY, price, cost)
+            
+            if sells[i] and quantity > 0:
+                revenue = price * quantity
+                balance += revenue
+                self.trades.record_sell(dates[i], symbol, quantity, price, revenue, revenue - position_cost)
+                quantity = 0
+                position_cost = 0.0
+            
+            event_cash[k] = balance
+            event_quantity[k] = quantity
+        
+        # Forward-fill state from the most recent signal bar and value it
+        state_idx = np.searchsorted(event_idx, np.arange(n_bars), side='right')
+        cash = event_cash[state_idx]
+        equity = cash + event_quantity[state_idx] * closes
+        
+        self.current_balance = balance
+        if quantity > 0:
+            self.positions[symbol] = {
+                'quantity': quantity,
+                'cost': position_cost,
+                'avg_price': avg_price
+            }
+        else:
+            self.positions.pop(symbol, None)
+        
+        self.equity_curve.extend(dates, cash, equity)
+    
     def _execute_buy(self, date, symbol: str, price: float, quantity: int):
         """Execute a buy order."""
         cost = price * quantity
@@ -139,14 +255,7 @@ class Backtester:
             }
         
         # Record trade
-        self.trades.append({
-            'date': date,
-            'symbol': symbol,
-            'side': 'BUY',
-            'quantity': quantity,
-            'price': price,
-            'cost': cost
-        })
+        self.trades.record_buy(date, symbol, quantity, price, cost)
     
     def _execute_sell(self, date, symbol: str, price: float):
         """Execute a sell order."""
@@ -166,15 +275,7 @@ class Backtester:
         del self.positions[symbol]
         
         # Record trade
-        self.trades.append({
-            'date': date,
-            'symbol': symbol,
-            'side': 'SELL',
-            'quantity': quantity,
-            'price': price,
-            'revenue': revenue,
-            'pnl': pnl
-        })
+        self.trades.record_sell(date, symbol, quantity, price, revenue, pnl)
     
     def _update_equity_curve(self, date, current_price: float):
         """Update equity curve."""
@@ -184,53 +285,45 @@ class Backtester:
         for symbol, pos in self.positions.items():
             portfolio_value += pos['quantity'] * current_price
         
-        self.equity_curve.append({
-            'date': date,
-            'balance': self.current_balance,
-            'portfolio_value': portfolio_value,
-            'equity': portfolio_value
-        })
+        self.equity_curve.append(date, self.current_balance, portfolio_value)
     
     def _calculate_performance(self) -> Dict[str, Any]:
-        """Calculate performance metrics."""
-        if not self.equity_curve:
-            return {"error": "No equity curve data"}
+        """Calculate performance metrics.
         
-        # Convert to DataFrame
-        equity_df = pd.DataFrame(self.equity_curve)
-        equity_df.set_index('date', inplace=True)
+        Metrics are computed on the ledger arrays; the per-bar equity records
+        and trade list of the result are only built when read.
+        """
+        if len(self.equity_curve) == 0:
+            return {"error": "No equity curve data"}
         
-        # Calculate returns
-        equity_df['returns'] = equity_df['equity'].pct_change()
+        equity = self.equity_curve.equity
+        n_bars = len(equity)
         
         # Performance metrics
-        total_return = (equity_df['equity'].iloc[-1] - self.initial_balance) / self.initial_balance
-        annualized_return = total_return * (252 / len(equity_df))
-        volatility = equity_df['returns'].std() * np.sqrt(252)
+        total_return = (equity[-1] - self.initial_balance) / self.initial_balance
+        annualized_return = total_return * (252 / n_bars)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = equity[1:] / equity[:-1] - 1
+        volatility = returns.std(ddof=1) * np.sqrt(252) if len(returns) > 1 else np.nan
         sharpe_ratio = annualized_return / volatility if volatility > 0 else 0
         
         # Maximum drawdown
-        equity_df['cummax'] = equity_df['equity'].cummax()
-        equity_df['drawdown'] = (equity_df['equity'] - equity_df['cummax']) / equity_df['cummax']
-        max_drawdown = equity_df['drawdown'].min()
+        peak = np.maximum.accumulate(equity)
+        drawdown = equity - peak
+        drawdown /= peak
+        max_drawdown = drawdown.min()
         
         # Trade statistics
-        if self.trades:
-            trades_df = pd.DataFrame(self.trades)
-            winning_trades = trades_df[trades_df['pnl'] > 0] if 'pnl' in trades_df.columns else pd.DataFrame()
-            win_rate = len(winning_trades) / len(trades_df) if len(trades_df) > 0 else 0
-        else:
-            win_rate = 0
+        total_trades = len(self.trades)
+        win_rate = np.count_nonzero(self.trades.pnl > 0) / total_trades if total_trades > 0 else 0
         
-        return {
+        return BacktestResult({
             "total_return": total_return,
             "annualized_return": annualized_return,
             "volatility": volatility,
             "sharpe_ratio": sharpe_ratio,
             "max_drawdown": max_drawdown,
             "win_rate": win_rate,
-            "total_trades": len(self.trades),
-            "final_balance": equity_df['equity'].iloc[-1],
-            "equity_curve": equity_df.to_dict('records'),
-            "trades": self.trades
-        } 
\ No newline at end of file
+            "total_trades": total_trades,
+            "final_balance": equity[-1]
+        }, self.equity_curve, self.trades)
@@ -0,0 +1,317 @@
+"""
+Columnar trade and equity ledgers backed by growable NumPy structured arrays.
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, Any, Callable, Iterator, List, Optional
+import numpy as np
+import pandas as pd
+
+
+TRADE_DTYPE = np.dtype([
+    ('date', np.int64),          # UTC nanoseconds
+    ('symbol', np.int32),        # index into the ledger's symbol table
+    ('side', np.int8),           # 1 = BUY, -1 = SELL
+    ('quantity', np.int64),
+    ('price', np.float64),
+    ('cost', np.float64),        # BUY only
+    ('revenue', np.float64),     # SELL only
+    ('pnl', np.float64),         # SELL only
+    ('window', np.int32)         # walk-forward window, -1 outside walk-forward runs
+])
+
+EQUITY_DTYPE = np.dtype([
+    ('date', np.int64),          # UTC nanoseconds
+    ('balance', np.float64),
+    ('equity', np.float64)
+])
+
+_SIDES = {1: 'BUY', -1: 'SELL'}
+_MIN_CAPACITY = 64
+
+
+def _timestamp_ns(date) -> int:
+    return pd.Timestamp(date).value
+
+
+class ColumnarLedger:
+    """Append-only structured array that doubles its capacity when full."""
+
+    dtype = None
+
+    def __init__(self, capacity: int = _MIN_CAPACITY):
+        self._data = np.empty(max(capacity, _MIN_CAPACITY), dtype=self.dtype)
+        self._size = 0
+        self.tz = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def reserve(self, capacity: int):
+        """Grow the backing array so it holds at least `capacity` rows."""
+        if capacity > len(self._data):
+            grown = np.empty(max(capacity, 2 * len(self._data)), dtype=self.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+
+    def view(self) -> np.ndarray:
+        """Zero-copy view of the recorded rows."""
+        return self._data[:self._size]
+
+    def _next_row(self) -> int:
+        if self._size == len(self._data):
+            self.reserve(self._size + 1)
+        self._size += 1
+        return self._size - 1
+
+    def _dates(self, values: np.ndarray) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(values.view('datetime64[ns]'))
+        return index.tz_localize('UTC').tz_convert(self.tz) if self.tz is not None else index
+
+    def _track_tz(self, date):
+        if self._size == 0 and self.tz is None:
+            self.tz = getattr(date, 'tzinfo', None)
+
+
+class TradeLedger(ColumnarLedger):
+    """Fills recorded by an execution engine, one row per trade."""
+
+    dtype = TRADE_DTYPE
+
+    def __init__(self, capacity: int = _MIN_CAPACITY):
+        super().__init__(capacity)
+        self.symbols: List[str] = []
+        self._symbol_ids: Dict[str, int] = {}
+
+    def _symbol_id(self, symbol: str) -> int:
+        if symbol not in self._symbol_ids:
+            self._symbol_ids[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return self._symbol_ids[symbol]
+
+    def record_buy(self, date, symbol: str, quantity: int, price: float, cost: float):
+        self._track_tz(date)
+        row = self._next_row()
+        self._data[row] = (_timestamp_ns(date), self._symbol_id(symbol), 1,
+                           quantity, price, cost, np.nan, np.nan, -1)
+
+    def record_sell(self, date, symbol: str, quantity: int, price: float, revenue: float, pnl: float):
+        self._track_tz(date)
+        row = self._next_row()
+        self._data[row] = (_timestamp_ns(date), self._symbol_id(symbol), -1,
+                           quantity, price, np.nan, revenue, pnl, -1)
+
+    def extend(self, other: 'TradeLedger', window: Optional[int] = None):
+        """Append every trade of another ledger, tagged with `window` if given."""
+        rows = other.view().copy()
+        remap = np.array([self._symbol_id(symbol) for symbol in other.symbols], dtype=np.int32)
+        if len(rows):
+            rows['symbol'] = remap[rows['symbol']]
+            if window is not None:
+                rows['window'] = window
+            if self._size == 0 and self.tz is None:
+                self.tz = other.tz
+        self.reserve(self._size + len(rows))
+        self._data[self._size:self._size + len(rows)] = rows
+        self._size += len(rows)
+
+    @property
+    def pnl(self) -> np.ndarray:
+        """Realized P&L of each closed (SELL) trade."""
+        rows = self.view()
+        return rows['pnl'][rows['side'] == -1]
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Trades as a list of dicts, the format of the original trade list."""
+        rows = self.view()
+        dates = self._dates(rows['date'])
+        records = []
+        for date, symbol, side, quantity, price, cost, revenue, pnl, window in zip(
+                dates, rows['symbol'].tolist(), rows['side'].tolist(), rows['quantity'].tolist(),
+                rows['price'].tolist(), rows['cost'].tolist(), rows['revenue'].tolist(), rows['pnl'].tolist(),
+                rows['window'].tolist()):
+            record = {
+                'date': date,
+                'symbol': self.symbols[symbol],
+                'side': _SIDES[side],
+                'quantity': quantity,
+                'price': price
+            }
+            if side == 1:
+                record['cost'] = cost
+            else:
+                record['revenue'] = revenue
+                record['pnl'] = pnl
+            if window >= 0:
+                record['window'] = window
+            records.append(record)
+        return records
+
+    def to_frame(self) -> pd.DataFrame:
+        rows = self.view()
+        frame = pd.DataFrame({
+            'date': self._dates(rows['date']),
+            'symbol': np.array(self.symbols, dtype=object)[rows['symbol']] if self.symbols else [],
+            'side': np.where(rows['side'] == 1, 'BUY', 'SELL'),
+            'quantity': rows['quantity'],
+            'price': rows['price'],
+            'cost': rows['cost'],
+            'revenue': rows['revenue'],
+            'pnl': rows['pnl']
+        })
+        if (rows['window'] >= 0).any():
+            frame['window'] = rows['window']
+        return frame
+
+
+class EquityLedger(ColumnarLedger):
+    """Per-bar cash balance and marked-to-market equity."""
+
+    dtype = EQUITY_DTYPE
+
+    def append(self, date, balance: float, equity: float):
+        self._track_tz(date)
+        row = self._next_row()
+        self._data[row] = (_timestamp_ns(date), balance, equity)
+
+    def extend(self, dates: pd.DatetimeIndex, balance: np.ndarray, equity: np.ndarray):
+        """Append a block of bars at once."""
+        n = len(dates)
+        if n == 0:
+            return
+        if self._size == 0 and self.tz is None:
+            self.tz = dates.tz
+        if dates.tz is not None:
+            dates = dates.tz_convert('UTC').tz_localize(None)
+        self.reserve(self._size + n)
+        block = self._data[self._size:self._size + n]
+        block['date'] = dates.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        block['balance'] = balance
+        block['equity'] = equity
+        self._size += n
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return self._dates(self.view()['date'])
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self.view()['equity']
+
+    def to_series(self) -> pd.Series:
+        return pd.Series(self.equity.copy(), index=self.dates)
+
+    def to_frame(self) -> pd.DataFrame:
+        view = self.view()
+        return pd.DataFrame({
+            'date': self._dates(view['date']),
+            'balance': view['balance'],
+            'portfolio_value': view['equity'],
+            'equity': view['equity']
+        })
+
+    def downsample(self, max_points: int) -> np.ndarray:
+        """Positions of a display subset keeping each bucket's low and high.
+
+        The curve is split into `max_points // 2` buckets and the minimum and
+        maximum equity bar of each is kept, so drawdowns stay visible.
+        """
+        n = self._size
+        if n <= max_points:
+            return np.arange(n)
+        n_buckets = max(1, max_points // 2)
+        equity = self.equity
+        bucket = np.arange(n) * n_buckets // n
+        starts = np.flatnonzero(np.diff(bucket, prepend=-1))
+        keep = []
+        for reducer in (np.minimum, np.maximum):
+            extreme = np.repeat(reducer.reduceat(equity, starts), np.diff(np.append(starts, n)))
+            hits = np.flatnonzero(equity == extreme)
+            _, first = np.unique(bucket[hits], return_index=True)
+            keep.append(hits[first])
+        return np.unique(np.concatenate(keep))
+
+
+class BacktestResult(MutableMapping):
+    """Performance metrics of a backtest with lazily built equity and trade lists.
+
+    Behaves like the original result dict. The `equity_curve` and `trades`
+    entries are only materialized from the ledgers when first read, so a
+    sweep that keeps only metrics never builds per-bar records.
+    """
+
+    def __init__(self, metrics: Dict[str, Any], equity_ledger: EquityLedger, trade_ledger: TradeLedger):
+        self._values: Dict[str, Any] = dict(metrics)
+        self.equity_ledger = equity_ledger
+        self.trade_ledger = trade_ledger
+        self._lazy: Dict[str, Callable[[], Any]] = {
+            'equity_curve': self._equity_records,
+            'trades': trade_ledger.to_records
+        }
+
+    def _equity_records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        # Derived columns are computed over the full curve before selecting rows
+        view = self.equity_ledger.view()
+        equity = view['equity']
+        returns = np.full(len(equity), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = equity[1:] / equity[:-1] - 1
+            cummax = np.maximum.accumulate(equity)
+            drawdown = (equity - cummax) / cummax
+        if rows is None:
+            rows, columns = slice(None), {}
+        else:
+            # A subset of bars is irregularly spaced, so it carries its own dates
+            columns = {'date': self.equity_ledger._dates(view['date'][rows])}
+        return pd.DataFrame({
+            **columns,
+            'balance': view['balance'][rows],
+            'portfolio_value': equity[rows],
+            'equity': equity[rows],
+            'returns': returns[rows],
+            'cummax': cummax[rows],
+            'drawdown': drawdown[rows]
+        }).to_dict('records')
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._values and key in self._lazy:
+            self._values[key] = self._lazy.pop(key)()
+        return self._values[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self._lazy.pop(key, None)
+        self._values[key] = value
+
+    def __delitem__(self, key: str):
+        if key in self._lazy:
+            del self._lazy[key]
+        else:
+            del self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._values
+        yield from list(self._lazy)
+
+    def __len__(self) -> int:
+        return len(self._values) + len(self._lazy)
+
+    def __contains__(self, key) -> bool:
+        return key in self._values or key in self._lazy
+
+    def to_dict(self, max_points: Optional[int] = None, include_trades: bool = True) -> Dict[str, Any]:
+        """Plain dict of the result, optionally with a downsampled equity curve.
+
+        Records of a downsampled curve include each bar's `date`.
+        """
+        result = {key: value for key, value in self._values.items() if key not in ('equity_curve', 'trades')}
+        if max_points is not None and len(self.equity_ledger) > max_points:
+            result['equity_curve'] = self._equity_records(self.equity_ledger.downsample(max_points))
+        else:
+            result['equity_curve'] = self['equity_curve']
+        if include_trades:
+            result['trades'] = self['trades']
+        return result
@@ -0,0 +1,144 @@
+"""
+Monte Carlo robustness analysis of backtest results.
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+from backtesting.ledger import BacktestResult
+
+
+MONTE_CARLO_METHODS = ('block', 'trades')
+
+# Working 8-byte arrays per simulated cell: sample indices, resampled
+# returns, equity path, its running peak and the drawdown temporary
+_ARRAYS_PER_CELL = 5
+
+
+def trade_returns(pnl: np.ndarray, initial_balance: float) -> np.ndarray:
+    """Return of each closed trade relative to account equity before it closed."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    equity_before = initial_balance + np.concatenate(([0.0], np.cumsum(pnl)[:-1]))
+    return pnl / equity_before
+
+
+def block_bootstrap_indices(n_periods: int, n_paths: int, block_size: int,
+                            rng: np.random.Generator) -> np.ndarray:
+    """Circular block bootstrap: each path is a run of random blocks of consecutive periods."""
+    block_size = max(1, min(block_size, n_periods))
+    n_blocks = -(-n_periods // block_size)
+    starts = rng.integers(0, n_periods, size=(n_paths, n_blocks))
+    indices = starts[:, :, np.newaxis] + np.arange(block_size)
+    return indices.reshape(n_paths, -1)[:, :n_periods] % n_periods
+
+
+def path_metrics(returns: np.ndarray, periods_per_year: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Total return, Sharpe ratio and max drawdown of each row of a 2-D return array.
+
+    Metrics follow Backtester._calculate_performance: the Sharpe ratio is the
+    linearly annualized return over annualized volatility.
+    """
+    n_periods = returns.shape[1]
+    equity = np.cumprod(1.0 + returns, axis=1)
+    total_return = equity[:, -1] - 1.0
+
+    annualized_return = total_return * (periods_per_year / n_periods)
+    volatility = returns.std(axis=1, ddof=1) * np.sqrt(periods_per_year) if n_periods > 1 else np.zeros(len(returns))
+    sharpe_ratio = np.divide(annualized_return, volatility, out=np.zeros_like(volatility), where=volatility > 0)
+
+    # Drawdowns measured from the running peak, including the starting equity
+    peak = np.maximum.accumulate(equity, axis=1)
+    np.maximum(peak, 1.0, out=peak)
+    max_drawdown = np.min(equity / peak - 1.0, axis=1)
+    return total_return, sharpe_ratio, max_drawdown
+
+
+class MonteCarloAnalyzer:
+    """Estimates the spread of backtest metrics by resampling its returns.
+
+    `method='block'` block-bootstraps the per-bar equity returns, keeping
+    short-range autocorrelation; `method='trades'` reshuffles closed-trade
+    returns with replacement. Paths are simulated as a 2-D array in chunks
+    sized to `memory_budget_mb`.
+    """
+
+    def __init__(self, n_paths: int = 10000, method: str = 'block', block_size: int = 20,
+                 confidence: float = 0.95, memory_budget_mb: float = 64, seed: Optional[int] = None):
+        if method not in MONTE_CARLO_METHODS:
+            raise ValueError(f"Unknown Monte Carlo method '{method}', expected one of {MONTE_CARLO_METHODS}")
+        self.n_paths = n_paths
+        self.method = method
+        self.block_size = block_size
+        self.confidence = confidence
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.seed = seed
+
+    def analyze(self, performance: BacktestResult, initial_balance: float = 100000.0) -> Dict[str, Any]:
+        """Simulate paths from a `_calculate_performance` result.
+
+        Plain dicts (e.g. `to_dict()` output, which may hold a downsampled
+        curve) are refused; pass their returns to `run_on_returns` instead.
+        """
+        if isinstance(performance, dict) and 'error' in performance:
+            return {"error": performance['error']}
+        if not isinstance(performance, BacktestResult):
+            return {"error": f"Monte Carlo analysis needs a BacktestResult, got {type(performance).__name__}; "
+                             f"use run_on_returns for other inputs"}
+        try:
+            equity = performance.equity_ledger.equity
+            n_bars = len(equity)
+            if self.method == 'block':
+                returns = equity[1:] / equity[:-1] - 1.0
+                periods_per_year = 252
+            else:
+                returns = trade_returns(performance.trade_ledger.pnl, initial_balance)
+                periods_per_year = len(returns) * 252 / n_bars if n_bars else 0
+
+            return self.run_on_returns(returns, periods_per_year)
+
+        except Exception as e:
+            return {"error": f"Monte Carlo analysis failed: {str(e)}"}
+
+    def run_on_returns(self, returns: np.ndarray, periods_per_year: float = 252) -> Dict[str, Any]:
+        """Simulate paths by resampling a 1-D return series."""
+        returns = np.asarray(returns, dtype=np.float64)
+        returns = returns[np.isfinite(returns)]
+        if len(returns) < 2:
+            return {"error": "Not enough returns to resample"}
+
+        rng = np.random.default_rng(self.seed)
+        n_periods = len(returns)
+        chunk_paths = max(1, self.memory_budget_bytes // (_ARRAYS_PER_CELL * 8 * n_periods))
+
+        samples: List[Tuple[np.ndarray, ...]] = []
+        for start in range(0, self.n_paths, chunk_paths):
+            size = min(chunk_paths, self.n_paths - start)
+            if self.method == 'block':
+                indices = block_bootstrap_indices(n_periods, size, self.block_size, rng)
+            else:
+                indices = rng.integers(0, n_periods, size=(size, n_periods))
+            samples.append(path_metrics(returns[indices], periods_per_year))
+
+        simulated = [np.concatenate(column) for column in zip(*samples)]
+        observed = path_metrics(returns[np.newaxis, :], periods_per_year)
+
+        result = {
+            'method': self.method,
+            'n_paths': self.n_paths,
+            'confidence': self.confidence,
+            'probability_of_loss': float(np.mean(simulated[0] < 0))
+        }
+        for name, values, actual in zip(('total_return', 'sharpe_ratio', 'max_drawdown'), simulated, observed):
+            result[name] = self._interval(values, float(actual[0]))
+        return result
+
+    def _interval(self, values: np.ndarray, observed: float) -> Dict[str, float]:
+        tail = (1.0 - self.confidence) / 2 * 100
+        lower, median, upper = np.percentile(values, [tail, 50.0, 100.0 - tail])
+        return {
+            'observed': observed,
+            'mean': float(values.mean()),
+            'median': float(median),
+            'lower': float(lower),
+            'upper': float(upper)
+        }
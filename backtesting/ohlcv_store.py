@@ -0,0 +1,284 @@
+"""
+Persistent on-disk OHLCV store with pluggable market data sources.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+import json
+import os
+import threading
+import uuid
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+DEFAULT_STORE_PATH = Path(__file__).resolve().parents[1] / 'data' / 'ohlcv'
+
+# Attempts to follow meta.json to its arrays while writers keep replacing them
+SNAPSHOT_RETRIES = 5
+
+DateLike = Union[str, datetime, pd.Timestamp]
+
+
+class DataSource(ABC):
+    """Abstract base class for historical bar providers."""
+
+    name = 'source'
+
+    @abstractmethod
+    def fetch(self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """Return OHLCV bars in [start, end) indexed by timestamp."""
+        pass
+
+
+class YFinanceSource(DataSource):
+    """Yahoo Finance bars through yfinance."""
+
+    name = 'yfinance'
+
+    def fetch(self, symbol: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        import yfinance as yf
+
+        ticker = yf.Ticker(symbol)
+        return ticker.history(start=start, end=end, interval=interval)
+
+
+class OHLCVStore:
+    """Columnar OHLCV cache keyed by symbol and interval.
+
+    Each series lives in `<root>/<symbol>/<interval>/` as an int64 nanosecond
+    UTC index, a column-major float64 value matrix and a metadata file listing
+    the date ranges already requested from the source. Reads are served from
+    memory-mapped arrays; only uncovered ranges are fetched.
+
+    Every write puts the arrays in new files named by a fresh version and then
+    swaps in a `meta.json` pointing at them, so readers in other processes
+    always see an index, values and metadata from the same write.
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_PATH, source: Optional[DataSource] = None):
+        self.root = Path(root)
+        self.source = source if source is not None else YFinanceSource()
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, start: DateLike, end: DateLike, interval: str = '1d') -> pd.DataFrame:
+        """Return bars in [start, end), fetching only ranges not yet stored."""
+        start_ts, end_ts = _to_utc(start), _to_utc(end)
+        if end_ts <= start_ts:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        with self._lock:
+            meta = self._read_meta(symbol, interval)
+            missing = _subtract_ranges(start_ts.value, end_ts.value, meta['ranges'])
+            if missing:
+                self._fill(symbol, interval, meta, missing)
+            return self._read(symbol, interval, meta, start_ts.value, end_ts.value)
+
+    def iter_chunks(self, symbol: str, start: DateLike, end: DateLike, interval: str = '1d',
+                    chunk_size: int = 100000) -> Iterator[pd.DataFrame]:
+        """Yield bars in [start, end) as consecutive frames of at most `chunk_size` rows.
+
+        Only the chunk being consumed is paged in from the memory-mapped files,
+        so ranges larger than RAM can be streamed.
+        """
+        start_ts, end_ts = _to_utc(start), _to_utc(end)
+        if end_ts <= start_ts:
+            return
+
+        with self._lock:
+            meta = self._read_meta(symbol, interval)
+            missing = _subtract_ranges(start_ts.value, end_ts.value, meta['ranges'])
+            if missing:
+                self._fill(symbol, interval, meta, missing)
+
+        meta, (index, values) = self._load_snapshot(symbol, interval, meta)
+        lo = int(np.searchsorted(index, start_ts.value, side='left'))
+        hi = int(np.searchsorted(index, end_ts.value, side='left'))
+        for chunk_start in range(lo, hi, chunk_size):
+            yield self._frame(index, values, meta, chunk_start, min(chunk_start + chunk_size, hi))
+
+    def covered_ranges(self, symbol: str, interval: str = '1d') -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """Date ranges already present in the store."""
+        meta = self._read_meta(symbol, interval)
+        return [(pd.Timestamp(lo, tz='UTC'), pd.Timestamp(hi, tz='UTC')) for lo, hi in meta['ranges']]
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        safe_symbol = symbol.replace('/', '_').replace('=', '_').replace('^', '_')
+        return self.root / safe_symbol / interval
+
+    def _read_meta(self, symbol: str, interval: str) -> Dict[str, Any]:
+        meta_path = self._series_dir(symbol, interval) / 'meta.json'
+        if meta_path.exists():
+            try:
+                return json.loads(meta_path.read_text())
+            except Exception:
+                pass
+        return {'ranges': [], 'rows': 0, 'tz': None, 'index_name': None, 'version': None}
+
+    def _fill(self, symbol: str, interval: str, meta: Dict[str, Any], missing: List[Tuple[int, int]]):
+        """Fetch uncovered ranges from the source and merge them into the series."""
+        now_ns = pd.Timestamp.now(tz='UTC').value
+        fetched = []
+        covered_before = [list(r) for r in meta['ranges']]
+        for lo, hi in missing:
+            try:
+                bars = self.source.fetch(symbol, interval, pd.Timestamp(lo, tz='UTC'), pd.Timestamp(hi, tz='UTC'))
+            except Exception as e:
+                print(f"Error fetching {symbol} {interval} from {self.source.name}: {str(e)}")
+                continue
+            if bars is not None and not bars.empty:
+                fetched.append(bars)
+                if meta['tz'] is None and isinstance(bars.index, pd.DatetimeIndex) and bars.index.tz is not None:
+                    meta['tz'] = str(bars.index.tz)
+                if meta['index_name'] is None:
+                    meta['index_name'] = bars.index.name
+            # The current bar may still change, so never mark the future as covered
+            meta['ranges'] = _merge_ranges(meta['ranges'] + [[lo, min(hi, now_ns)]])
+
+        if not fetched and meta['ranges'] == covered_before:
+            return
+
+        try:
+            index, values = self._load_arrays(symbol, interval, meta, mmap=False)
+        except FileNotFoundError:
+            # Another process rewrote the series meanwhile; merge into its version
+            latest = self._read_meta(symbol, interval)
+            meta.update(ranges=_merge_ranges(meta['ranges'] + latest['ranges']),
+                        rows=latest['rows'], version=latest.get('version'))
+            index, values = self._load_arrays(symbol, interval, meta, mmap=False)
+        if fetched:
+            new_index, new_values = _frame_to_arrays(pd.concat(fetched))
+            index = np.concatenate([index, new_index])
+            values = np.concatenate([values, new_values], axis=1)
+            # Sort by time and keep the newest copy of duplicated bars
+            order = np.argsort(index, kind='stable')
+            index, values = index[order], values[:, order]
+            keep = np.ones(len(index), dtype=bool)
+            keep[:-1] = index[1:] != index[:-1]
+            index, values = index[keep], values[:, keep]
+
+        self._write(symbol, interval, meta, index, values)
+
+    @staticmethod
+    def _array_paths(series_dir: Path, version: Optional[str]) -> Tuple[Path, Path]:
+        # Stores written before versioning keep unsuffixed file names
+        suffix = f'-{version}' if version else ''
+        return series_dir / f'index{suffix}.npy', series_dir / f'values{suffix}.npy'
+
+    def _load_arrays(self, symbol: str, interval: str, meta: Dict[str, Any], mmap: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """The arrays of the version `meta` points at; FileNotFoundError if a writer has removed them."""
+        if meta['rows'] == 0:
+            return np.empty(0, dtype=np.int64), np.empty((len(OHLCV_COLUMNS), 0), dtype=np.float64)
+        index_path, values_path = self._array_paths(self._series_dir(symbol, interval), meta.get('version'))
+
+        mode = 'r' if mmap else None
+        index = np.load(index_path, mmap_mode=mode)
+        values = np.load(values_path, mmap_mode=mode)
+        return index, values
+
+    def _load_snapshot(self, symbol: str, interval: str,
+                       meta: Dict[str, Any]) -> Tuple[Dict[str, Any], Tuple[np.ndarray, np.ndarray]]:
+        """Map the arrays `meta` points at, following meta.json if another writer replaced them."""
+        for _ in range(SNAPSHOT_RETRIES):
+            try:
+                return meta, self._load_arrays(symbol, interval, meta)
+            except FileNotFoundError:
+                meta = self._read_meta(symbol, interval)
+        return meta, self._load_arrays(symbol, interval, meta)
+
+    def _write(self, symbol: str, interval: str, meta: Dict[str, Any], index: np.ndarray, values: np.ndarray):
+        """Persist arrays under a new version, then atomically repoint meta.json at them."""
+        series_dir = self._series_dir(symbol, interval)
+        series_dir.mkdir(parents=True, exist_ok=True)
+        previous = self._array_paths(series_dir, meta.get('version'))
+        meta['rows'] = int(len(index))
+        meta['version'] = uuid.uuid4().hex
+
+        for path, array in zip(self._array_paths(series_dir, meta['version']),
+                               (index, np.ascontiguousarray(values))):
+            tmp_path = path.with_name(f'.{path.name}.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+
+        tmp_meta = series_dir / '.meta.json.tmp'
+        tmp_meta.write_text(json.dumps(meta))
+        os.replace(tmp_meta, series_dir / 'meta.json')
+
+        # Readers that already mapped the old version keep their mapping
+        for path in previous:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _read(self, symbol: str, interval: str, meta: Dict[str, Any], start_ns: int, end_ns: int) -> pd.DataFrame:
+        """Slice [start, end) out of the memory-mapped series without copying values."""
+        meta, (index, values) = self._load_snapshot(symbol, interval, meta)
+        lo = int(np.searchsorted(index, start_ns, side='left'))
+        hi = int(np.searchsorted(index, end_ns, side='left'))
+        return self._frame(index, values, meta, lo, hi)
+
+    @staticmethod
+    def _frame(index: np.ndarray, values: np.ndarray, meta: Dict[str, Any], lo: int, hi: int) -> pd.DataFrame:
+        """Wrap rows [lo, hi) of the stored arrays in a DataFrame."""
+        dates = pd.DatetimeIndex(np.asarray(index[lo:hi]).view('datetime64[ns]'), name=meta.get('index_name'))
+        dates = dates.tz_localize('UTC')
+        if meta.get('tz'):
+            dates = dates.tz_convert(meta['tz'])
+
+        # values is (columns, rows); its transpose is the frame's single block
+        return pd.DataFrame(values[:, lo:hi].T, index=dates, columns=OHLCV_COLUMNS, copy=False)
+
+
+def _to_utc(value: DateLike) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize('UTC') if ts.tzinfo is None else ts.tz_convert('UTC')
+
+
+def _frame_to_arrays(bars: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert source bars into the store's index and value arrays."""
+    index = pd.DatetimeIndex(bars.index)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    values = np.vstack([
+        bars[column].to_numpy(dtype=np.float64) if column in bars.columns else np.zeros(len(bars))
+        for column in OHLCV_COLUMNS
+    ])
+    return index.to_numpy(dtype='datetime64[ns]').view(np.int64), values
+
+
+def _merge_ranges(ranges: List[List[int]]) -> List[List[int]]:
+    """Union of half-open ranges, sorted and coalesced."""
+    merged: List[List[int]] = []
+    for lo, hi in sorted(ranges):
+        if hi <= lo:
+            continue
+        if merged and lo <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], hi)
+        else:
+            merged.append([lo, hi])
+    return merged
+
+
+def _subtract_ranges(start: int, end: int, covered: List[List[int]]) -> List[Tuple[int, int]]:
+    """Parts of [start, end) not inside any covered range."""
+    missing = []
+    cursor = start
+    for lo, hi in covered:
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            missing.append((cursor, lo))
+        cursor = max(cursor, hi)
+        if cursor >= end:
+            break
+    if cursor < end:
+        missing.append((cursor, end))
+    return missing
@@ -0,0 +1,189 @@
+"""
+Multi-symbol portfolio backtesting on an aligned price matrix.
+"""
+
+from typing import Dict, Any, Optional, Sequence, Union
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.ohlcv_store import OHLCVStore
+from core.indicator_cache import IndicatorCache
+
+
+# Approximate working bytes per (bar, symbol) cell of one chunk: price matrix,
+# forward-fill temporaries, buy/sell flags and the holdings delta/cumsum.
+_BYTES_PER_CELL = 48
+
+
+class PortfolioBacktester(Backtester):
+    """Backtests one strategy across many symbols sharing a single cash balance.
+
+    Symbols are aligned on the union of their bar timestamps. The timeline is
+    processed in chunks sized to `memory_budget_mb`: each chunk becomes a
+    (bars x symbols) price matrix, orders are resolved only where signals fire,
+    and portfolio equity is the row-wise dot product of holdings and prices.
+    """
+
+    def __init__(self, initial_balance: float = 100000.0, memory_budget_mb: float = 256,
+                 data_store: Optional[OHLCVStore] = None,
+                 indicator_cache: Optional[IndicatorCache] = None):
+        super().__init__(initial_balance=initial_balance, execution_mode='vectorized',
+                         data_store=data_store, indicator_cache=indicator_cache)
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+
+    def run_backtest(self, strategy, symbols: Union[str, Sequence[str]], start_date: str, end_date: str,
+                     interval: str = '1d') -> Dict[str, Any]:
+        """Run a portfolio backtest for a strategy over several symbols."""
+        try:
+            if isinstance(symbols, str):
+                symbols = [symbols]
+
+            data = {}
+            for symbol in symbols:
+                frame = self._get_historical_data(symbol, start_date, end_date, interval)
+                if not frame.empty:
+                    data[symbol] = frame
+
+            if not data:
+                return {"error": f"No data available for {', '.join(symbols)}"}
+
+            return self.run_backtest_on_data(strategy, data)
+
+        except Exception as e:
+            return {"error": f"Backtest failed: {str(e)}"}
+
+    def run_backtest_on_data(self, strategy, data: Dict[str, pd.DataFrame], symbol: Optional[str] = None) -> Dict[str, Any]:
+        """Run a portfolio backtest on already loaded per-symbol frames."""
+        try:
+            self._initialize_backtest()
+
+            signals = {name: strategy.generate_signals(frame) for name, frame in data.items()}
+            self._execute_portfolio(signals, data)
+
+            performance = self._calculate_performance()
+            if 'error' not in performance:
+                performance['symbols'] = list(data.keys())
+            return performance
+
+        except Exception as e:
+            return {"error": f"Backtest failed: {str(e)}"}
+
+    def _chunk_bars(self, n_symbols: int) -> int:
+        return max(1, self.memory_budget_bytes // (_BYTES_PER_CELL * max(1, n_symbols)))
+
+    def _execute_portfolio(self, signals: Dict[str, pd.DataFrame], data: Dict[str, pd.DataFrame]):
+        """Execute trades for every symbol against one shared cash balance."""
+        symbols = list(data.keys())
+        n_symbols = len(symbols)
+        timeline = data[symbols[0]].index
+        for name in symbols[1:]:
+            timeline = timeline.union(data[name].index)
+        n_bars = len(timeline)
+
+        # Per-symbol columns with each bar's row on the common timeline
+        rows, closes, buys, sells = [], [], [], []
+        for name in symbols:
+            frame = data[name]
+            rows.append(timeline.get_indexer(frame.index))
+            closes.append(frame['Close'].to_numpy(dtype=np.float64))
+            buy = signals[name]['buy_signal'].reindex(frame.index).to_numpy().astype(bool)
+            sell = signals[name]['sell_signal'].reindex(frame.index).to_numpy().astype(bool)
+            # Skip each symbol's first periods so its indicators can stabilize
+            buy[:self.WARMUP_PERIODS] = False
+            sell[:self.WARMUP_PERIODS] = False
+            buys.append(buy)
+            sells.append(sell)
+
+        # Per-symbol state as Python lists: scalar access in the event loop is
+        # much cheaper than indexing NumPy arrays element by element
+        balance = self.current_balance
+        quantity = [0] * n_symbols
+        position_cost = [0.0] * n_symbols
+        avg_price = [0.0] * n_symbols
+        last_price = np.full(n_symbols, np.nan)
+        cash = np.empty(n_bars, dtype=np.float64)
+        equity = np.empty(n_bars, dtype=np.float64)
+        chunk_bars = self._chunk_bars(n_symbols)
+
+        for start in range(0, n_bars, chunk_bars):
+            stop = min(start + chunk_bars, n_bars)
+            size = stop - start
+
+            prices = np.full((size, n_symbols), np.nan)
+            buy_flags = np.zeros((size, n_symbols), dtype=bool)
+            sell_flags = np.zeros((size, n_symbols), dtype=bool)
+            for j in range(n_symbols):
+                lo, hi = np.searchsorted(rows[j], [start, stop])
+                chunk_rows = rows[j][lo:hi] - start
+                prices[chunk_rows, j] = closes[j][lo:hi]
+                buy_flags[chunk_rows, j] = buys[j][lo:hi]
+                sell_flags[chunk_rows, j] = sells[j][lo:hi]
+
+            # Carry the last known price of symbols without a bar at this time
+            prices = pd.DataFrame(np.vstack([last_price, prices])).ffill().to_numpy()[1:]
+            last_price = prices[-1].copy()
+
+            # Orders resolve in (bar, symbol) order only where a signal fires
+            event_rows, event_cols = np.nonzero(buy_flags | sell_flags)
+            delta = np.zeros((size, n_symbols), dtype=np.int64)
+            event_cash = np.empty(len(event_rows) + 1, dtype=np.float64)
+            event_cash[0] = balance
+
+            event_dates = timeline[start + event_rows].tolist()
+            event_prices = prices[event_rows, event_cols].tolist()
+            event_buys = buy_flags[event_rows, event_cols].tolist()
+            event_sells = sell_flags[event_rows, event_cols].tolist()
+
+            for k, (r, j) in enumerate(zip(event_rows.tolist(), event_cols.tolist()), start=1):
+                price = event_prices[k - 1]
+                date = event_dates[k - 1]
+
+                if event_buys[k - 1]:
+                    cost = price * self.ORDER_QUANTITY
+                    if cost <= balance:
+                        balance -= cost
+                        if quantity[j] > 0:
+                            quantity[j] += self.ORDER_QUANTITY
+                            position_cost[j] += cost
+                            avg_price[j] = position_cost[j] / quantity[j]
+                        else:
+                            quantity[j] = self.ORDER_QUANTITY
+                            position_cost[j] = cost
+                            avg_price[j] = price
+                        delta[r, j] += self.ORDER_QUANTITY
+                        self.trades.record_buy(date, symbols[j], self.ORDER_QUANTITY, price, cost)
+
+                if event_sells[k - 1] and quantity[j] > 0:
+                    held = quantity[j]
+                    revenue = price * held
+                    balance += revenue
+                    delta[r, j] -= held
+                    self.trades.record_sell(date, symbols[j], held, price, revenue, revenue - position_cost[j])
+                    quantity[j] = 0
+                    position_cost[j] = 0.0
+
+                event_cash[k] = balance
+
+            # Holdings per bar, then equity as a dot product of holdings and prices
+            holdings = np.cumsum(delta, axis=0, out=delta)
+            holdings += (np.asarray(quantity, dtype=np.int64) - holdings[-1])[np.newaxis, :]
+            state_idx = np.searchsorted(event_rows, np.arange(size), side='right')
+            cash[start:stop] = event_cash[state_idx]
+            valuation = np.einsum('ij,ij->i', holdings.astype(np.float64), np.nan_to_num(prices))
+            equity[start:stop] = cash[start:stop] + valuation
+
+        self.current_balance = balance
+        self.positions = {
+            symbols[j]: {
+                'quantity': quantity[j],
+                'cost': position_cost[j],
+                'avg_price': avg_price[j]
+            }
+            for j in range(n_symbols) if quantity[j] > 0
+        }
+
+        # The curve starts once the first symbol is past its warm-up period
+        warm_rows = [r[self.WARMUP_PERIODS] for r in rows if len(r) > self.WARMUP_PERIODS]
+        first = min(warm_rows) if warm_rows else n_bars
+        self.equity_curve.extend(timeline[first:], cash[first:], equity[first:])
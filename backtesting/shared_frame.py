@@ -0,0 +1,95 @@
+"""
+Read-only OHLCV frames shared between processes through shared memory.
+"""
+
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SharedFrameSpec:
+    """Picklable description of a frame published to shared memory."""
+    shm_name: str
+    shape: Tuple[int, int]
+    columns: List[str]
+    index_name: Optional[str]
+    tz: Optional[str]
+
+
+class SharedFrame:
+    """A numeric, datetime-indexed DataFrame backed by one shared memory block.
+
+    The owning process publishes the frame once; worker processes attach to it
+    by name and get a DataFrame whose values are a read-only view of the block,
+    so the data is never pickled per job.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: SharedFrameSpec, owner: bool):
+        self._shm = shm
+        self.spec = spec
+        self.owner = owner
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def publish(cls, data: pd.DataFrame) -> 'SharedFrame':
+        """Copy a frame into a new shared memory block."""
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise ValueError("Shared frames require a DatetimeIndex")
+
+        values = data.to_numpy(dtype=np.float64)
+        index = data.index.tz_convert('UTC') if data.index.tz is not None else data.index
+        index_ns = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+        # Layout: int64 index followed by the row-major float64 values
+        n_rows, n_cols = values.shape
+        shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * n_rows * (n_cols + 1)))
+        np.ndarray((n_rows,), dtype=np.int64, buffer=shm.buf)[:] = index_ns
+        np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=shm.buf, offset=8 * n_rows)[:] = values
+
+        spec = SharedFrameSpec(
+            shm_name=shm.name,
+            shape=(n_rows, n_cols),
+            columns=[str(c) for c in data.columns],
+            index_name=data.index.name,
+            tz=str(data.index.tz) if data.index.tz is not None else None
+        )
+        return cls(shm, spec, owner=True)
+
+    @classmethod
+    def attach(cls, spec: SharedFrameSpec) -> 'SharedFrame':
+        """Attach to a frame published by another process."""
+        shm = shared_memory.SharedMemory(name=spec.shm_name)
+        return cls(shm, spec, owner=False)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """DataFrame view over the shared block (built once per process)."""
+        if self._frame is None:
+            n_rows, n_cols = self.spec.shape
+            index_ns = np.ndarray((n_rows,), dtype=np.int64, buffer=self._shm.buf)
+            values = np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=self._shm.buf, offset=8 * n_rows)
+            values.flags.writeable = False
+
+            index = pd.DatetimeIndex(index_ns.view('datetime64[ns]'), name=self.spec.index_name)
+            if self.spec.tz is not None:
+                index = index.tz_localize('UTC').tz_convert(self.spec.tz)
+
+            self._frame = pd.DataFrame(values, index=index, columns=self.spec.columns, copy=False)
+        return self._frame
+
+    def close(self):
+        """Release this process's mapping and, for the owner, free the block."""
+        self._frame = None
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            self._shm.close()
+        except BufferError:
+            # A caller still holds a view; the mapping is released with it
+            pass
@@ -0,0 +1,206 @@
+"""
+Parallel parameter sweeps over Backtester runs.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional, Callable, Iterator, Sequence, Tuple
+import itertools
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.shared_frame import SharedFrame, SharedFrameSpec
+
+
+# Metrics kept from Backtester._calculate_performance in sweep results
+METRIC_COLUMNS = [
+    'total_return', 'annualized_return', 'volatility', 'sharpe_ratio',
+    'max_drawdown', 'win_rate', 'total_trades', 'final_balance'
+]
+
+
+def grid_samples(param_grid: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Expand a parameter grid into every combination."""
+    names = list(param_grid.keys())
+    return [dict(zip(names, values)) for values in itertools.product(*param_grid.values())]
+
+
+def random_samples(param_space: Dict[str, Any], n_samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Draw independent random parameter sets.
+
+    Each entry of `param_space` is either a list of choices or a `(low, high)`
+    tuple; integer bounds produce integer samples.
+    """
+    rng = np.random.default_rng(seed)
+    unit = rng.random((n_samples, len(param_space)))
+    return _scale_samples(param_space, unit)
+
+
+def latin_hypercube_samples(param_space: Dict[str, Any], n_samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Draw a Latin hypercube design: every dimension is split into `n_samples`
+    strata and each stratum is sampled exactly once."""
+    rng = np.random.default_rng(seed)
+    unit = np.empty((n_samples, len(param_space)))
+    for d in range(len(param_space)):
+        unit[:, d] = (rng.permutation(n_samples) + rng.random(n_samples)) / n_samples
+    return _scale_samples(param_space, unit)
+
+
+def _scale_samples(param_space: Dict[str, Any], unit: np.ndarray) -> List[Dict[str, Any]]:
+    """Map samples from the unit hypercube onto the parameter space."""
+    samples = [{} for _ in range(len(unit))]
+    for d, (name, space) in enumerate(param_space.items()):
+        if isinstance(space, tuple):
+            low, high = space
+            if isinstance(low, int) and isinstance(high, int):
+                values = np.minimum(low + np.floor(unit[:, d] * (high - low + 1)), high).astype(int)
+            else:
+                values = low + unit[:, d] * (high - low)
+            column = values.tolist()
+        else:
+            choices = list(space)
+            picks = np.minimum((unit[:, d] * len(choices)).astype(int), len(choices) - 1)
+            column = [choices[i] for i in picks]
+        for sample, value in zip(samples, column):
+            sample[name] = value
+    return samples
+
+
+# Per-worker state populated by the pool initializer
+_worker_frames: Dict[str, SharedFrame] = {}
+
+
+def _init_worker(specs: Dict[str, SharedFrameSpec]):
+    """Attach a worker process to every shared symbol frame once."""
+    for symbol, spec in specs.items():
+        _worker_frames[symbol] = SharedFrame.attach(spec)
+
+
+@contextmanager
+def shared_executor(data: Dict[str, pd.DataFrame], max_workers: int) -> Iterator[ProcessPoolExecutor]:
+    """Publish symbol frames to shared memory and yield a process pool attached to them."""
+    shared = {symbol: SharedFrame.publish(frame) for symbol, frame in data.items()}
+    try:
+        specs = {symbol: frame.spec for symbol, frame in shared.items()}
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(specs,)) as executor:
+            yield executor
+    finally:
+        for frame in shared.values():
+            frame.close()
+
+
+def _run_job(strategy_cls, base_config: Dict[str, Any], params: Dict[str, Any], symbol: str,
+             initial_balance: float, execution_mode: str, rows: Optional[Tuple[int, int]] = None,
+             include_results: bool = False) -> Dict[str, Any]:
+    """Run one backtest inside a worker against the shared frame.
+
+    `rows` restricts the run to a positional slice of the frame. With
+    `include_results` the equity and trade ledgers are returned as well.
+    """
+    frame = _worker_frames[symbol].frame
+    if rows is not None:
+        frame = frame.iloc[rows[0]:rows[1]]
+    # Shallow copy so columns a strategy adds never touch the shared frame
+    data = frame.copy(deep=False)
+    strategy = strategy_cls({**base_config, **params, 'symbol': symbol})
+    backtester = Backtester(initial_balance=initial_balance, execution_mode=execution_mode)
+    performance = backtester.run_backtest_on_data(strategy, data, symbol)
+
+    row = {'symbol': symbol, **params}
+    if 'error' in performance:
+        row['error'] = performance['error']
+    else:
+        row.update({key: performance[key] for key in METRIC_COLUMNS})
+        if include_results:
+            row['equity_curve'] = backtester.equity_curve
+            row['trades'] = backtester.trades
+    return row
+
+
+class ParameterSweep:
+    """Runs a strategy class over many parameter sets in a process pool.
+
+    Historical data for each symbol is loaded once in the calling process and
+    published to shared memory; workers attach to it when they start, so jobs
+    only carry the parameter set.
+    """
+
+    def __init__(self, strategy_cls, base_config: Optional[Dict[str, Any]] = None,
+                 initial_balance: float = 100000.0, execution_mode: str = 'vectorized',
+                 max_workers: Optional[int] = None):
+        self.strategy_cls = strategy_cls
+        self.base_config = base_config or {}
+        self.initial_balance = initial_balance
+        self.execution_mode = execution_mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop the running sweep; jobs not yet started are dropped."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def load_data(self, symbols: Sequence[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """Load each symbol's history once through the Backtester data path."""
+        loader = Backtester(initial_balance=self.initial_balance)
+        data = {}
+        for symbol in symbols:
+            frame = loader._get_historical_data(symbol, start_date, end_date)
+            if not frame.empty:
+                data[symbol] = frame
+        return data
+
+    def run(self, symbols: Sequence[str], start_date: str, end_date: str,
+            param_sets: Sequence[Dict[str, Any]], **kwargs) -> pd.DataFrame:
+        """Load data for `symbols` and sweep `param_sets` over it."""
+        return self.run_on_data(self.load_data(symbols, start_date, end_date), param_sets, **kwargs)
+
+    def run_on_data(self, data: Dict[str, pd.DataFrame], param_sets: Sequence[Dict[str, Any]],
+                    rank_by: str = 'sharpe_ratio', ascending: bool = False,
+                    progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> pd.DataFrame:
+        """Sweep `param_sets` over preloaded symbol frames.
+
+        `progress_callback(completed, total, row)` is called as each job
+        finishes. Returns one row per completed job, ranked by `rank_by`.
+        """
+        self._cancel_event.clear()
+        jobs = [(params, symbol) for symbol in data for params in param_sets]
+        total = len(jobs)
+        rows: List[Dict[str, Any]] = []
+
+        with shared_executor(data, self.max_workers) as executor:
+            futures = [
+                executor.submit(_run_job, self.strategy_cls, self.base_config, params, symbol,
+                                self.initial_balance, self.execution_mode)
+                for params, symbol in jobs
+            ]
+            for future in as_completed(futures):
+                if future.cancelled():
+                    continue
+                row = future.result()
+                rows.append(row)
+                if progress_callback:
+                    progress_callback(len(rows), total, row)
+                if self.cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        return self._rank(rows, rank_by, ascending)
+
+    @staticmethod
+    def _rank(rows: List[Dict[str, Any]], rank_by: str, ascending: bool) -> pd.DataFrame:
+        """Order results by a metric, best first, with failed runs last."""
+        results = pd.DataFrame(rows)
+        if results.empty or rank_by not in results.columns:
+            return results
+        results = results.sort_values(rank_by, ascending=ascending, na_position='last', kind='stable')
+        results.insert(0, 'rank', np.arange(1, len(results) + 1))
+        return results.reset_index(drop=True)
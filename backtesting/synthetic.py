@@ -0,0 +1,42 @@
+"""
+Deterministic synthetic OHLCV series for benchmarks and tests.
+"""
+
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 0, start: str = '2000-01-03', freq: str = 'min',
+                    initial_price: float = 100.0, drift: float = 0.05, volatility: float = 0.2,
+                    jump_intensity: float = 0.5, jump_mean: float = -0.02, jump_std: float = 0.05,
+                    periods_per_year: Optional[float] = None) -> pd.DataFrame:
+    """Geometric Brownian motion with Poisson-driven log-normal jumps (Merton model).
+
+    `drift`, `volatility` and `jump_intensity` (jumps per year) are annual;
+    `periods_per_year` defaults to the number of `freq` bars in 252 trading
+    days of 6.5 hours, or 252 for daily bars. The same arguments always
+    produce the same frame.
+    """
+    if periods_per_year is None:
+        bar = pd.Timedelta(pd.tseries.frequencies.to_offset(freq).nanos, unit='ns')
+        periods_per_year = 252 if bar >= pd.Timedelta(days=1) else 252 * pd.Timedelta(hours=6.5) / bar
+    dt = 1.0 / periods_per_year
+    rng = np.random.default_rng(seed)
+
+    diffusion = (drift - 0.5 * volatility ** 2) * dt + volatility * np.sqrt(dt) * rng.standard_normal(n_bars)
+    jumps = rng.poisson(jump_intensity * dt, n_bars)
+    jump_sizes = jumps * jump_mean + np.sqrt(jumps) * jump_std * rng.standard_normal(n_bars)
+    close = initial_price * np.exp(np.cumsum(diffusion + jump_sizes))
+
+    open_ = np.empty(n_bars)
+    open_[0] = initial_price
+    open_[1:] = close[:-1]
+    # Intrabar range scales with the bar's volatility
+    spread = np.abs(rng.standard_normal((2, n_bars))) * volatility * np.sqrt(dt) * 0.5
+    high = np.maximum(open_, close) * (1 + spread[0])
+    low = np.minimum(open_, close) * (1 - spread[1])
+    volume = np.round(rng.lognormal(mean=10.0, sigma=0.5, size=n_bars))
+
+    index = pd.date_range(start, periods=n_bars, freq=freq, name='Date')
+    return pd.DataFrame({'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}, index=index)
@@ -0,0 +1,211 @@
+"""
+Walk-forward optimization over rolling train/test windows.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional, Callable, Sequence
+import os
+import threading
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.sweep import METRIC_COLUMNS, ParameterSweep, _run_job, shared_executor
+
+
+@dataclass(frozen=True)
+class WalkForwardWindow:
+    """Positional bar ranges of one train/test split (end exclusive)."""
+    train_start: int
+    train_end: int
+    test_start: int
+    test_end: int
+
+
+def walk_forward_windows(n_bars: int, train_bars: int, test_bars: int, step_bars: Optional[int] = None,
+                         anchored: bool = False) -> List[WalkForwardWindow]:
+    """Split `n_bars` into consecutive train/test windows.
+
+    Each test window follows its train window and windows advance by
+    `step_bars` (default `test_bars`, so out-of-sample periods never overlap).
+    Anchored windows always train from the first bar.
+    """
+    if train_bars <= Backtester.WARMUP_PERIODS:
+        raise ValueError(f"train_bars must exceed the {Backtester.WARMUP_PERIODS} bar warm-up period")
+    if test_bars <= 0:
+        raise ValueError("test_bars must be positive")
+    step_bars = step_bars or test_bars
+
+    windows = []
+    train_end = train_bars
+    while train_end + test_bars <= n_bars:
+        train_start = 0 if anchored else train_end - train_bars
+        windows.append(WalkForwardWindow(train_start, train_end, train_end, train_end + test_bars))
+        train_end += step_bars
+    return windows
+
+
+class WalkForwardOptimizer:
+    """Optimizes strategy parameters on rolling windows and tests them out of sample.
+
+    The symbol's history is loaded once and published to shared memory; every
+    train and test backtest runs in a worker on a zero-copy slice of it. Train
+    runs for all windows are submitted together, and each window's
+    out-of-sample run starts as soon as its own train runs have finished.
+    """
+
+    def __init__(self, strategy_cls, train_bars: int, test_bars: int, step_bars: Optional[int] = None,
+                 anchored: bool = False, base_config: Optional[Dict[str, Any]] = None,
+                 initial_balance: float = 100000.0, execution_mode: str = 'vectorized',
+                 max_workers: Optional[int] = None, rank_by: str = 'sharpe_ratio', ascending: bool = False):
+        self.strategy_cls = strategy_cls
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.step_bars = step_bars
+        self.anchored = anchored
+        self.base_config = base_config or {}
+        self.initial_balance = initial_balance
+        self.execution_mode = execution_mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.rank_by = rank_by
+        self.ascending = ascending
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Stop the running optimization; jobs not yet started are dropped."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def run(self, symbol: str, start_date: str, end_date: str, param_sets: Sequence[Dict[str, Any]],
+            interval: str = '1d', **kwargs) -> Dict[str, Any]:
+        """Load `symbol` once and walk `param_sets` forward over it."""
+        try:
+            data = Backtester(initial_balance=self.initial_balance)._get_historical_data(
+                symbol, start_date, end_date, interval)
+            if data.empty:
+                return {"error": f"No data available for {symbol}"}
+            return self.run_on_data(data, param_sets, symbol, **kwargs)
+
+        except Exception as e:
+            return {"error": f"Walk-forward failed: {str(e)}"}
+
+    def run_on_data(self, data: pd.DataFrame, param_sets: Sequence[Dict[str, Any]], symbol: Optional[str] = None,
+                    progress_callback: Optional[Callable[[int, int, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Walk `param_sets` forward over a preloaded frame.
+
+        `progress_callback(completed, total, row)` is called as each train or
+        test run finishes. The result has the usual performance metrics of the
+        stitched out-of-sample equity curve plus a `windows` frame with the
+        chosen parameters and out-of-sample metrics of every window.
+        """
+        self._cancel_event.clear()
+        symbol = symbol or data.index.name or 'SYMBOL'
+        windows = walk_forward_windows(len(data), self.train_bars, self.test_bars, self.step_bars, self.anchored)
+        if not windows:
+            return {"error": f"Not enough data for a {self.train_bars}/{self.test_bars} bar walk-forward"}
+
+        train_rows: List[List[Dict[str, Any]]] = [[] for _ in windows]
+        best: List[Optional[Dict[str, Any]]] = [None] * len(windows)
+        test_rows: List[Optional[Dict[str, Any]]] = [None] * len(windows)
+        total = len(windows) * (len(param_sets) + 1)
+        completed = 0
+
+        with shared_executor({symbol: data}, self.max_workers) as executor:
+            pending = {}
+            for w, window in enumerate(windows):
+                for params in param_sets:
+                    future = executor.submit(_run_job, self.strategy_cls, self.base_config, params, symbol,
+                                             self.initial_balance, self.execution_mode,
+                                             (window.train_start, window.train_end))
+                    pending[future] = w
+
+            while pending and not self.cancelled:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    w = pending.pop(future)
+                    row = future.result()
+                    completed += 1
+
+                    if len(train_rows[w]) < len(param_sets):
+                        train_rows[w].append(row)
+                        if len(train_rows[w]) == len(param_sets):
+                            best[w] = self._select(train_rows[w])
+                            if best[w] is None:
+                                completed += 1
+                            else:
+                                # Start the test slice one warm-up early so trading begins at test_start
+                                window = windows[w]
+                                rows = (window.test_start - Backtester.WARMUP_PERIODS, window.test_end)
+                                params = {name: best[w][name] for name in param_sets[0]}
+                                test = executor.submit(_run_job, self.strategy_cls, self.base_config, params,
+                                                       symbol, self.initial_balance, self.execution_mode,
+                                                       rows, True)
+                                pending[test] = w
+                    else:
+                        test_rows[w] = row
+
+                    if progress_callback:
+                        progress_callback(completed, total, row)
+
+            for future in pending:
+                future.cancel()
+
+        return self._stitch(data, windows, best, test_rows, list(param_sets[0]) if param_sets else [])
+
+    def _select(self, rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Best train run of a window, or None if every run failed."""
+        ranked = ParameterSweep._rank(rows, self.rank_by, self.ascending)
+        if ranked.empty or self.rank_by not in ranked.columns or pd.isna(ranked[self.rank_by].iloc[0]):
+            return None
+        return ranked.iloc[0].to_dict()
+
+    def _stitch(self, data: pd.DataFrame, windows: List[WalkForwardWindow], best: List[Optional[Dict[str, Any]]],
+                test_rows: List[Optional[Dict[str, Any]]], param_names: List[str]) -> Dict[str, Any]:
+        """Chain the out-of-sample equity curves and summarize every window.
+
+        Each window starts flat with the initial balance; its curve is scaled
+        by the capital carried out of the previous window so returns compound.
+        """
+        index = data.index
+        summary = []
+        capital = self.initial_balance
+        backtester = Backtester(initial_balance=self.initial_balance)
+
+        for w, window in enumerate(windows):
+            entry = {
+                'window': w,
+                'train_start': index[window.train_start],
+                'train_end': index[window.train_end - 1],
+                'test_start': index[window.test_start],
+                'test_end': index[window.test_end - 1]
+            }
+            if best[w] is None:
+                entry['error'] = "No successful train run"
+                summary.append(entry)
+                continue
+
+            entry.update({name: best[w][name] for name in param_names})
+            entry[f'train_{self.rank_by}'] = best[w][self.rank_by]
+            row = test_rows[w]
+            if row is None:
+                entry['error'] = "Cancelled"
+            elif 'error' in row:
+                entry['error'] = row['error']
+            else:
+                entry.update({key: row[key] for key in METRIC_COLUMNS})
+                curve = row['equity_curve']
+                scale = capital / self.initial_balance
+                backtester.equity_curve.extend(curve.dates, curve.view()['balance'] * scale, curve.equity * scale)
+                capital = float(curve.equity[-1] * scale)
+                backtester.trades.extend(row['trades'], window=w)
+            summary.append(entry)
+
+        if len(backtester.equity_curve) == 0:
+            return {"error": "No out-of-sample results", "windows": pd.DataFrame(summary)}
+
+        performance = backtester._calculate_performance()
+        performance['windows'] = pd.DataFrame(summary)
+        return performance
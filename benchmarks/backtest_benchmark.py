@@ -0,0 +1,200 @@
+"""
+Backtest benchmark suite.
+
+Times each stage of a backtest on synthetic OHLCV series and writes a JSON
+report that can be compared across commits:
+
+    python -m benchmarks.backtest_benchmark --sizes 1k,100k,10M --output report.json
+    python -m benchmarks.backtest_benchmark --sizes 1k,100k --compare report.json
+"""
+
+from datetime import datetime
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.synthetic import synthetic_ohlcv
+from core.indicator_cache import IndicatorCache
+from strategies.base_strategy import BaseStrategy
+
+
+DEFAULT_SIZES = (1_000, 100_000, 10_000_000)
+STAGES = ('add_technical_indicators', 'generate_signals', 'execute_trades', 'calculate_performance')
+# The reference loop engine is only timed up to this many bars
+LOOP_MAX_BARS = 100_000
+
+
+class BenchmarkStrategy(BaseStrategy):
+    """SMA crossover on the Backtester indicator columns."""
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        fast, slow = data['SMA_20'], data['SMA_50']
+        signals = pd.DataFrame(index=data.index)
+        signals['buy_signal'] = (fast > slow) & (fast.shift(1) <= slow.shift(1))
+        signals['sell_signal'] = (fast < slow) & (fast.shift(1) >= slow.shift(1))
+        return signals
+
+    def should_buy(self, data: pd.DataFrame) -> bool:
+        return bool(self.generate_signals(data)['buy_signal'].iloc[-1])
+
+    def should_sell(self, data: pd.DataFrame) -> bool:
+        return bool(self.generate_signals(data)['sell_signal'].iloc[-1])
+
+
+def parse_size(text: str) -> int:
+    """Parse sizes such as `1000`, `100k` or `10M`."""
+    multipliers = {'k': 1_000, 'm': 1_000_000}
+    text = text.strip()
+    if text[-1].lower() in multipliers:
+        return int(float(text[:-1]) * multipliers[text[-1].lower()])
+    return int(text)
+
+
+def _measure(func: Callable[[], Any], repeats: int, memory: bool) -> Tuple[float, Optional[int], Any]:
+    """Best wall time over `repeats` runs, then peak traced memory of one more run."""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return best, peak, result
+
+
+def benchmark_size(n_bars: int, engines: Sequence[str], repeats: int = 3, memory: bool = True,
+                   seed: int = 0) -> List[Dict[str, Any]]:
+    """Time every backtest stage on one synthetic series."""
+    data = synthetic_ohlcv(n_bars, seed=seed)
+    strategy = BenchmarkStrategy({})
+    # A zero budget disables memoization so indicator work is measured every run
+    backtester = Backtester(indicator_cache=IndicatorCache(budget_bytes=0))
+    results = []
+
+    def record(stage: str, seconds: float, peak: Optional[int], engine: Optional[str] = None):
+        results.append({'bars': n_bars, 'stage': stage, 'engine': engine, 'seconds': seconds,
+                        'bars_per_second': n_bars / seconds if seconds > 0 else None, 'peak_bytes': peak})
+
+    seconds, peak, data = _measure(lambda: backtester._add_technical_indicators(data.copy()), repeats, memory)
+    record('add_technical_indicators', seconds, peak)
+
+    seconds, peak, signals = _measure(lambda: strategy.generate_signals(data), repeats, memory)
+    record('generate_signals', seconds, peak)
+
+    for engine in engines:
+        if engine == 'loop' and n_bars > LOOP_MAX_BARS:
+            continue
+        execute = backtester._execute_trades if engine == 'loop' else backtester._execute_trades_vectorized
+
+        def execute_trades():
+            backtester._initialize_backtest()
+            execute(signals, data, 'BENCH')
+
+        seconds, peak, _ = _measure(execute_trades, repeats, memory)
+        record('execute_trades', seconds, peak, engine)
+
+        seconds, peak, _ = _measure(backtester._calculate_performance, repeats, memory)
+        record('calculate_performance', seconds, peak, engine)
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(sizes: Sequence[int] = DEFAULT_SIZES, engines: Sequence[str] = ('vectorized', 'loop'),
+                   repeats: int = 3, memory: bool = True, seed: int = 0) -> Dict[str, Any]:
+    """Run the suite and return the JSON-serializable report."""
+    results = []
+    for n_bars in sizes:
+        results.extend(benchmark_size(n_bars, engines, repeats, memory, seed))
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'repeats': repeats,
+            'seed': seed
+        },
+        'results': results
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Time ratio (current / baseline) of every stage present in both reports."""
+    def key(row):
+        return row['bars'], row['stage'], row['engine']
+
+    previous = {key(row): row for row in baseline['results']}
+    rows = []
+    for row in current['results']:
+        before = previous.get(key(row))
+        if before and before['seconds']:
+            rows.append({'bars': row['bars'], 'stage': row['stage'], 'engine': row['engine'],
+                         'baseline_seconds': before['seconds'], 'seconds': row['seconds'],
+                         'ratio': row['seconds'] / before['seconds']})
+    return rows
+
+
+def _print_report(report: Dict[str, Any]):
+    for row in report['results']:
+        stage = row['stage'] + (f" ({row['engine']})" if row['engine'] else '')
+        peak = f"{row['peak_bytes'] / 1024 / 1024:9.1f} MB" if row['peak_bytes'] is not None else ''
+        print(f"{row['bars']:>10,} bars  {stage:<36} {row['seconds']:10.4f} s  {peak}")
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark backtest stages on synthetic data")
+    parser.add_argument('--sizes', default='1k,100k,10M', help="comma separated bar counts, e.g. 1k,100k,10M")
+    parser.add_argument('--engines', default='vectorized,loop', help="execution engines to time")
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak memory run")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks([parse_size(size) for size in args.sizes.split(',')],
+                            [engine.strip() for engine in args.engines.split(',')],
+                            args.repeats, not args.no_memory, args.seed)
+    _print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for row in compare_reports(baseline, report):
+            stage = row['stage'] + (f" ({row['engine']})" if row['engine'] else '')
+            print(f"{row['bars']:>10,} bars  {stage:<36} {row['ratio']:6.2f}x")
+
+
+if __name__ == '__main__':
+    sys.exit(main())
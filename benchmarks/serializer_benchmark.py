@@ -0,0 +1,86 @@
+"""
+Market data serializer benchmark.
+
+Compares the original `iterrows` conversion with the vectorized record and
+columnar serializers on a 5-year hourly series:
+
+    python -m benchmarks.serializer_benchmark --years 5 --output report.json
+"""
+
+from typing import Dict, Any, List, Optional, Sequence
+import argparse
+import json
+import sys
+import time
+import pandas as pd
+
+from backtesting.synthetic import synthetic_ohlcv
+from core.market_data_serializer import frame_to_columns, frame_to_records
+
+
+def iterrows_records(hist: pd.DataFrame) -> List[Dict[str, Any]]:
+    """The per-row conversion the market data routes used before."""
+    data = []
+    for timestamp, row in hist.iterrows():
+        data.append({
+            'time': timestamp.isoformat(),
+            'price': float(row['Close']),
+            'volume': int(row.get('Volume', 0) or 0),
+            'high': float(row['High']),
+            'low': float(row['Low']),
+            'open': float(row['Open'])
+        })
+    return data
+
+
+SERIALIZERS = {
+    'iterrows': iterrows_records,
+    'records': frame_to_records,
+    'columns': frame_to_columns
+}
+
+
+def run_benchmark(years: float = 5, repeats: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """Best-of-`repeats` conversion and JSON encoding time of each serializer."""
+    n_bars = int(years * 365 * 24)
+    hist = synthetic_ohlcv(n_bars, seed=seed, freq='h').tz_localize('UTC').tz_convert('America/New_York')
+    results = []
+    for name, serialize in SERIALIZERS.items():
+        convert = encode = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            payload = serialize(hist)
+            middle = time.perf_counter()
+            body = json.dumps(payload)
+            convert = min(convert, middle - start)
+            encode = min(encode, time.perf_counter() - middle)
+        results.append({'serializer': name, 'convert_seconds': convert, 'encode_seconds': encode,
+                        'json_bytes': len(body)})
+
+    baseline = results[0]['convert_seconds']
+    for row in results:
+        row['speedup'] = baseline / row['convert_seconds'] if row['convert_seconds'] > 0 else None
+    return {'bars': n_bars, 'repeats': repeats, 'results': results}
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark market data serializers")
+    parser.add_argument('--years', type=float, default=5)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--output', help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.years, args.repeats)
+    print(f"{report['bars']:,} hourly bars")
+    for row in report['results']:
+        print(f"{row['serializer']:<10} convert {row['convert_seconds']:8.4f} s  "
+              f"encode {row['encode_seconds']:8.4f} s  {row['json_bytes'] / 1024:9.1f} KB  "
+              f"{row['speedup']:6.1f}x")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
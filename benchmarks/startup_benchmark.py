@@ -0,0 +1,107 @@
+"""
+Web server startup benchmark.
+
+Imports `web_app` in a fresh interpreter under `python -X importtime`,
+reports the slowest imports and fails when startup exceeds its budget or
+pulls in a module that should load on first use:
+
+    python -m benchmarks.startup_benchmark --budget 1.0 --output report.json
+"""
+
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+# Modules the web server imports on first use, never at startup
+DEFERRED_MODULES = ('pandas', 'yfinance', 'reportlab', 'PyQt6')
+DEFAULT_BUDGET = 1.0
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Rows of `-X importtime` output: module, self and cumulative seconds, nesting depth."""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        rows.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_seconds': int(self_us) / 1e6,
+            'cumulative_seconds': int(cumulative_us) / 1e6
+        })
+    return rows
+
+
+def run_importtime(module: str = 'web_app', top: int = 15) -> Dict[str, Any]:
+    """Import `module` in a new interpreter and summarize where the time went.
+
+    The import runs in a scratch directory so the log files it creates stay
+    out of the project.
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [str(PROJECT_ROOT), os.environ.get('PYTHONPATH')]))}
+    code = f"import sys, {module}; print(','.join(name for name in sys.modules))"
+    with tempfile.TemporaryDirectory() as cwd:
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=cwd, env=env,
+                                   capture_output=True, text=True, check=True)
+        wall = time.perf_counter() - start
+
+    rows = parse_importtime(completed.stderr)
+    loaded = set(completed.stdout.strip().split(','))
+    total = next((row['cumulative_seconds'] for row in rows if row['module'] == module), None)
+    return {
+        'module': module,
+        'import_seconds': total,
+        'process_seconds': wall,
+        'deferred_loaded': [name for name in DEFERRED_MODULES if name in loaded],
+        'slowest': sorted(rows, key=lambda row: row['cumulative_seconds'], reverse=True)[:top]
+    }
+
+
+def check_report(report: Dict[str, Any], budget: float = DEFAULT_BUDGET) -> List[str]:
+    """Problems with a startup report; empty when it is within budget."""
+    problems = []
+    if report['deferred_loaded']:
+        problems.append(f"imported at startup: {', '.join(report['deferred_loaded'])}")
+    if report['import_seconds'] is None:
+        problems.append(f"{report['module']} was not imported")
+    elif report['import_seconds'] > budget:
+        problems.append(f"{report['module']} took {report['import_seconds']:.3f} s to import, "
+                        f"over the {budget:.3f} s budget")
+    return problems
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark web server import time")
+    parser.add_argument('--module', default='web_app')
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET, help="seconds allowed for the import")
+    parser.add_argument('--top', type=int, default=15, help="number of slowest imports to list")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    report = run_importtime(args.module, args.top)
+    print(f"{report['module']}: {report['import_seconds']:.3f} s import, "
+          f"{report['process_seconds']:.3f} s interpreter run")
+    for row in report['slowest']:
+        print(f"{row['cumulative_seconds']:8.3f} s  {'  ' * row['depth']}{row['module']}")
+
+    problems = check_report(report, args.budget)
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
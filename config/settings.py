@@ -35,7 +35,24 @@ class Settings:
             "backtesting": {
                 "default_start_date": "2023-01-01",
                 "default_end_date": "2023-12-31",
-                "default_symbols": ["AAPL", "GOOGL", "MSFT", "TSLA"]
+                "default_symbols": ["AAPL", "GOOGL", "MSFT", "TSLA"],
+                "indicator_cache_mb": 256
+            },
+            "market_data": {
+                "fetch_workers": 8,
+                "fetch_timeout": 8.0,
+                "fetch_retries": 2,
+                "retry_backoff": 0.5,
+                "breaker_failures": 3,
+                "breaker_cooldown": 60.0,
+                "timeframe_cache_mb": 64,
+                "timeframe_ttl": {}
+            },
+            "reports": {
+                "workers": 2,
+                "cache_size": 32,
+                "cache_seconds": 3600,
+                "wait_timeout": 60.0
             }
         }
         self.settings = self._load_settings()
@@ -0,0 +1,233 @@
+"""
+Digital Bank asset store: indexed in memory, persisted to SQLite in the background.
+"""
+
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Union
+import csv
+import io
+import sqlite3
+import threading
+import time
+
+
+BANK_FIELDS = ('id', 'name', 'ref', 'qty', 'value')
+
+DEFAULT_BANK_ASSETS = (
+    {'id': 'bank_1', 'name': 'Lamborghini', 'ref': 'LAM-001', 'qty': 1, 'value': 250000.0},
+    {'id': 'bank_2', 'name': 'A Seat in the Kop', 'ref': 'KOP-1892', 'qty': 1, 'value': 50000.0},
+    {'id': 'bank_3', 'name': 'Crypto-currency', 'ref': 'CRY-001', 'qty': 3, 'value': 15000.0},
+)
+
+
+def normalize_asset(asset: Dict[str, Any]) -> Dict[str, Any]:
+    """An asset with exactly the bank fields, typed; raises ValueError on bad numbers."""
+    return {
+        'id': str(asset['id']),
+        'name': str(asset.get('name') or ''),
+        'ref': str(asset.get('ref') or ''),
+        'qty': int(asset.get('qty') or 0),
+        'value': float(asset.get('value') or 0)
+    }
+
+
+def read_assets_csv(source: Union[str, Path, io.TextIOBase]) -> List[Dict[str, Any]]:
+    """Assets from a CSV with an `id,name,ref,qty,value` header; malformed rows are skipped."""
+    if isinstance(source, (str, Path)):
+        with open(source, 'r', newline='') as f:
+            return read_assets_csv(f)
+    assets = []
+    for row in csv.DictReader(source):
+        try:
+            assets.append(normalize_asset(row))
+        except (KeyError, TypeError, ValueError):
+            continue
+    return assets
+
+
+def write_assets_csv(assets: Iterable[Dict[str, Any]], target: io.TextIOBase):
+    writer = csv.writer(target)
+    writer.writerow(BANK_FIELDS)
+    for asset in assets:
+        writer.writerow([asset[field] for field in BANK_FIELDS])
+
+
+class BankAssetStore:
+    """Digital Bank assets kept in memory by id and written behind to SQLite.
+
+    Reads and writes only touch the in-memory index, under one lock, so
+    concurrent requests are serialized and never see a half-written file.
+    Changed ids are queued and a background thread persists them after
+    `flush_delay` seconds, one transaction per batch, so a burst of edits
+    costs one commit and the database is never left half-updated. Repeated
+    edits to one asset within a batch collapse into a single row write.
+    Call `flush()` to wait for pending writes and `close()` on shutdown.
+
+    The first time the database is created it imports `csv_path` if that
+    file exists, otherwise the default assets.
+    """
+
+    def __init__(self, db_path: Union[str, Path], csv_path: Optional[Union[str, Path]] = None,
+                 flush_delay: float = 0.2):
+        self.db_path = Path(db_path)
+        self.flush_delay = flush_delay
+        self._assets: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._writing = False
+        self._closed = False
+        self._error: Optional[Exception] = None
+
+        self._load(Path(csv_path) if csv_path else None)
+        self._writer = threading.Thread(target=self._write_loop, name='bank-store-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connection.execute('CREATE TABLE IF NOT EXISTS bank_assets '
+                           '(id TEXT PRIMARY KEY, name TEXT, ref TEXT, qty INTEGER, value REAL)')
+        return connection
+
+    def _load(self, csv_path: Optional[Path]):
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        try:
+            rows = connection.execute('SELECT id, name, ref, qty, value FROM bank_assets ORDER BY rowid').fetchall()
+            if not rows and not connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'bank_seeded'").fetchone():
+                seed = read_assets_csv(csv_path) if csv_path and csv_path.exists() else DEFAULT_BANK_ASSETS
+                with connection:
+                    connection.executemany('INSERT OR REPLACE INTO bank_assets VALUES (?, ?, ?, ?, ?)',
+                                           [tuple(asset[field] for field in BANK_FIELDS) for asset in seed])
+                    # Remember the import, so deleting every asset does not bring the seed back
+                    connection.execute('CREATE TABLE bank_seeded (at REAL)')
+                rows = connection.execute('SELECT id, name, ref, qty, value FROM bank_assets ORDER BY rowid').fetchall()
+        finally:
+            connection.close()
+        self._assets = {row[0]: dict(zip(BANK_FIELDS, row)) for row in rows}
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(asset) for asset in self._assets.values()]
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            asset = self._assets.get(asset_id)
+            return dict(asset) if asset else None
+
+    def add(self, asset: Dict[str, Any]) -> Dict[str, Any]:
+        """Insert or replace an asset by id."""
+        asset = normalize_asset(asset)
+        with self._lock:
+            self._assets[asset['id']] = asset
+            self._queue(asset['id'], asset)
+        return dict(asset)
+
+    def update(self, asset_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply field changes to an asset; None if it does not exist."""
+        with self._lock:
+            current = self._assets.get(asset_id)
+            if current is None:
+                return None
+            fields = {field: changes[field] for field in BANK_FIELDS[1:] if field in changes}
+            asset = normalize_asset({**current, **fields})
+            self._assets[asset_id] = asset
+            self._queue(asset_id, asset)
+        return dict(asset)
+
+    def delete(self, asset_id: str) -> bool:
+        with self._lock:
+            if self._assets.pop(asset_id, None) is None:
+                return False
+            self._queue(asset_id, None)
+        return True
+
+    def import_csv(self, source: Union[str, Path, io.TextIOBase]) -> int:
+        """Add or replace the assets of a CSV file; returns how many were imported."""
+        assets = read_assets_csv(source)
+        with self._lock:
+            for asset in assets:
+                self._assets[asset['id']] = asset
+                self._queue(asset['id'], asset)
+        return len(assets)
+
+    def export_csv(self) -> str:
+        """All assets as CSV text."""
+        buffer = io.StringIO()
+        write_assets_csv(self.list(), buffer)
+        return buffer.getvalue()
+
+    def _queue(self, asset_id: str, asset: Optional[Dict[str, Any]]):
+        if self._closed:
+            raise RuntimeError("Bank asset store is closed")
+        self._pending[asset_id] = asset
+        self._changed.notify_all()
+
+    def _write_loop(self):
+        connection = self._connect()
+        try:
+            while True:
+                with self._lock:
+                    while not self._pending and not self._closed:
+                        self._changed.wait()
+                    if not self._pending and self._closed:
+                        return
+                # Let a burst of edits accumulate into one transaction
+                if not self._closed:
+                    time.sleep(self.flush_delay)
+                with self._lock:
+                    batch, self._pending = self._pending, {}
+                    self._writing = True
+                try:
+                    self._persist(connection, batch)
+                    self._error = None
+                except sqlite3.Error as e:
+                    self._error = e
+                    if self._closed:
+                        return
+                    with self._lock:
+                        # Keep the failed changes unless newer ones replaced them
+                        self._pending = {**batch, **self._pending}
+                    time.sleep(1.0)
+                finally:
+                    with self._lock:
+                        self._writing = False
+                        self._changed.notify_all()
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _persist(connection: sqlite3.Connection, batch: Dict[str, Optional[Dict[str, Any]]]):
+        upserts = [tuple(asset[field] for field in BANK_FIELDS) for asset in batch.values() if asset]
+        deletes = [(asset_id,) for asset_id, asset in batch.items() if asset is None]
+        with connection:
+            connection.executemany(
+                'INSERT INTO bank_assets (id, name, ref, qty, value) VALUES (?, ?, ?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET name = excluded.name, ref = excluded.ref, '
+                'qty = excluded.qty, value = excluded.value', upserts)
+            connection.executemany('DELETE FROM bank_assets WHERE id = ?', deletes)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every change so far is persisted; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while self._pending or self._writing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 10.0):
+        """Persist pending changes and stop the writer thread."""
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+        self._writer.join(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'assets': len(self._assets), 'pending': len(self._pending),
+                    'last_error': str(self._error) if self._error else None}
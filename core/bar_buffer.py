@@ -0,0 +1,147 @@
+"""
+Fixed-capacity ring buffer of OHLCV bars keyed by timestamp.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Any, List, Optional, Tuple
+import threading
+import numpy as np
+
+from core.lazy_imports import lazy_import
+from core.market_data_serializer import bars_to_columns, columns_to_records
+
+pd = lazy_import('pandas')
+
+
+BAR_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class BarRingBuffer:
+    """The most recent `capacity` bars of one symbol in NumPy arrays.
+
+    Every slot is written twice, at `i` and `i + capacity`, so the stored
+    bars are always one contiguous slice of the backing arrays and reads are
+    zero-copy views. Updates only append bars newer than the last stored one
+    and overwrite the last bar in place while it is still forming.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._times = np.empty(2 * capacity, dtype=np.int64)
+        self._values = np.empty((len(BAR_COLUMNS), 2 * capacity), dtype=np.float64)
+        self._start = 0
+        self._size = 0
+        self.tz = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """UTC nanoseconds of the newest bar."""
+        return int(self._times[self._start + self._size - 1]) if self._size else None
+
+    def update_frame(self, hist: pd.DataFrame) -> int:
+        """Merge an OHLCV frame; returns the number of bars appended."""
+        values = np.vstack([
+            hist[column].to_numpy(dtype=np.float64) if column in hist.columns else np.zeros(len(hist))
+            for column in BAR_COLUMNS
+        ])
+        return self.update(hist.index, values)
+
+    def update(self, index: pd.DatetimeIndex, values: np.ndarray) -> int:
+        """Merge bars given as a (5, n) Open/High/Low/Close/Volume array.
+
+        Bars at or before the newest stored bar are ignored, except one with
+        the same timestamp, which replaces it.
+        """
+        if len(index) == 0:
+            return 0
+        times = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        if not np.all(times[1:] > times[:-1]):
+            # Sort and keep the last of any duplicate timestamps
+            order = np.argsort(times, kind='stable')
+            times, values = times[order], values[:, order]
+            keep = np.append(times[1:] != times[:-1], True)
+            times, values = times[keep], values[:, keep]
+
+        with self._lock:
+            if self.tz is None:
+                self.tz = index.tz
+            last = self.last_time
+            if last is not None:
+                current = np.flatnonzero(times == last)
+                if len(current):
+                    slot = (self._start + self._size - 1) % self.capacity
+                    self._write(np.array([slot]), times[current], values[:, current])
+                first_new = np.searchsorted(times, last, side='right')
+                times, values = times[first_new:], values[:, first_new:]
+
+            appended = len(times)
+            if appended > self.capacity:
+                times, values = times[-self.capacity:], values[:, -self.capacity:]
+            n = len(times)
+            if n:
+                slots = (self._start + self._size + np.arange(n)) % self.capacity
+                self._write(slots, times, values)
+                overflow = max(0, self._size + n - self.capacity)
+                self._start = (self._start + overflow) % self.capacity
+                self._size = min(self._size + n, self.capacity)
+            return appended
+
+    def _write(self, slots: np.ndarray, times: np.ndarray, values: np.ndarray):
+        for offset in (0, self.capacity):
+            self._times[slots + offset] = times
+            self._values[:, slots + offset] = values
+
+    def view(self, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> Dict[str, np.ndarray]:
+        """Zero-copy views of the bars with `start <= time <= end`.
+
+        The views alias the buffer, so they change when new bars arrive;
+        copy them if they must outlive the next update.
+        """
+        lo, hi = self._start, self._start + self._size
+        times = self._times[lo:hi]
+        if start is not None:
+            lo += np.searchsorted(times, self._to_ns(start), side='left')
+        if end is not None:
+            hi = self._start + np.searchsorted(times, self._to_ns(end), side='right')
+        hi = max(lo, hi)
+        window = {'time': self._times[lo:hi]}
+        for row, column in enumerate(BAR_COLUMNS):
+            window[column] = self._values[row, lo:hi]
+        return window
+
+    def _to_ns(self, timestamp) -> int:
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp.tzinfo is None and self.tz is not None:
+            timestamp = timestamp.tz_localize(self.tz)
+        return timestamp.value
+
+    def copy(self, start=None, end=None) -> Tuple[np.ndarray, np.ndarray]:
+        """Times and a (5, n) value array of the bars in a window, copied out of the buffer."""
+        with self._lock:
+            window = self.view(start, end)
+            times = window['time'].copy()
+            values = np.vstack([window[column] for column in BAR_COLUMNS])
+        return times, values
+
+    def index(self, times: np.ndarray) -> pd.DatetimeIndex:
+        """DatetimeIndex in the buffer's time zone for UTC nanosecond times."""
+        index = pd.DatetimeIndex(times.view('datetime64[ns]'))
+        if self.tz is not None:
+            index = index.tz_localize('UTC').tz_convert(self.tz)
+        return index
+
+    def to_columns(self, start=None, end=None) -> Dict[str, List[Any]]:
+        """Bars in the dashboard's columnar format, one list per field."""
+        with self._lock:
+            window = self.view(start, end)
+            return bars_to_columns(self.index(window['time']), window['Open'], window['High'],
+                                   window['Low'], window['Close'], window['Volume'])
+
+    def to_records(self, start=None, end=None) -> List[Dict[str, Any]]:
+        """Bars in the dashboard's `{time, price, volume, high, low, open}` format."""
+        return columns_to_records(self.to_columns(start, end))
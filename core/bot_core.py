@@ -0,0 +1,140 @@
+"""
+Qt-free bot bookkeeping shared by the desktop bot manager and the web server.
+"""
+
+from typing import Dict, Any, List, Optional
+import random
+import time
+
+from core.indicators import IndicatorSet
+
+
+DEFAULT_BOT_CONFIG = {
+    "strategy": "Simple MA",
+    "symbol": "AAPL",
+    "active": False,
+    "paper_trading": True,
+    "risk_per_trade": 2
+}
+
+SAMPLE_BOTS = {
+    "AAPL_MA_Bot": {"strategy": "Simple MA", "symbol": "AAPL", "risk_per_trade": 2},
+    "GOOGL_RSI_Bot": {"strategy": "RSI", "symbol": "GOOGL", "risk_per_trade": 1.5},
+    "TSLA_MACD_Bot": {"strategy": "MACD", "symbol": "TSLA", "risk_per_trade": 3}
+}
+
+
+class BotRegistry:
+    """Bot configurations, their active flags and simulated trading.
+
+    Holds no timers or threads; the caller decides when bots run.
+    """
+
+    def __init__(self, log_manager, sample_bots: bool = True):
+        self.log_manager = log_manager
+        self.bots: Dict[str, Dict[str, Any]] = {}
+        self.bot_indicators: Dict[str, IndicatorSet] = {}
+        if sample_bots:
+            for bot_name, config in SAMPLE_BOTS.items():
+                self.add_bot(bot_name, config)
+
+    def add_bot(self, bot_name: str, config: Dict[str, Any]):
+        """Add a new bot."""
+        try:
+            if bot_name in self.bots:
+                raise ValueError(f"Bot '{bot_name}' already exists")
+            self.bots[bot_name] = {**DEFAULT_BOT_CONFIG, "created": time.time(), **config}
+            self.log_manager.log_info(f"Added bot: {bot_name}")
+        except Exception as e:
+            self.log_manager.log_error(f"Error adding bot '{bot_name}': {str(e)}")
+            raise
+
+    def remove_bot(self, bot_name: str):
+        """Remove a bot."""
+        try:
+            if bot_name not in self.bots:
+                raise ValueError(f"Bot '{bot_name}' does not exist")
+            del self.bots[bot_name]
+            self.bot_indicators.pop(bot_name, None)
+            self.log_manager.log_info(f"Removed bot: {bot_name}")
+        except Exception as e:
+            self.log_manager.log_error(f"Error removing bot '{bot_name}': {str(e)}")
+            raise
+
+    def set_active(self, bot_name: str, active: bool):
+        """Mark a bot started or stopped."""
+        if bot_name not in self.bots:
+            raise ValueError(f"Bot '{bot_name}' does not exist")
+        self.bots[bot_name]["active"] = active
+        self.bots[bot_name]["started" if active else "stopped"] = time.time()
+
+    def is_bot_active(self, bot_name: str) -> bool:
+        """Check if a bot is active."""
+        return bot_name in self.bots and self.bots[bot_name].get("active", False)
+
+    def get_bot(self, bot_name: str) -> Dict[str, Any]:
+        """Get bot information."""
+        if bot_name not in self.bots:
+            raise ValueError(f"Bot '{bot_name}' does not exist")
+        return self.bots[bot_name].copy()
+
+    def get_all_bots(self) -> Dict[str, Dict[str, Any]]:
+        """Get all bots."""
+        return {name: config.copy() for name, config in self.bots.items()}
+
+    def get_active_bots(self) -> List[str]:
+        """Get list of active bot names."""
+        return [name for name, config in self.bots.items() if config.get("active", False)]
+
+    def update_bot_config(self, bot_name: str, config: Dict[str, Any]):
+        """Update bot configuration."""
+        try:
+            if bot_name not in self.bots:
+                raise ValueError(f"Bot '{bot_name}' does not exist")
+
+            # Don't allow config changes while bot is running
+            if self.is_bot_active(bot_name):
+                raise ValueError(f"Cannot update config while bot '{bot_name}' is running")
+
+            self.bots[bot_name].update(config)
+            self.log_manager.log_info(f"Updated config for bot: {bot_name}")
+        except Exception as e:
+            self.log_manager.log_error(f"Error updating bot config '{bot_name}': {str(e)}")
+            raise
+
+    def simulate_trading(self, bot_name: str) -> Optional[Dict[str, Any]]:
+        """Advance a bot by one simulated bar; returns the trade it made, if any."""
+        config = self.bots[bot_name]
+        symbol = config.get("symbol", "AAPL")
+        strategy = config.get("strategy", "Simple MA")
+
+        # Simulate price movement
+        price_change = random.uniform(-2.0, 2.0)
+        current_price = 100 + price_change
+
+        # Advance streaming indicators by one bar
+        indicators = self.bot_indicators.setdefault(bot_name, IndicatorSet())
+        indicator_values = indicators.update(current_price)
+
+        trade_info = None
+        if random.random() < 0.1:  # 10% chance of trade signal
+            trade_type = random.choice(["BUY", "SELL"])
+            quantity = random.randint(1, 10)
+            trade_info = {
+                "type": trade_type,
+                "symbol": symbol,
+                "quantity": quantity,
+                "price": current_price,
+                "timestamp": time.time(),
+                "strategy": strategy,
+                "indicators": indicator_values
+            }
+            self.log_manager.log_info(
+                f"Bot '{bot_name}' {trade_type} {quantity} {symbol} @ ${current_price:.2f}"
+            )
+
+        # Log periodic status
+        self.log_manager.log_info(
+            f"Bot '{bot_name}' monitoring {symbol} - Current price: ${current_price:.2f}"
+        )
+        return trade_info
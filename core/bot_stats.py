@@ -0,0 +1,105 @@
+"""
+Running totals of bot statistics for the dashboard summary.
+"""
+
+from typing import Dict, Any, Iterable, Tuple
+import threading
+
+
+class BotStatsAggregator:
+    """Portfolio-wide bot totals kept current as bots change.
+
+    Changes to a bot's active flag or stats go through this class, which
+    applies them to the bot dict and adjusts the totals by the difference,
+    so reading the totals costs the same however many bots there are.
+    `version` increases with every change, letting callers push totals only
+    when they moved.
+    """
+
+    def __init__(self):
+        self.total_pnl = 0.0
+        self.daily_pnl = 0.0
+        self.active_bots = 0
+        self.total_trades = 0
+        self.bot_count = 0
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def rebuild(self, bots: Iterable[Dict[str, Any]]):
+        """Recompute the totals from scratch."""
+        with self._lock:
+            self.total_pnl = self.daily_pnl = 0.0
+            self.active_bots = self.total_trades = self.bot_count = 0
+            for bot in bots:
+                self._add(bot, 1)
+            self.version += 1
+
+    @staticmethod
+    def _contribution(bot: Dict[str, Any]) -> Tuple[float, float, int, int]:
+        stats = bot['stats']
+        return (float(stats['total_pnl']), float(stats['daily_pnl']), int(stats['trades_count']),
+                int(bool(bot['active'])))
+
+    def _apply(self, contribution: Tuple[float, float, int, int], sign: int):
+        total_pnl, daily_pnl, trades_count, active = contribution
+        self.total_pnl += sign * total_pnl
+        self.daily_pnl += sign * daily_pnl
+        self.total_trades += sign * trades_count
+        self.active_bots += sign * active
+        self.bot_count += sign
+
+    def _add(self, bot: Dict[str, Any], sign: int):
+        self._apply(self._contribution(bot), sign)
+
+    def add_bot(self, bot: Dict[str, Any]):
+        with self._lock:
+            self._add(bot, 1)
+            self.version += 1
+
+    def remove_bot(self, bot: Dict[str, Any]):
+        with self._lock:
+            self._add(bot, -1)
+            self.version += 1
+
+    def update_bot(self, bot: Dict[str, Any], changes: Dict[str, Any]):
+        """Apply arbitrary field changes to a bot, e.g. a configuration update.
+
+        Changes that would leave the bot without valid stats raise before
+        the bot or the totals are touched.
+        """
+        with self._lock:
+            new = self._contribution({**bot, **changes})
+            old = self._contribution(bot)
+            bot.update(changes)
+            self._apply(old, -1)
+            self._apply(new, 1)
+            self.version += 1
+
+    def set_active(self, bot: Dict[str, Any], active: bool):
+        with self._lock:
+            if bool(bot['active']) != active:
+                self.active_bots += 1 if active else -1
+                self.version += 1
+            bot['active'] = active
+
+    def record_trade(self, bot: Dict[str, Any], pnl: float = 0.0, daily_pnl: float = 0.0):
+        """Count one trade for a bot and add its P&L."""
+        with self._lock:
+            stats = bot['stats']
+            stats['total_pnl'] += pnl
+            stats['daily_pnl'] += daily_pnl
+            stats['trades_count'] += 1
+            self.total_pnl += pnl
+            self.daily_pnl += daily_pnl
+            self.total_trades += 1
+            self.version += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The totals served by /api/stats."""
+        with self._lock:
+            return {
+                'total_pnl': self.total_pnl,
+                'daily_pnl': self.daily_pnl,
+                'active_bots': self.active_bots,
+                'total_trades': self.total_trades
+            }
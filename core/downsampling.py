@@ -0,0 +1,116 @@
+"""
+Reduce bar series to about as many points as a chart can show.
+
+Two methods:
+
+    lttb    Largest-Triangle-Three-Buckets on the close: keeps the real bars
+            that best preserve the line's visual shape
+    minmax  Merges consecutive bars into one candle per bucket, keeping
+            each bucket's first open, highest high, lowest low and last close
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+
+from core.market_data_serializer import BAR_FIELDS
+from core.timeframes import aggregate_bars
+
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+# LTTB always keeps the first and last point plus one per bucket
+MIN_POINTS = 3
+
+
+def lttb_indices(y: np.ndarray, max_points: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """Positions of the points Largest-Triangle-Three-Buckets keeps.
+
+    The interior points are split into `max_points - 2` buckets and each
+    bucket keeps the point forming the largest triangle with the point kept
+    in the previous bucket and the average of the next bucket. The triangle
+    terms of every point are computed up front; only the argmax per bucket
+    runs in sequence, since it depends on the previous choice.
+    """
+    n = len(y)
+    if max_points >= n or n <= 2:
+        return np.arange(n)
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+    if x is None:
+        x = np.arange(n, dtype=np.float64)
+    else:
+        # Rescale to 0..n-1: the chosen points are unchanged and nanosecond
+        # timestamps no longer swamp the area terms with rounding error
+        x = np.asarray(x, dtype=np.float64)
+        span = x[-1] - x[0]
+        x = (x - x[0]) * ((n - 1) / span) if span > 0 else np.arange(n, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    n_buckets = max_points - 2
+    edges = (np.arange(n_buckets + 1) * (n - 2)) // n_buckets
+    counts = np.diff(edges)
+    px, py = x[1:-1], y[1:-1]
+    mean_x = np.add.reduceat(px, edges[:-1]) / counts
+    mean_y = np.add.reduceat(py, edges[:-1]) / counts
+    # The point after the last bucket is the final point
+    cx = np.repeat(np.append(mean_x[1:], x[-1]), counts)
+    cy = np.repeat(np.append(mean_y[1:], y[-1]), counts)
+
+    # Twice the triangle area with A = (ax, ay) is |ax * u + ay * v + w|
+    u = py - cy
+    v = cx - px
+    w = px * cy - cx * py
+
+    kept = np.empty(n_buckets, dtype=np.int64)
+    ax, ay = x[0], y[0]
+    for bucket in range(n_buckets):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        area = np.abs(ax * u[lo:hi] + ay * v[lo:hi] + w[lo:hi])
+        chosen = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        kept[bucket] = chosen
+        ax, ay = px[chosen], py[chosen]
+    return np.concatenate(([0], kept + 1, [n - 1]))
+
+
+def minmax_buckets(n: int, max_points: int) -> np.ndarray:
+    """Start positions of `max_points` nearly equal buckets of `n` bars."""
+    if max_points >= n:
+        return np.arange(n)
+    if max_points < 1:
+        raise ValueError("max_points must be positive")
+    return (np.arange(max_points) * n) // max_points
+
+
+def downsample_bars(values: np.ndarray, max_points: int, method: str = 'lttb',
+                    x: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a (5, n) Open/High/Low/Close/Volume array to at most `max_points` bars.
+
+    Returns the position each output bar is labelled with and the output
+    values: the kept bars for `lttb`, one merged candle per bucket for
+    `minmax`.
+    """
+    n = values.shape[1]
+    if method == 'lttb':
+        positions = lttb_indices(values[3], max_points, x)
+        return positions, values[:, positions]
+    if method == 'minmax':
+        positions = minmax_buckets(n, max_points)
+        if len(positions) == n:
+            return positions, values
+        return positions, aggregate_bars(values, positions)
+    raise ValueError(f"Unknown downsampling method: {method}. Use one of {', '.join(DOWNSAMPLE_METHODS)}")
+
+
+def downsample_records(records: List[Dict[str, Any]], max_points: int,
+                       method: str = 'lttb') -> List[Dict[str, Any]]:
+    """Downsample bars in the dashboard's `{time, price, volume, high, low, open}` format."""
+    if len(records) <= max_points:
+        return records
+    values = np.array([[bar['open'], bar['high'], bar['low'], bar['price'], bar['volume']]
+                       for bar in records], dtype=np.float64).T
+    positions, values = downsample_bars(values, max_points, method)
+    if method == 'lttb':
+        return [records[i] for i in positions]
+    volumes = values[4].astype(np.int64).tolist()
+    return [dict(zip(BAR_FIELDS, bar)) for bar in zip(
+        [records[i]['time'] for i in positions], values[3].tolist(), volumes,
+        values[1].tolist(), values[2].tolist(), values[0].tolist())]
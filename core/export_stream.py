@@ -0,0 +1,143 @@
+"""
+Streaming data export as newline-delimited JSON, optionally gzipped.
+
+An export is a sequence of records, one JSON object per line, each tagged
+with its `type` and carrying the exported object under `data`:
+
+    export  the first line: when the export was made and its filters
+    bot     one per dashboard bot, with its `id`
+    bar     one per cached market data bar, with its `asset`
+    ticker  one per asset's latest ticker, with its `asset`
+    trade   one per journaled bot trade, with its `bot_id`
+
+Records are produced one at a time from the live caches and encoded in
+fixed-size chunks, so an export holds about one chunk in memory whatever
+the amount of history.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Any, Callable, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Tuple
+import json
+import zlib
+
+
+EXPORT_SECTIONS = ('bots', 'market_data', 'ticker_data', 'trades')
+EXPORT_FORMATS = ('ndjson', 'gzip')
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_time_ms(raw: str, name: str = 'time') -> float:
+    """Epoch milliseconds of a number of milliseconds or an ISO 8601 time."""
+    try:
+        return float(raw)
+    except ValueError:
+        pass
+    try:
+        parsed = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    except ValueError:
+        raise ValueError(f"{name} must be epoch milliseconds or an ISO 8601 time, got {raw}")
+    return parsed.timestamp() * 1000.0
+
+
+def _bar_ms(bar: Dict[str, Any]) -> float:
+    return datetime.fromisoformat(bar['time']).timestamp() * 1000.0
+
+
+@dataclass(frozen=True)
+class ExportFilter:
+    """Which sections, assets and time range an export covers."""
+    sections: Tuple[str, ...] = EXPORT_SECTIONS
+    assets: Optional[FrozenSet[str]] = None  # None for every asset
+    start: Optional[float] = None  # epoch milliseconds
+    end: Optional[float] = None
+
+    @classmethod
+    def from_args(cls, args: Mapping[str, str]) -> 'ExportFilter':
+        """A filter from `sections`, `assets` (comma-separated), `start` and `end` query parameters.
+
+        Raises ValueError on unknown sections or malformed times.
+        """
+        sections = EXPORT_SECTIONS
+        if args.get('sections'):
+            sections = tuple(section.strip() for section in args['sections'].split(',') if section.strip())
+            unknown = [section for section in sections if section not in EXPORT_SECTIONS]
+            if unknown:
+                raise ValueError(f"Unknown sections: {', '.join(unknown)}. Use {', '.join(EXPORT_SECTIONS)}")
+        assets = None
+        if args.get('assets'):
+            assets = frozenset(asset.strip().upper() for asset in args['assets'].split(',') if asset.strip())
+        start = parse_time_ms(args['start'], 'start') if args.get('start') else None
+        end = parse_time_ms(args['end'], 'end') if args.get('end') else None
+        return cls(sections, assets, start, end)
+
+    def includes_asset(self, asset: str) -> bool:
+        return self.assets is None or asset.upper() in self.assets
+
+    def describe(self) -> Dict[str, Any]:
+        return {'sections': list(self.sections),
+                'assets': sorted(self.assets) if self.assets is not None else None,
+                'start': self.start, 'end': self.end}
+
+
+def bars_in_range(bars: List[Dict[str, Any]], start: Optional[float], end: Optional[float]) -> range:
+    """Positions of the time-sorted bars with `start <= time <= end` (epoch milliseconds)."""
+    lo = 0 if start is None else bisect_left(bars, start, key=_bar_ms)
+    hi = len(bars) if end is None else bisect_right(bars, end, key=_bar_ms)
+    return range(lo, max(lo, hi))
+
+
+def export_records(export_filter: ExportFilter, bots: Mapping[str, Dict[str, Any]],
+                   market_data: Mapping[str, List[Dict[str, Any]]], ticker_data: Mapping[str, Dict[str, Any]],
+                   trades: Optional[Callable[[Optional[float], Optional[float]], Iterable[Dict[str, Any]]]] = None,
+                   timestamp: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """The export's records, read lazily from the given caches.
+
+    `trades(start, end)` yields journaled trades in a time range. Bar lists
+    are iterated in place rather than copied; the dashboard replaces them
+    wholesale on update, so each list stays consistent while it is read.
+    """
+    yield {'type': 'export', 'timestamp': timestamp or datetime.now().isoformat(), **export_filter.describe()}
+    if 'bots' in export_filter.sections:
+        for bot_id, bot in list(bots.items()):
+            if export_filter.includes_asset(str(bot.get('asset', ''))):
+                yield {'type': 'bot', 'id': bot_id, 'data': bot}
+    if 'market_data' in export_filter.sections:
+        for asset, bars in list(market_data.items()):
+            if not export_filter.includes_asset(asset):
+                continue
+            for i in bars_in_range(bars, export_filter.start, export_filter.end):
+                yield {'type': 'bar', 'asset': asset, 'data': bars[i]}
+    if 'ticker_data' in export_filter.sections:
+        for asset, ticker in list(ticker_data.items()):
+            if export_filter.includes_asset(asset):
+                yield {'type': 'ticker', 'asset': asset, 'data': ticker}
+    if 'trades' in export_filter.sections and trades is not None:
+        for trade in trades(export_filter.start, export_filter.end):
+            yield {'type': 'trade', 'bot_id': trade.pop('bot_id', None), 'data': trade}
+
+
+def ndjson_chunks(records: Iterable[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Records as UTF-8 JSON lines, batched into chunks of about `chunk_size` bytes."""
+    lines: List[str] = []
+    size = 0
+    for record in records:
+        line = json.dumps(record, separators=(',', ':'), default=str) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield ''.join(lines).encode('utf-8')
+            lines, size = [], 0
+    if lines:
+        yield ''.join(lines).encode('utf-8')
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """A gzip stream of the chunks, compressed incrementally."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,116 @@
+"""
+Memoization of batch indicator series keyed by data fingerprint and parameters.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import hashlib
+import threading
+import numpy as np
+
+from core.indicators import Indicator
+
+
+DEFAULT_BUDGET_MB = 256
+
+
+def fingerprint(*arrays) -> str:
+    """Content hash identifying the input series of an indicator."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        values = np.ascontiguousarray(array, dtype=np.float64)
+        digest.update(str(values.shape).encode())
+        digest.update(memoryview(values).cast('B'))
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """LRU cache of indicator outputs bounded by a memory budget.
+
+    Entries are keyed by (data fingerprint, indicator name, parameters), so any
+    strategy or backtest asking for the same indicator over the same series
+    shares one computed result. Cached arrays are read-only.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._entries: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self._sizes: Dict[Tuple, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def batch(self, indicator: Indicator, *arrays, data_fingerprint: Optional[str] = None):
+        """Return `indicator.batch(*arrays)`, computing it only on a cache miss.
+
+        Pass `data_fingerprint` when the same inputs feed several indicators to
+        hash them only once.
+        """
+        if data_fingerprint is None:
+            data_fingerprint = fingerprint(*arrays)
+        key = (data_fingerprint, type(indicator).__name__, indicator.params)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = indicator.batch(*arrays)
+        outputs = result if isinstance(result, tuple) else (result,)
+        for output in outputs:
+            output.flags.writeable = False
+
+        self._store(key, result, sum(output.nbytes for output in outputs))
+        return result
+
+    def _store(self, key: Tuple, result: Any, size: int):
+        with self._lock:
+            if size > self.budget_bytes or key in self._entries:
+                return
+            self._entries[key] = result
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.budget_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and memory usage."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'budget_bytes': self.budget_bytes
+            }
+
+
+# Process-wide cache shared by backtests and strategies
+_indicator_cache = None
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """Return the shared indicator cache, sized from the backtesting settings."""
+    global _indicator_cache
+    if _indicator_cache is None:
+        from config.settings import get_setting
+        budget_mb = get_setting('backtesting.indicator_cache_mb', DEFAULT_BUDGET_MB)
+        _indicator_cache = IndicatorCache(int(budget_mb * 1024 * 1024))
+    return _indicator_cache
@@ -0,0 +1,410 @@
+"""
+Technical indicators with a vectorized batch mode and an O(1) streaming mode.
+
+Every indicator can compute a whole series at once with `batch(...)` or be
+advanced one bar at a time with `update(...)`; both modes produce the same
+numbers, so backtests and live bots share one definition of each indicator.
+Missing bars (NaN) are treated the way pandas treats them in batch mode.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Any, Optional, Tuple
+import math
+import numpy as np
+
+from core.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+NAN = float('nan')
+
+# Streaming window sums are recomputed exactly every `period * _RESYNC_FACTOR`
+# updates so floating point drift cannot accumulate on long-running feeds.
+_RESYNC_FACTOR = 64
+
+
+def _series(values) -> pd.Series:
+    return pd.Series(np.asarray(values, dtype=np.float64))
+
+
+class Indicator(ABC):
+    """Abstract base class for indicators."""
+
+    @property
+    @abstractmethod
+    def params(self) -> Tuple:
+        """Parameters that determine the indicator's output."""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Clear streaming state."""
+        pass
+
+    @abstractmethod
+    def batch(self, *args):
+        """Compute the indicator over whole arrays."""
+        pass
+
+    @abstractmethod
+    def update(self, *args):
+        """Advance the indicator by one bar and return its current value."""
+        pass
+
+
+class SMA(Indicator):
+    """Simple moving average; NaN while any bar in the window is missing."""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.reset()
+
+    @property
+    def params(self) -> Tuple:
+        return (self.period,)
+
+    def reset(self):
+        self._window: deque = deque(maxlen=self.period)
+        self._sum = 0.0
+        self._nans = 0
+        self._updates = 0
+        self.value = NAN
+
+    def batch(self, values) -> np.ndarray:
+        return _series(values).rolling(window=self.period).mean().to_numpy()
+
+    def update(self, x: float) -> float:
+        # Missing bars are counted rather than summed so they cannot poison the sum
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            if math.isnan(oldest):
+                self._nans -= 1
+            else:
+                self._sum -= oldest
+        self._window.append(x)
+        if math.isnan(x):
+            self._nans += 1
+        else:
+            self._sum += x
+
+        self._updates += 1
+        if self._updates % (self.period * _RESYNC_FACTOR) == 0:
+            self._sum = math.fsum(v for v in self._window if not math.isnan(v))
+
+        full = len(self._window) == self.period and self._nans == 0
+        self.value = self._sum / self.period if full else NAN
+        return self.value
+
+
+class EMA(Indicator):
+    """Exponential moving average.
+
+    With `adjust=True` (the pandas default) early values are normalised by the
+    sum of weights seen so far; with `adjust=False` it is the plain recursion.
+    A missing bar leaves the value unchanged but still decays the weight of
+    earlier bars, as pandas does by default.
+    """
+
+    def __init__(self, span: float, adjust: bool = True):
+        self.span = span
+        self.adjust = adjust
+        # Same derivation as pandas so both modes use an identical alpha
+        self.alpha = 1.0 / (1.0 + (span - 1) / 2.0)
+        self.reset()
+
+    @property
+    def params(self) -> Tuple:
+        return (self.span, self.adjust)
+
+    def reset(self):
+        self._numerator = 0.0
+        self._weight = 0.0
+        # Weight of the current value relative to the next bar (adjust=False)
+        self._carry = 1.0
+        self.value = NAN
+
+    def batch(self, values) -> np.ndarray:
+        return _series(values).ewm(span=self.span, adjust=self.adjust).mean().to_numpy()
+
+    def update(self, x: float) -> float:
+        decay = 1.0 - self.alpha
+        if math.isnan(x):
+            self._numerator *= decay
+            self._weight *= decay
+            if not math.isnan(self.value):
+                self._carry *= decay
+        elif self.adjust:
+            self._numerator = x + decay * self._numerator
+            self._weight = 1.0 + decay * self._weight
+            self.value = self._numerator / self._weight
+        elif math.isnan(self.value):
+            self.value = x
+        else:
+            carry = self._carry * decay
+            self.value = (carry * self.value + self.alpha * x) / (carry + self.alpha)
+            self._carry = 1.0
+        return self.value
+
+
+class RSI(Indicator):
+    """Relative strength index from simple moving averages of gains and losses."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.reset()
+
+    @property
+    def params(self) -> Tuple:
+        return (self.period,)
+
+    def reset(self):
+        self._gains = SMA(self.period)
+        self._losses = SMA(self.period)
+        self._previous: Optional[float] = None
+        self.value = NAN
+
+    def batch(self, values) -> np.ndarray:
+        delta = _series(values).diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=self.period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=self.period).mean()
+        rs = gain / loss
+        return (100 - (100 / (1 + rs))).to_numpy()
+
+    def update(self, x: float) -> float:
+        # The first bar has no change and counts as neither gain nor loss
+        delta = x - self._previous if self._previous is not None else 0.0
+        self._previous = x
+
+        gain = self._gains.update(delta if delta > 0 else 0.0)
+        loss = self._losses.update(-delta if delta < 0 else 0.0)
+
+        if math.isnan(gain) or math.isnan(loss):
+            self.value = NAN
+        elif loss == 0:
+            self.value = 100.0 if gain > 0 else NAN
+        else:
+            self.value = 100 - (100 / (1 + gain / loss))
+        return self.value
+
+
+class MACD(Indicator):
+    """Moving average convergence divergence: (macd, signal, histogram)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.reset()
+
+    @property
+    def params(self) -> Tuple:
+        return (self.fast, self.slow, self.signal)
+
+    def reset(self):
+        self._fast = EMA(self.fast)
+        self._slow = EMA(self.slow)
+        self._signal = EMA(self.signal)
+        self.value = (NAN, NAN, NAN)
+
+    def batch(self, values) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        close = _series(values)
+        macd = close.ewm(span=self.fast).mean() - close.ewm(span=self.slow).mean()
+        signal = macd.ewm(span=self.signal).mean()
+        return macd.to_numpy(), signal.to_numpy(), (macd - signal).to_numpy()
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        macd = self._fast.update(x) - self._slow.update(x)
+        signal = self._signal.update(macd)
+        self.value = (macd, signal, macd - signal)
+        return self.value
+
+
+class BollingerBands(Indicator):
+    """Bollinger bands: (middle, upper, lower) using the sample standard deviation.
+
+    NaN while any bar in the window is missing; the running moments are
+    rebuilt from the window once the missing bar has left it.
+    """
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.period = period
+        self.num_std = num_std
+        self.reset()
+
+    @property
+    def params(self) -> Tuple:
+        return (self.period, self.num_std)
+
+    def reset(self):
+        self._window: deque = deque(maxlen=self.period)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._nans = 0
+        self._stale = False
+        self._updates = 0
+        self.value = (NAN, NAN, NAN)
+
+    def batch(self, values) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        close = _series(values)
+        middle = close.rolling(window=self.period).mean()
+        std = close.rolling(window=self.period).std()
+        return (middle.to_numpy(), (middle + self.num_std * std).to_numpy(),
+                (middle - self.num_std * std).to_numpy())
+
+    def _resync(self):
+        window = np.fromiter(self._window, dtype=np.float64)
+        self._mean = window.mean()
+        self._m2 = float(((window - self._mean) ** 2).sum())
+
+    def update(self, x: float) -> Tuple[float, float, float]:
+        full = len(self._window) == self.period
+        oldest = self._window[0] if full else 0.0
+        self._window.append(x)
+        self._nans += math.isnan(x) - (full and math.isnan(oldest))
+
+        if self._nans:
+            self._stale = True
+        elif self._stale:
+            self._resync()
+            self._stale = False
+        elif not full:
+            # Welford's algorithm over a sliding window
+            n = len(self._window)
+            delta = x - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (x - self._mean)
+        else:
+            previous_mean = self._mean
+            self._mean += (x - oldest) / self.period
+            self._m2 += (x - oldest) * (x - self._mean + oldest - previous_mean)
+
+        self._updates += 1
+        if self._updates % (self.period * _RESYNC_FACTOR) == 0 and not self._nans:
+            self._resync()
+
+        if len(self._window) < self.period or self._nans:
+            self.value = (NAN, NAN, NAN)
+        else:
+            std = math.sqrt(max(self._m2, 0.0) / (self.period - 1))
+            self.value = (self._mean, self._mean + self.num_std * std, self._mean - self.num_std * std)
+        return self.value
+
+
+class ATR(Indicator):
+    """Average true range with Wilder smoothing, seeded by the first `period` true ranges.
+
+    A bar with missing prices keeps the previous value and the last known
+    close; missing true ranges are left out of the seed.
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.reset()
+
+    @property
+    def params(self) -> Tuple:
+        return (self.period,)
+
+    def reset(self):
+        self._previous_close: Optional[float] = None
+        self._seed_sum = 0.0
+        self._seed_count = 0
+        self._count = 0
+        # Wilder smoothing is an EMA with alpha = 1 / period
+        self._smoothing = EMA(2 * self.period - 1, adjust=False)
+        self.value = NAN
+
+    def batch(self, high, low, close) -> np.ndarray:
+        high = np.asarray(high, dtype=np.float64)
+        low = np.asarray(low, dtype=np.float64)
+        close = np.asarray(close, dtype=np.float64)
+
+        previous_close = np.concatenate([[np.nan], pd.Series(close).ffill().to_numpy()[:-1]])
+        true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+        atr = np.full(len(close), np.nan)
+        if len(close) >= self.period:
+            seed = true_range[:self.period]
+            seed = seed[~np.isnan(seed)]
+            seeded = true_range[self.period - 1:].copy()
+            seeded[0] = seed.mean() if len(seed) else np.nan
+            atr[self.period - 1:] = pd.Series(seeded).ewm(alpha=1.0 / self.period, adjust=False).mean().to_numpy()
+        return atr
+
+    def update(self, high: float, low: float, close: float) -> float:
+        ranges = [high - low]
+        if self._previous_close is not None:
+            ranges += [abs(high - self._previous_close), abs(low - self._previous_close)]
+        ranges = [r for r in ranges if not math.isnan(r)]
+        true_range = max(ranges) if ranges else NAN
+        if not math.isnan(close):
+            self._previous_close = close
+
+        self._count += 1
+        if self._count <= self.period:
+            if not math.isnan(true_range):
+                self._seed_sum += true_range
+                self._seed_count += 1
+            if self._count == self.period:
+                seed = self._seed_sum / self._seed_count if self._seed_count else NAN
+                self.value = self._smoothing.update(seed)
+        else:
+            self.value = self._smoothing.update(true_range)
+        return self.value
+
+
+class IndicatorSet:
+    """The standard indicator bundle tracked per symbol by bots.
+
+    Feed it one completed bar at a time with `update`; `snapshot` returns the
+    latest values in a JSON-friendly dict (warming-up values are None).
+    """
+
+    def __init__(self):
+        self.sma_20 = SMA(20)
+        self.sma_50 = SMA(50)
+        self.ema_20 = EMA(20)
+        self.rsi = RSI(14)
+        self.macd = MACD(12, 26, 9)
+        self.bollinger = BollingerBands(20, 2.0)
+        self.atr = ATR(14)
+        self.bars = 0
+
+    def update(self, close: float, high: Optional[float] = None, low: Optional[float] = None) -> Dict[str, Any]:
+        """Advance every indicator by one bar and return the snapshot."""
+        high = close if high is None else high
+        low = close if low is None else low
+
+        self.sma_20.update(close)
+        self.sma_50.update(close)
+        self.ema_20.update(close)
+        self.rsi.update(close)
+        self.macd.update(close)
+        self.bollinger.update(close)
+        self.atr.update(high, low, close)
+        self.bars += 1
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        macd, signal, histogram = self.macd.value
+        middle, upper, lower = self.bollinger.value
+        values = {
+            'sma_20': self.sma_20.value,
+            'sma_50': self.sma_50.value,
+            'ema_20': self.ema_20.value,
+            'rsi': self.rsi.value,
+            'macd': macd,
+            'macd_signal': signal,
+            'macd_histogram': histogram,
+            'bb_middle': middle,
+            'bb_upper': upper,
+            'bb_lower': lower,
+            'atr': self.atr.value
+        }
+        snapshot = {key: (None if math.isnan(value) else float(value)) for key, value in values.items()}
+        snapshot['bars'] = self.bars
+        return snapshot
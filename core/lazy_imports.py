@@ -0,0 +1,36 @@
+"""
+Modules imported on first use, to keep heavy libraries off the startup path.
+"""
+
+import importlib
+import threading
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module until one of its attributes is first read.
+
+    The real module is imported then, through the normal import system, so
+    concurrent first uses from several threads import it once. Its
+    attributes are then copied onto the stand-in so later reads cost the
+    same as on the module itself.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attr: str):
+        # Only called for attributes not copied over yet
+        with self._lazy_lock:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self.__name__!r}>"
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """A module that is imported the first time one of its attributes is used."""
+    return LazyModule(name)
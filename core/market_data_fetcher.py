@@ -0,0 +1,182 @@
+"""
+Concurrent market data fetching with timeouts, retries and circuit breaking.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Any, Callable, Optional, Sequence
+import threading
+import time
+
+from core.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+# How often the coordinator re-checks running fetches against their timeout
+_POLL_INTERVAL = 0.05
+
+
+def yfinance_history(symbol: str, timeout: float) -> pd.DataFrame:
+    """Today's one-minute bars for a symbol from Yahoo Finance."""
+    import yfinance as yf
+    return yf.Ticker(symbol).history(period="1d", interval="1m", timeout=timeout)
+
+
+class CircuitBreaker:
+    """Tracks consecutive failures per key and stops calls to failing keys.
+
+    After `failure_threshold` consecutive failures a key is open for
+    `reset_timeout` seconds; then a single trial call is let through
+    (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def state(self, key: str) -> str:
+        with self._lock:
+            return self._state(key)
+
+    def _state(self, key: str) -> str:
+        if key not in self._opened_at:
+            return self.CLOSED
+        if self._trial.get(key) or self.clock() - self._opened_at[key] >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow(self, key: str) -> bool:
+        """Whether a call for `key` may go ahead now."""
+        with self._lock:
+            state = self._state(key)
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial.get(key):
+                self._trial[key] = True
+                return True
+            return False
+
+    def record_success(self, key: str):
+        with self._lock:
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+            self._trial.pop(key, None)
+
+    def record_failure(self, key: str):
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            if self._trial.pop(key, False) or failures >= self.failure_threshold:
+                self._opened_at[key] = self.clock()
+
+    def open_keys(self) -> Sequence[str]:
+        with self._lock:
+            return [key for key in self._opened_at if self._state(key) == self.OPEN]
+
+
+class MarketDataFetcher:
+    """Fetches bars for many symbols at once on a bounded thread pool.
+
+    Each symbol gets `timeout` seconds from submission, including up to
+    `retries` retries with exponential backoff. Symbols that time out, fail,
+    or whose circuit is open are left out of the result so the caller can
+    fall back to other data, and a slow symbol never delays the others. A
+    fetch that overran its timeout is not started again until the stuck call
+    has returned; while such calls hold every worker, fetches still queued at
+    the deadline are cancelled, so a cycle never takes much longer than
+    `timeout`.
+    """
+
+    def __init__(self, fetch_func: Optional[Callable[[str, float], pd.DataFrame]] = None,
+                 max_workers: int = 8, timeout: float = 8.0, retries: int = 2, backoff: float = 0.5,
+                 failure_threshold: int = 3, reset_timeout: float = 60.0, log_manager=None):
+        self.fetch_func = fetch_func or yfinance_history
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.log_manager = log_manager
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='market-data')
+        self._in_flight = set()
+        self._lock = threading.Lock()
+
+    def fetch_all(self, symbols: Sequence[str]) -> Dict[str, pd.DataFrame]:
+        """Fetch every symbol concurrently; returns frames of the symbols that succeeded."""
+        pending = {}
+        with self._lock:
+            for symbol in symbols:
+                if symbol in self._in_flight or not self.breaker.allow(symbol):
+                    continue
+                self._in_flight.add(symbol)
+                pending[self._executor.submit(self._fetch_with_retry, symbol)] = symbol
+        deadline = time.monotonic() + self.timeout
+
+        results = {}
+        while pending:
+            done, _ = wait(pending, timeout=_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol = pending.pop(future)
+                error = future.exception()
+                if error is None:
+                    results[symbol] = future.result()
+                    self.breaker.record_success(symbol)
+                else:
+                    self._log(f"Error fetching data for {symbol}: {str(error)}")
+                    self.breaker.record_failure(symbol)
+
+            if time.monotonic() < deadline:
+                continue
+            # Abandon whatever is left: running calls overran, queued ones never got a worker
+            for future, symbol in pending.items():
+                if future.cancel():
+                    with self._lock:
+                        self._in_flight.discard(symbol)
+                    self._log(f"Skipped fetching data for {symbol}: no free worker within {self.timeout:.1f}s")
+                else:
+                    self._log(f"Timed out fetching data for {symbol} after {self.timeout:.1f}s")
+                    self.breaker.record_failure(symbol)
+            pending = {}
+
+        return results
+
+    def _fetch_with_retry(self, symbol: str) -> pd.DataFrame:
+        deadline = time.monotonic() + self.timeout
+        attempt = 0
+        try:
+            while True:
+                try:
+                    return self.fetch_func(symbol, max(deadline - time.monotonic(), 0.1))
+                except Exception:
+                    delay = self.backoff * (2 ** attempt)
+                    if attempt >= self.retries or time.monotonic() + delay >= deadline:
+                        raise
+                    attempt += 1
+                    time.sleep(delay)
+        finally:
+            with self._lock:
+                self._in_flight.discard(symbol)
+
+    def _log(self, message: str):
+        if self.log_manager:
+            self.log_manager.log_error(message)
+
+    def stats(self) -> Dict[str, Any]:
+        """Symbols currently fetching and those with an open circuit."""
+        with self._lock:
+            in_flight = sorted(self._in_flight)
+        return {'in_flight': in_flight, 'open_circuits': sorted(self.breaker.open_keys())}
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,73 @@
+"""
+Vectorized conversion of OHLCV frames to the dashboard's bar format.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Any, List
+import numpy as np
+
+from core.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+# Bar fields in the order the dashboard has always received them
+BAR_FIELDS = ('time', 'price', 'volume', 'high', 'low', 'open')
+
+
+def isoformat_index(index: pd.DatetimeIndex) -> List[str]:
+    """`Timestamp.isoformat()` of every index entry, without a per-row loop."""
+    if len(index) == 0:
+        return []
+    # Nanoseconds whatever the index resolution; wall clock times for tz-aware indexes
+    ns = index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    wall = ns if index.tz is None else index.tz_localize(None).to_numpy(dtype='datetime64[ns]').view(np.int64)
+    # Sub-second stamps carry extra digits in isoformat; they are rare enough to format one by one
+    if np.any(wall % 1_000_000_000):
+        return [timestamp.isoformat() for timestamp in index]
+
+    text = np.datetime_as_string(wall.view('datetime64[ns]'), unit='s')
+    if index.tz is None:
+        return text.tolist()
+
+    # Only a handful of distinct UTC offsets occur (DST), so format each once
+    offsets, inverse = np.unique((wall - ns) // 1_000_000_000, return_inverse=True)
+    suffixes = np.array([_format_offset(int(seconds)) for seconds in offsets])
+    return np.char.add(text, suffixes[inverse]).tolist()
+
+
+def _format_offset(seconds: int) -> str:
+    sign = '+' if seconds >= 0 else '-'
+    hours, minutes = divmod(abs(seconds) // 60, 60)
+    return f"{sign}{hours:02d}:{minutes:02d}"
+
+
+def bars_to_columns(index: pd.DatetimeIndex, open_, high, low, close, volume) -> Dict[str, List[Any]]:
+    """Columnar bars from per-field arrays: one list per field, all the same length."""
+    return {
+        'time': isoformat_index(index),
+        'price': np.asarray(close, dtype=np.float64).tolist(),
+        'volume': np.nan_to_num(np.asarray(volume, dtype=np.float64)).astype(np.int64).tolist(),
+        'high': np.asarray(high, dtype=np.float64).tolist(),
+        'low': np.asarray(low, dtype=np.float64).tolist(),
+        'open': np.asarray(open_, dtype=np.float64).tolist()
+    }
+
+
+def frame_to_columns(hist: pd.DataFrame) -> Dict[str, List[Any]]:
+    """Columnar bars of an OHLCV frame."""
+    volume = hist['Volume'].to_numpy(dtype=np.float64) if 'Volume' in hist.columns else np.zeros(len(hist))
+    return bars_to_columns(hist.index, hist['Open'].to_numpy(dtype=np.float64),
+                           hist['High'].to_numpy(dtype=np.float64), hist['Low'].to_numpy(dtype=np.float64),
+                           hist['Close'].to_numpy(dtype=np.float64), volume)
+
+
+def columns_to_records(columns: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """Bars as `{time, price, volume, high, low, open}` dicts."""
+    return [dict(zip(BAR_FIELDS, values)) for values in zip(*(columns[field] for field in BAR_FIELDS))]
+
+
+def frame_to_records(hist: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Bars of an OHLCV frame as `{time, price, volume, high, low, open}` dicts."""
+    return columns_to_records(frame_to_columns(hist))
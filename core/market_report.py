@@ -0,0 +1,157 @@
+"""
+Market review report: figures from the live dashboard caches, rendered to PDF.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, List, Mapping, Optional
+import io
+import numpy as np
+
+
+# Standard deviation of bar-to-bar returns, in percent, below which each label applies
+VOLATILITY_LABELS = ((0.5, 'Low'), (1.5, 'Medium'), (3.0, 'High'))
+MAX_SHIFTS = 5
+MAX_TRADES = 50
+
+
+def volatility_label(closes: np.ndarray) -> str:
+    if len(closes) < 3:
+        return '-'
+    returns = np.diff(closes) / closes[:-1] * 100
+    volatility = float(np.nanstd(returns))
+    for limit, label in VOLATILITY_LABELS:
+        if volatility < limit:
+            return label
+    return 'Very High'
+
+
+def build_report_data(market_data: Mapping[str, List[Dict[str, Any]]], ticker_data: Mapping[str, Dict[str, Any]],
+                      bots: Mapping[str, Dict[str, Any]], totals: Dict[str, Any],
+                      trades: Optional[List[Dict[str, Any]]] = None, bot_id: Optional[str] = None,
+                      generated: Optional[datetime] = None) -> Dict[str, Any]:
+    """Everything the report shows, taken from the live caches.
+
+    Markets list each asset's latest price, change and volatility; shifts are
+    the largest single-bar moves across assets; bots carry their status and
+    running P&L.
+    """
+    markets, shifts = [], []
+    for asset in sorted(set(market_data) | set(ticker_data)):
+        bars = market_data.get(asset) or []
+        ticker = ticker_data.get(asset) or {}
+        closes = np.array([bar['price'] for bar in bars], dtype=np.float64)
+        price = ticker.get('price', closes[-1] if len(closes) else None)
+        if price is None:
+            continue
+        markets.append({'symbol': asset, 'price': float(price),
+                        'change_percent': float(ticker.get('change_percent', 0.0)),
+                        'volatility': volatility_label(closes)})
+        if len(closes) >= 2:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                moves = np.nan_to_num(np.diff(closes) / closes[:-1] * 100)
+            i = int(np.argmax(np.abs(moves)))
+            shifts.append({'time': bars[i + 1]['time'], 'symbol': asset, 'change_percent': float(moves[i])})
+    shifts.sort(key=lambda shift: abs(shift['change_percent']), reverse=True)
+
+    bot_rows = [{'name': bot.get('name', bot_key), 'asset': bot.get('asset', '-'),
+                 'status': 'Active' if bot.get('active') else 'Paused',
+                 'pnl': float(bot.get('stats', {}).get('total_pnl', 0.0)),
+                 'trades': int(bot.get('stats', {}).get('trades_count', 0))}
+                for bot_key, bot in bots.items()]
+
+    return {
+        'generated': (generated or datetime.now()).strftime('%B %d, %Y at %I:%M %p'),
+        'markets': markets,
+        'shifts': shifts[:MAX_SHIFTS],
+        'bots': bot_rows,
+        'totals': dict(totals),
+        'bot_id': bot_id,
+        'trades': list(trades or [])[-MAX_TRADES:]
+    }
+
+
+def _money(value: float) -> str:
+    return f"{'+' if value > 0 else '-' if value < 0 else ''}${abs(value):,.2f}"
+
+
+def _percent(value: float) -> str:
+    return f"{value:+.2f}%"
+
+
+def render_market_review_pdf(data: Dict[str, Any]) -> bytes:
+    """A PDF of report data from `build_report_data`."""
+    # ReportLab is only needed when a report is rendered
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24, spaceAfter=30, alignment=TA_CENTER)
+    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=16, spaceAfter=12)
+
+    def table(rows, header_color, body_color):
+        result = Table(rows)
+        result.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), header_color),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), body_color),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]))
+        return result
+
+    story = [
+        Paragraph("ATB - Auto Trading Bot Market Review", title_style),
+        Paragraph(f"Generated on: {data['generated']}", styles['Normal']),
+        Spacer(1, 20),
+        Paragraph("Market Summary", heading_style)
+    ]
+    totals = data['totals']
+    story.append(Paragraph(
+        f"Total P&L {_money(totals.get('total_pnl', 0.0))}, daily P&L {_money(totals.get('daily_pnl', 0.0))}, "
+        f"{totals.get('active_bots', 0)} active bots, {totals.get('total_trades', 0)} trades.", styles['Normal']))
+    story.append(Spacer(1, 12))
+    if data['markets']:
+        rows = [['Symbol', 'Current Price', 'Daily Change', 'Volatility']]
+        rows += [[m['symbol'], f"${m['price']:,.2f}", _percent(m['change_percent']), m['volatility']]
+                 for m in data['markets']]
+        story.append(table(rows, colors.grey, colors.beige))
+    else:
+        story.append(Paragraph("No market data has been loaded yet.", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    if data['shifts']:
+        story.append(Paragraph("Dramatic Market Shifts", heading_style))
+        rows = [['Time', 'Market', 'Move']]
+        rows += [[str(s['time']).replace('T', ' ')[:16], s['symbol'], _percent(s['change_percent'])]
+                 for s in data['shifts']]
+        story.append(table(rows, colors.darkblue, colors.lightgrey))
+        story.append(Spacer(1, 20))
+
+    story.append(Paragraph("Bot Performance Summary", heading_style))
+    rows = [['Bot Name', 'Asset', 'Status', 'P&L', 'Trades']]
+    rows += [[b['name'], b['asset'], b['status'], _money(b['pnl']), str(b['trades'])] for b in data['bots']]
+    story.append(table(rows, colors.darkgreen, colors.lightgreen))
+    story.append(Spacer(1, 20))
+
+    if data['bot_id']:
+        story.append(Paragraph(f"Trades for {data['bot_id']}", heading_style))
+        rows = [['Time', 'Type', 'Price']]
+        for trade in data['trades']:
+            timestamp = trade.get('timestamp')
+            when = datetime.fromtimestamp(timestamp / 1000.0).strftime('%Y-%m-%d %H:%M') if timestamp else '-'
+            rows.append([when, trade.get('type', '-'), f"${trade.get('price', 0):.2f}"])
+        story.append(table(rows, colors.darkgrey, colors.white))
+        story.append(Spacer(1, 20))
+
+    story.append(Paragraph("This report was generated automatically by the ATB Auto Trading Bot Dashboard.", styles['Normal']))
+    story.append(Paragraph("For more information, visit the dashboard at http://localhost:5000", styles['Normal']))
+    doc.build(story)
+    return buffer.getvalue()
@@ -0,0 +1,171 @@
+"""
+Sequenced snapshot/delta protocol for streaming market data to clients.
+
+The server sends a snapshot when a client connects and then one delta per
+update cycle carrying only what changed:
+
+    {'seq': 42,
+     'bars':   {asset: [bar, ...]},      # new bars, plus the last bar if it changed
+     'resets': {asset: [bar, ...]},      # full replacement of an asset's bars
+     'ticker': {symbol: {field: value}}} # changed ticker fields only
+
+Sequence numbers are consecutive; a client that sees a gap asks for a
+resync and receives a fresh snapshot.
+
+Each asset also has its own sequence number, listed for the assets that
+changed under `'asset_seq'`, so a delta can be split into per-asset deltas
+for clients that follow only some symbols:
+
+    {'asset': 'AAPL', 'seq': 7, 'bars': [...] or 'reset': [...], 'ticker': {...}}
+"""
+
+from typing import Dict, Any, List, Optional, Tuple
+import threading
+
+
+class MarketDeltaTracker:
+    """Remembers the market state last published and diffs new state against it."""
+
+    def __init__(self):
+        self.seq = 0
+        self.asset_seq: Dict[str, int] = {}
+        self._bars: Dict[str, List[Dict[str, Any]]] = {}
+        self._ticker: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Full state as of the current sequence number."""
+        with self._lock:
+            return {'seq': self.seq, 'asset_seq': dict(self.asset_seq),
+                    'market_data': dict(self._bars), 'ticker_data': dict(self._ticker)}
+
+    def asset_snapshot(self, assets: List[str]) -> Dict[str, Dict[str, Any]]:
+        """State of some assets, each as of its own sequence number."""
+        with self._lock:
+            return {asset: {'seq': self.asset_seq.get(asset, 0),
+                            'bars': self._bars.get(asset, []),
+                            'ticker': self._ticker.get(asset, {})}
+                    for asset in assets}
+
+    def update(self, market_data: Dict[str, List[Dict[str, Any]]],
+               ticker_data: Dict[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Record the latest state and return the delta to publish, or None if nothing changed.
+
+        Bar lists and ticker dicts are kept by reference, so callers must
+        replace them rather than mutate them in place.
+        """
+        with self._lock:
+            bars, resets = {}, {}
+            for asset, data in market_data.items():
+                previous = self._bars.get(asset)
+                if data is previous:
+                    continue
+                changed, reset = self._diff_bars(previous, data)
+                if reset:
+                    resets[asset] = data
+                elif changed:
+                    bars[asset] = changed
+                self._bars[asset] = data
+
+            ticker = {}
+            for symbol, fields in ticker_data.items():
+                previous = self._ticker.get(symbol, {})
+                if fields is previous:
+                    continue
+                changed = {key: value for key, value in fields.items() if previous.get(key) != value}
+                if changed:
+                    ticker[symbol] = changed
+                self._ticker[symbol] = fields
+
+            if not (bars or resets or ticker):
+                return None
+            self.seq += 1
+            changed_assets = {}
+            for asset in (*bars, *resets, *ticker):
+                if asset not in changed_assets:
+                    changed_assets[asset] = self.asset_seq[asset] = self.asset_seq.get(asset, 0) + 1
+            delta = {'seq': self.seq, 'asset_seq': changed_assets}
+            if bars:
+                delta['bars'] = bars
+            if resets:
+                delta['resets'] = resets
+            if ticker:
+                delta['ticker'] = ticker
+            return delta
+
+    @staticmethod
+    def _diff_bars(previous: Optional[List[Dict[str, Any]]],
+                   data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], bool]:
+        """Bars of `data` that are new or changed since `previous`, or a reset flag.
+
+        Walks back from the end only as far as the last published bar, so the
+        cost is proportional to the number of new bars.
+        """
+        if not previous or not data:
+            return [], bool(data) or bool(previous)
+        last = previous[-1]
+        i = len(data)
+        while i > 0 and data[i - 1]['time'] > last['time']:
+            i -= 1
+        if i == 0 or data[i - 1]['time'] != last['time']:
+            # The last published bar is gone: a new session or regenerated data
+            return [], True
+        start = i - 1 if data[i - 1] != last else i
+        return data[start:], False
+
+
+def split_delta(delta: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Per-asset deltas of a delta, keyed by asset."""
+    deltas = {asset: {'asset': asset, 'seq': seq} for asset, seq in delta['asset_seq'].items()}
+    for asset, bars in delta.get('bars', {}).items():
+        deltas[asset]['bars'] = bars
+    for asset, bars in delta.get('resets', {}).items():
+        deltas[asset]['reset'] = bars
+    for asset, fields in delta.get('ticker', {}).items():
+        deltas[asset]['ticker'] = fields
+    return deltas
+
+
+def _merge_bars(current: List[Dict[str, Any]], bars: List[Dict[str, Any]]):
+    # A leading bar with the same timestamp replaces the in-progress bar
+    if current and bars and bars[0]['time'] == current[-1]['time']:
+        current[-1] = bars[0]
+        bars = bars[1:]
+    current.extend(bars)
+
+
+def apply_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> bool:
+    """Apply a delta to a client-side copy of a snapshot.
+
+    Returns False, leaving `state` untouched, when the delta does not follow
+    the state's sequence number and a resync is needed.
+    """
+    if delta['seq'] != state['seq'] + 1:
+        return False
+    market_data = state['market_data']
+    for asset, bars in delta.get('resets', {}).items():
+        market_data[asset] = list(bars)
+    for asset, bars in delta.get('bars', {}).items():
+        _merge_bars(market_data.setdefault(asset, []), bars)
+    for symbol, fields in delta.get('ticker', {}).items():
+        state['ticker_data'].setdefault(symbol, {}).update(fields)
+    state.setdefault('asset_seq', {}).update(delta.get('asset_seq', {}))
+    state['seq'] = delta['seq']
+    return True
+
+
+def apply_asset_delta(state: Dict[str, Any], delta: Dict[str, Any]) -> bool:
+    """Apply a per-asset delta to an entry of `asset_snapshot`.
+
+    Returns False, leaving `state` untouched, on a sequence gap.
+    """
+    if delta['seq'] != state['seq'] + 1:
+        return False
+    if 'reset' in delta:
+        state['bars'] = list(delta['reset'])
+    if 'bars' in delta:
+        _merge_bars(state['bars'], delta['bars'])
+    if 'ticker' in delta:
+        state['ticker'] = {**state['ticker'], **delta['ticker']}
+    state['seq'] = delta['seq']
+    return True
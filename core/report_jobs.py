@@ -0,0 +1,141 @@
+"""
+Background report rendering with job ids and a content-keyed result cache.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Any, Callable, Optional
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+def report_key(inputs: Dict[str, Any], bucket: int) -> str:
+    """Content hash of a report's inputs within a time bucket."""
+    payload = json.dumps({'inputs': inputs, 'bucket': bucket}, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+@dataclass
+class ReportJob:
+    """One requested report and where it is in the pipeline."""
+    id: str
+    key: str
+    status: str
+    created: float
+    finished: Optional[float] = None
+    error: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'job_id': self.id, 'status': self.status, 'created': self.created,
+                'finished': self.finished, 'error': self.error}
+
+
+class ReportJobs:
+    """Renders reports on a worker pool and caches the results by content key.
+
+    A report is keyed by a hash of its inputs and the current time bucket
+    (an hour by default), so the same report asked for again within the
+    bucket is served from the cache, and a request for a report that is
+    already rendering joins that job instead of starting another. The
+    newest `cache_size` results are kept; finished jobs are forgotten after
+    `job_ttl` seconds.
+    """
+
+    def __init__(self, workers: int = 2, cache_size: int = 32, bucket_seconds: float = 3600.0,
+                 job_ttl: float = 3600.0, clock: Callable[[], float] = time.time):
+        self.cache_size = cache_size
+        self.bucket_seconds = bucket_seconds
+        self.job_ttl = job_ttl
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report')
+        self._results: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._jobs: Dict[str, ReportJob] = {}
+        self._pending: Dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def submit(self, inputs: Dict[str, Any], render: Callable[[], bytes]) -> ReportJob:
+        """Start rendering a report unless it is cached or already rendering."""
+        now = self.clock()
+        key = report_key(inputs, int(now // self.bucket_seconds))
+        with self._lock:
+            self._expire(now)
+            pending = self._pending.get(key)
+            if pending is not None:
+                return pending
+            job = ReportJob(uuid.uuid4().hex, key, QUEUED, now)
+            self._jobs[job.id] = job
+            if key in self._results:
+                self._results.move_to_end(key)
+                self.hits += 1
+                self._finish(job, None)
+                return job
+            self.misses += 1
+            self._pending[key] = job
+        self._executor.submit(self._run, job, render)
+        return job
+
+    def _run(self, job: ReportJob, render: Callable[[], bytes]):
+        job.status = RUNNING
+        try:
+            result = render()
+        except Exception as e:
+            with self._lock:
+                self._pending.pop(job.key, None)
+                self._finish(job, str(e))
+            return
+        with self._lock:
+            self._results[job.key] = result
+            self._results.move_to_end(job.key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            self._pending.pop(job.key, None)
+            self._finish(job, None)
+
+    def _finish(self, job: ReportJob, error: Optional[str]):
+        job.status = FAILED if error else DONE
+        job.error = error
+        job.finished = self.clock()
+        job.done.set()
+
+    def _expire(self, now: float):
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished is not None and now - job.finished > self.job_ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[ReportJob]:
+        """The job once it has finished or `timeout` has passed; None if unknown."""
+        job = self.get(job_id)
+        if job is not None:
+            job.done.wait(timeout)
+        return job
+
+    def result(self, job_id: str) -> Optional[bytes]:
+        """The rendered report of a finished job, if it is still cached."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != DONE:
+                return None
+            return self._results.get(job.key)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'cached': len(self._results), 'jobs': len(self._jobs), 'pending': len(self._pending),
+                    'hits': self.hits, 'misses': self.misses}
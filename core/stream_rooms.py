@@ -0,0 +1,91 @@
+"""
+Socket.IO room naming and fan-out for dashboard subscriptions.
+
+Clients subscribe to a channel for some symbols, or for all of them with
+'*', and join one room per (channel, symbol):
+
+    market:AAPL   bars and ticker updates of one asset
+    market:*      the full market_delta stream
+    trades:BTC    trades in one asset
+    bots:bot_1    status changes of one bot
+
+Events are emitted to rooms rather than to each client, so a payload is
+encoded once per room however many clients have joined it.
+"""
+
+from typing import Dict, Any, Iterable, List, Tuple, Union
+
+
+CHANNELS = ('market', 'trades', 'bots')
+ALL = '*'
+
+
+def room_name(channel: str, symbol: str = ALL) -> str:
+    """Room of one channel and symbol, e.g. `market:AAPL` or `trades:*`."""
+    return f"{channel}:{symbol}"
+
+
+def event_rooms(channel: str, symbol: str) -> List[str]:
+    """Rooms that receive an event about `symbol`: its own and the channel-wide room."""
+    return [room_name(channel, ALL), room_name(channel, symbol)]
+
+
+def parse_subscription(data: Any) -> Tuple[str, List[str]]:
+    """Channel and symbols of a `subscribe`/`unsubscribe` message.
+
+    Accepts `{'channel': 'market', 'symbols': ['AAPL', 'BTC']}`; `symbols`
+    defaults to every symbol, and bot ids take the place of symbols on the
+    bots channel. Raises ValueError on anything else.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Subscription must be an object with a channel")
+    channel = data.get('channel')
+    if channel not in CHANNELS:
+        raise ValueError(f"Unknown channel: {channel}. Use one of {', '.join(CHANNELS)}")
+    symbols = data.get('symbols', [ALL])
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    if not isinstance(symbols, list) or not all(isinstance(s, str) and s for s in symbols):
+        raise ValueError("symbols must be a list of symbol names")
+    if channel == 'bots':
+        return channel, symbols
+    return channel, [s if s == ALL else s.upper() for s in symbols]
+
+
+class RoomPublisher:
+    """Emits events to Socket.IO rooms, skipping rooms nobody has joined."""
+
+    def __init__(self, socketio, namespace: str = '/'):
+        self.socketio = socketio
+        self.namespace = namespace
+
+    def _rooms(self) -> Dict[str, Any]:
+        return self.socketio.server.manager.rooms.get(self.namespace, {})
+
+    def has_members(self, rooms: Union[str, Iterable[str]]) -> bool:
+        """Whether any client is in at least one of `rooms`."""
+        if isinstance(rooms, str):
+            rooms = [rooms]
+        active = self._rooms()
+        return any(active.get(room) for room in rooms)
+
+    def emit(self, event: str, payload: Dict[str, Any], rooms: Union[str, List[str]]) -> bool:
+        """Emit once to the union of `rooms`; returns False when they are all empty.
+
+        A client in several of the rooms receives the event once.
+        """
+        if isinstance(rooms, str):
+            rooms = [rooms]
+        active = self._rooms()
+        rooms = [room for room in rooms if active.get(room)]
+        if not rooms:
+            return False
+        self.socketio.emit(event, payload, to=rooms if len(rooms) > 1 else rooms[0],
+                           namespace=self.namespace)
+        return True
+
+    def subscribers(self) -> Dict[str, int]:
+        """Number of clients in each non-empty room."""
+        # Every client also sits in a room named after its sid; only channel rooms have a colon
+        return {room: len(members) for room, members in self._rooms().items()
+                if isinstance(room, str) and ':' in room and members}
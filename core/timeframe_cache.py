@@ -0,0 +1,156 @@
+"""
+TTL cache of historical bar frames with request coalescing.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Dict, Any, Callable, Hashable, Optional
+import hashlib
+import threading
+import time
+import numpy as np
+
+from core.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+DEFAULT_BUDGET_MB = 64
+DEFAULT_TTL = 300.0
+
+# Seconds a frame stays fresh, by bar interval: roughly how long until a new bar
+DEFAULT_TTLS = {
+    '1m': 30.0,
+    '2m': 60.0,
+    '5m': 60.0,
+    '15m': 120.0,
+    '30m': 300.0,
+    '60m': 300.0,
+    '1h': 300.0,
+    '1d': 3600.0,
+    '1wk': 6 * 3600.0,
+    '1mo': 24 * 3600.0,
+}
+
+
+def bars_etag(index: pd.DatetimeIndex, values: np.ndarray) -> str:
+    """Content hash of bars given as an index and a value array, used as an HTTP entity tag."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(index.to_numpy(dtype='datetime64[ns]')).view(np.uint8))
+    digest.update(str(values.shape).encode())
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).view(np.uint8))
+    return digest.hexdigest()
+
+
+def frame_etag(frame: pd.DataFrame) -> str:
+    """Content hash of a bar frame, used as its HTTP entity tag."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(frame.index.to_numpy(dtype='datetime64[ns]')).view(np.uint8))
+    for column in frame.columns:
+        digest.update(str(column).encode())
+        digest.update(np.ascontiguousarray(frame[column].to_numpy(dtype=np.float64)).view(np.uint8))
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CachedFrame:
+    """A cached frame, its entity tag and when it was fetched."""
+    frame: pd.DataFrame
+    etag: str
+    fetched_at: float
+    size: int
+
+
+class TimeframeCache:
+    """LRU cache of bar frames keyed by (asset, period, interval).
+
+    Entries expire after the TTL of their interval. Concurrent misses for
+    the same key share one fetch: the first caller runs it and the others
+    wait for its result or exception. Failed fetches are not cached. Memory
+    is bounded by `budget_bytes`, evicting the least recently used frames.
+    """
+
+    def __init__(self, fetch_func: Callable[[str, str, str], pd.DataFrame],
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = DEFAULT_TTL,
+                 budget_bytes: int = DEFAULT_BUDGET_MB * 1024 * 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.fetch_func = fetch_func
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.budget_bytes = budget_bytes
+        self.clock = clock
+        self._entries: 'OrderedDict[Hashable, CachedFrame]' = OrderedDict()
+        self._bytes = 0
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def ttl(self, interval: str) -> float:
+        return self.ttls.get(interval, self.default_ttl)
+
+    def get(self, asset: str, period: str, interval: str) -> CachedFrame:
+        """The cached frame for a key, fetching it if missing or expired."""
+        key = (asset, period, interval)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.clock() - entry.fetched_at < self.ttl(interval):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                self.misses += 1
+                future = self._in_flight[key] = Future()
+                leader = True
+
+        if not leader:
+            return future.result()
+
+        try:
+            frame = self.fetch_func(asset, period, interval)
+            entry = CachedFrame(frame, frame_etag(frame), self.clock(),
+                                int(frame.memory_usage(index=True).sum()))
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._store(key, entry)
+        future.set_result(entry)
+        return entry
+
+    def _store(self, key: Hashable, entry: CachedFrame):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.size
+        if entry.size > self.budget_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += entry.size
+        while self._bytes > self.budget_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+    def invalidate(self, asset: Optional[str] = None):
+        """Drop the entries of one asset, or all entries."""
+        with self._lock:
+            for key in [key for key in self._entries if asset is None or key[0] == asset]:
+                self._bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits,
+                    'misses': self.misses, 'coalesced': self.coalesced, 'evictions': self.evictions}
@@ -0,0 +1,254 @@
+"""
+OHLCV timeframes resampled from one-minute and daily base bars.
+
+Timeframes form a chain, each built from the one before it:
+
+    1m -> 5m -> 15m -> 1h -> 4h -> 1d -> 1w
+                                    \\-> 1M
+
+Buckets follow the wall clock of the bars' time zone, so hourly bars start
+on the hour, daily bars at local midnight, weekly bars on Monday and
+monthly bars on the 1st. Each bar is labelled with its bucket start.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Dict, Optional, Sequence, Tuple
+import threading
+import numpy as np
+
+from core.bar_buffer import BAR_COLUMNS, BarRingBuffer
+from core.lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+
+MINUTE = 60 * 1_000_000_000
+DAY = 1440 * MINUTE
+# Weekly buckets start on Monday; 1970-01-01 was a Thursday
+WEEK_ORIGIN = 4 * DAY
+
+
+@dataclass(frozen=True)
+class Timeframe:
+    """A bar size, the timeframe it is built from and how many bars to keep."""
+    name: str
+    source: Optional[str]
+    period: Optional[int]  # nanoseconds, None for calendar months
+    capacity: int
+    origin: int = 0
+
+
+TIMEFRAMES = (
+    Timeframe('1m', None, MINUTE, 7 * 1440),
+    Timeframe('5m', '1m', 5 * MINUTE, 7 * 288),
+    Timeframe('15m', '5m', 15 * MINUTE, 7 * 96),
+    Timeframe('1h', '15m', 60 * MINUTE, 92 * 24),
+    Timeframe('4h', '1h', 240 * MINUTE, 92 * 6),
+    Timeframe('1d', '4h', DAY, 2000),
+    Timeframe('1w', '1d', 7 * DAY, 300, WEEK_ORIGIN),
+    Timeframe('1M', '1d', None, 120),
+)
+
+# Dashboard timeframe -> (bar timeframe, lookback period)
+CHART_TIMEFRAMES = {
+    '1m': ('1m', '1d'),
+    '5m': ('5m', '5d'),
+    '15m': ('15m', '5d'),
+    '1h': ('1h', '7d'),
+    '4h': ('4h', '1mo'),
+    '1d': ('1d', '1mo'),
+    '1w': ('1w', '2y'),
+    '1M': ('1M', '5y'),
+    '3M': ('1d', '1y'),
+    '6M': ('1d', '2y'),
+    '1y': ('1d', '5y')
+}
+DEFAULT_CHART_TIMEFRAME = ('1d', '1mo')
+
+# Lookback of each yfinance period
+PERIODS = {
+    '1d': timedelta(days=1),
+    '5d': timedelta(days=5),
+    '7d': timedelta(days=7),
+    '1mo': timedelta(days=31),
+    '3mo': timedelta(days=92),
+    '6mo': timedelta(days=183),
+    '1y': timedelta(days=366),
+    '2y': timedelta(days=731),
+    '5y': timedelta(days=1827)
+}
+
+# The yfinance interval closest to each timeframe, for data that is not stored yet
+YFINANCE_INTERVALS = {'1m': '1m', '5m': '5m', '15m': '15m', '1h': '60m', '4h': '60m',
+                      '1d': '1d', '1w': '1wk', '1M': '1mo'}
+
+# History fetched once per asset to seed the store, coarsest first:
+# (timeframe, yfinance period, yfinance interval)
+BACKFILL_SOURCES = (('1d', '5y', '1d'), ('1h', '3mo', '60m'), ('1m', '5d', '1m'))
+
+TIMEFRAMES_BY_NAME = {timeframe.name: timeframe for timeframe in TIMEFRAMES}
+
+
+def wall_clock(times: np.ndarray, tz=None) -> np.ndarray:
+    """Local wall clock nanoseconds of UTC nanosecond times."""
+    if tz is None or len(times) == 0:
+        return times
+    index = pd.DatetimeIndex(times.view('datetime64[ns]')).tz_localize('UTC').tz_convert(tz)
+    return index.tz_localize(None).to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def bucket_starts(wall: np.ndarray, timeframe: Timeframe) -> np.ndarray:
+    """Wall clock start of the bucket holding each wall clock time."""
+    if timeframe.period is None:
+        months = wall.view('datetime64[ns]').astype('datetime64[M]')
+        return months.astype('datetime64[ns]').view(np.int64)
+    return (wall - timeframe.origin) // timeframe.period * timeframe.period + timeframe.origin
+
+
+def resample(times: np.ndarray, values: np.ndarray, timeframe: Timeframe,
+             tz=None) -> Tuple[np.ndarray, np.ndarray]:
+    """Aggregate time-sorted bars into the buckets of `timeframe`.
+
+    `times` are UTC nanoseconds and `values` a (5, n) Open/High/Low/Close/Volume
+    array. Returns the UTC start of each bucket and its aggregated bar.
+    """
+    if len(times) == 0:
+        return times, values
+    wall = wall_clock(times, tz)
+    starts = bucket_starts(wall, timeframe)
+    first = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+
+    # The UTC offset of each bucket's first bar maps its wall clock start back to UTC
+    labels = times[first] - (wall[first] - starts[first])
+    return labels, aggregate_bars(values, first)
+
+
+def aggregate_bars(values: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """One bar per group of consecutive bars, the groups starting at positions `first`.
+
+    Opens come from the first bar of each group, closes from the last, highs
+    and lows are the extremes and volumes are summed.
+    """
+    last = np.r_[first[1:], values.shape[1]] - 1
+    bars = np.empty((len(BAR_COLUMNS), len(first)))
+    bars[0] = values[0, first]
+    bars[1] = np.fmax.reduceat(values[1], first)
+    bars[2] = np.fmin.reduceat(values[2], first)
+    bars[3] = values[3, last]
+    bars[4] = np.add.reduceat(np.nan_to_num(values[4]), first)
+    return bars
+
+
+def frame_values(hist: pd.DataFrame) -> np.ndarray:
+    """(5, n) Open/High/Low/Close/Volume array of an OHLCV frame."""
+    return np.vstack([
+        hist[column].to_numpy(dtype=np.float64) if column in hist.columns else np.zeros(len(hist))
+        for column in BAR_COLUMNS
+    ])
+
+
+def resample_frame(hist: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """An OHLCV frame aggregated to a coarser timeframe."""
+    hist = hist[hist['Close'].notna()]
+    times = hist.index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+    labels, bars = resample(times, frame_values(hist), TIMEFRAMES_BY_NAME[timeframe], hist.index.tz)
+    index = pd.DatetimeIndex(labels.view('datetime64[ns]'), name=hist.index.name)
+    if hist.index.tz is not None:
+        index = index.tz_localize('UTC').tz_convert(hist.index.tz)
+    return pd.DataFrame(dict(zip(BAR_COLUMNS, bars)), index=index)
+
+
+def _first_changed(previous: Optional[int], times: np.ndarray) -> Optional[int]:
+    """Earliest bar time a buffer update may have changed, or None if it changed nothing."""
+    if len(times) == 0:
+        return None
+    if previous is None:
+        return int(times[0])
+    if times[-1] < previous:
+        return None
+    return max(int(times[0]), previous)
+
+
+class TimeframeStore:
+    """Bars of every timeframe for many assets, kept current from finer bars.
+
+    New bars are merged into their own timeframe, then each coarser
+    timeframe recomputes only the buckets the new bars fall into, so an
+    update costs about one bucket per timeframe rather than the history.
+    """
+
+    def __init__(self, timeframes: Sequence[Timeframe] = TIMEFRAMES):
+        self.timeframes = {timeframe.name: timeframe for timeframe in timeframes}
+        self._children = {name: [timeframe for timeframe in timeframes if timeframe.source == name]
+                          for name in self.timeframes}
+        self._assets: Dict[str, Dict[str, BarRingBuffer]] = {}
+        self._lock = threading.Lock()
+
+    def assets(self) -> Sequence[str]:
+        return list(self._assets)
+
+    def buffer(self, asset: str, timeframe: str) -> Optional[BarRingBuffer]:
+        return self._assets.get(asset, {}).get(timeframe)
+
+    def update(self, asset: str, timeframe: str, hist: pd.DataFrame) -> int:
+        """Merge bars of `timeframe` for an asset and bring coarser timeframes up to date.
+
+        Returns the number of bars appended at `timeframe`.
+        """
+        if timeframe not in self.timeframes:
+            raise ValueError(f"Unknown timeframe: {timeframe}")
+        hist = hist[hist['Close'].notna()]
+        if hist.empty:
+            return 0
+        times = hist.index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        values = frame_values(hist)
+
+        with self._lock:
+            buffers = self._assets.get(asset)
+            if buffers is None:
+                buffers = self._assets[asset] = {name: BarRingBuffer(tf.capacity)
+                                                 for name, tf in self.timeframes.items()}
+            buffer = buffers[timeframe]
+            previous = buffer.last_time
+            appended = buffer.update(hist.index, values)
+            changed = _first_changed(previous, np.sort(times))
+            if changed is not None:
+                self._propagate(buffers, timeframe, changed)
+        return appended
+
+    def _propagate(self, buffers: Dict[str, BarRingBuffer], name: str, changed: int):
+        source = buffers[name]
+        for child in self._children[name]:
+            # Start an hour early in case a DST change moves the bucket start, then
+            # drop buckets before the one holding the first changed bar
+            wall = wall_clock(np.array([changed], dtype=np.int64), source.tz)
+            start = changed - (wall[0] - bucket_starts(wall, child)[0]) - 60 * MINUTE
+            times, values = source.copy(start=pd.Timestamp(start, tz='UTC'))
+            labels, bars = resample(times, values, child, source.tz)
+            keep = max(np.searchsorted(labels, changed, side='right') - 1, 0)
+            labels, bars = labels[keep:], bars[:, keep:]
+
+            target = buffers[child.name]
+            previous = target.last_time
+            target.update(source.index(labels), bars)
+            child_changed = _first_changed(previous, labels)
+            if child_changed is not None:
+                self._propagate(buffers, child.name, child_changed)
+
+    def bars(self, asset: str, timeframe: str,
+             lookback: Optional[timedelta] = None) -> Optional[Tuple[pd.DatetimeIndex, np.ndarray]]:
+        """Index and (5, n) values of an asset's bars over `lookback` before its latest bar.
+
+        Returns None when nothing is stored for the asset and timeframe.
+        """
+        buffer = self.buffer(asset, timeframe)
+        if buffer is None or len(buffer) == 0:
+            return None
+        start = None
+        if lookback is not None:
+            start = pd.Timestamp(buffer.last_time - pd.Timedelta(lookback).value, tz='UTC')
+        times, values = buffer.copy(start=start)
+        return buffer.index(times), values
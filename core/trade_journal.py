@@ -0,0 +1,285 @@
+"""
+Append-only per-bot journal of dashboard trades and position metrics.
+
+Each bot has a JSON-lines file with one record per line:
+
+    {"k": "t", "trade": {...}}      a trade, appended in order
+    {"k": "m", "metrics": {...}}    the bot's latest metrics, replacing earlier ones
+    {"k": "c"}                      clear: drop the trades before this record
+
+Saving appends only what changed. When superseded records outnumber live
+ones, the file is compacted: rewritten with just the live records and
+swapped in atomically.
+"""
+
+from bisect import bisect_left, bisect_right
+from heapq import merge
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote, unquote
+import json
+import os
+import threading
+
+
+# Compact once this many superseded records have accumulated and they outnumber live ones
+COMPACT_MIN_GARBAGE = 1000
+
+
+class _BotJournal:
+    """In-memory state of one bot's journal file."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.trades: List[Dict[str, Any]] = []
+        self.timestamps: List[float] = []
+        self.ordered = True
+        self.metrics: Optional[Dict[str, Any]] = None
+        self.garbage = 0
+
+    def add_trade(self, trade: Dict[str, Any]):
+        timestamp = _timestamp(trade)
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            self.ordered = False
+        self.trades.append(trade)
+        self.timestamps.append(timestamp)
+
+    def clear(self):
+        self.garbage += len(self.trades) + 1
+        self.trades, self.timestamps, self.ordered = [], [], True
+
+    def positions(self, start: Optional[float], end: Optional[float]) -> Sequence[int]:
+        """Positions of the trades with `start <= timestamp <= end`."""
+        if not self.ordered:
+            return [i for i, timestamp in enumerate(self.timestamps)
+                    if (start is None or timestamp >= start) and (end is None or timestamp <= end)]
+        lo = 0 if start is None else bisect_left(self.timestamps, start)
+        hi = len(self.timestamps) if end is None else bisect_right(self.timestamps, end)
+        return range(lo, max(lo, hi))
+
+
+def _timestamp(trade: Dict[str, Any]) -> float:
+    try:
+        return float(trade.get('timestamp') or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _checked(trades: Sequence[Any]) -> Sequence[Dict[str, Any]]:
+    """`trades` unchanged; raises TypeError unless every trade is a dict."""
+    for trade in trades:
+        if not isinstance(trade, dict):
+            raise TypeError(f"trades must be objects, got {type(trade).__name__}")
+    return trades
+
+
+class TradeJournal:
+    """Per-bot trade journals in a directory, with an in-memory index for reads.
+
+    Trades are kept in the order they were appended. Writers append a batch
+    with the position of its first trade (`offset`), so a retried batch is
+    not stored twice and a batch that would leave a gap is refused.
+    """
+
+    def __init__(self, directory: Union[str, Path], legacy_state_path: Optional[Union[str, Path]] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._bots: Dict[str, _BotJournal] = {}
+        self._lock = threading.Lock()
+        for path in sorted(self.directory.glob('*.jsonl')):
+            self._replay(unquote(path.stem), path)
+        if not self._bots and legacy_state_path and Path(legacy_state_path).exists():
+            self._import_state(Path(legacy_state_path))
+
+    def _path(self, bot_id: str) -> Path:
+        return self.directory / f"{quote(bot_id, safe='')}.jsonl"
+
+    def _bot(self, bot_id: str) -> _BotJournal:
+        journal = self._bots.get(bot_id)
+        if journal is None:
+            journal = self._bots[bot_id] = _BotJournal(self._path(bot_id))
+        return journal
+
+    def _replay(self, bot_id: str, path: Path):
+        journal = self._bot(bot_id)
+        with open(path, 'rb') as f:
+            complete = 0
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # A torn last line after a crash: cut it off below so the next append starts a fresh line
+                    break
+                complete += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    journal.garbage += 1
+                    continue
+                kind = record.get('k')
+                if kind == 't':
+                    journal.add_trade(record['trade'])
+                elif kind == 'm':
+                    journal.garbage += journal.metrics is not None
+                    journal.metrics = record['metrics']
+                elif kind == 'c':
+                    journal.clear()
+        if complete < path.stat().st_size:
+            os.truncate(path, complete)
+
+    def _import_state(self, path: Path):
+        try:
+            state = json.loads(path.read_text())
+        except ValueError:
+            return
+        for bot_id, trades in (state.get('botTrades') or {}).items():
+            self.sync(bot_id, trades, (state.get('botMetrics') or {}).get(bot_id))
+        for bot_id, metrics in (state.get('botMetrics') or {}).items():
+            if bot_id not in self._bots:
+                self.sync(bot_id, [], metrics)
+
+    def _write(self, journal: _BotJournal, records: List[Dict[str, Any]]):
+        if not records:
+            return
+        with open(journal.path, 'a') as f:
+            f.write(''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records))
+            f.flush()
+        if journal.garbage >= COMPACT_MIN_GARBAGE and journal.garbage > len(journal.trades):
+            self._compact(journal)
+
+    def _compact(self, journal: _BotJournal):
+        records = [{'k': 't', 'trade': trade} for trade in journal.trades]
+        if journal.metrics is not None:
+            records.append({'k': 'm', 'metrics': journal.metrics})
+        tmp_path = journal.path.with_suffix('.jsonl.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, journal.path)
+        journal.garbage = 0
+
+    def count(self, bot_id: str) -> int:
+        with self._lock:
+            journal = self._bots.get(bot_id)
+            return len(journal.trades) if journal else 0
+
+    def append(self, bot_id: str, trades: List[Dict[str, Any]], offset: Optional[int] = None,
+               metrics: Optional[Dict[str, Any]] = None) -> int:
+        """Append trades starting at position `offset` (default: the end).
+
+        Trades before the current end are already stored and skipped.
+        Raises ValueError if `offset` is past the end and TypeError if a
+        trade is not a dict, before anything is stored. Returns the number of
+        trades stored for the bot.
+        """
+        with self._lock:
+            journal = self._bot(bot_id)
+            stored = len(journal.trades)
+            if offset is None:
+                offset = stored
+            if offset < 0 or offset > stored:
+                raise ValueError(f"offset {offset} leaves a gap; {stored} trades are stored for {bot_id}")
+            new_trades = _checked(trades[stored - offset:])
+            records = []
+            for trade in new_trades:
+                journal.add_trade(trade)
+                records.append({'k': 't', 'trade': trade})
+            records.extend(self._metrics_records(journal, metrics))
+            self._write(journal, records)
+            return len(journal.trades)
+
+    def sync(self, bot_id: str, trades: List[Dict[str, Any]], metrics: Optional[Dict[str, Any]] = None) -> int:
+        """Make a bot's journal match a client's full trade list.
+
+        Appends only the trades past the stored ones. If the client holds
+        fewer trades than are stored, it has cleared them, so the journal
+        records a clear and the client's list.
+        """
+        with self._lock:
+            journal = self._bot(bot_id)
+            cleared = len(trades) < len(journal.trades)
+            new_trades = _checked(trades if cleared else trades[len(journal.trades):])
+            records = []
+            if cleared:
+                journal.clear()
+                records.append({'k': 'c'})
+            for trade in new_trades:
+                journal.add_trade(trade)
+                records.append({'k': 't', 'trade': trade})
+            records.extend(self._metrics_records(journal, metrics))
+            self._write(journal, records)
+            return len(journal.trades)
+
+    @staticmethod
+    def _metrics_records(journal: _BotJournal, metrics: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if metrics is None or metrics == journal.metrics:
+            return []
+        journal.garbage += journal.metrics is not None
+        journal.metrics = metrics
+        return [{'k': 'm', 'metrics': metrics}]
+
+    def _select(self, bot_id: Optional[str], start: Optional[float],
+                end: Optional[float]) -> List[Tuple[str, _BotJournal, Sequence[int]]]:
+        bots = [bot_id] if bot_id is not None else sorted(self._bots)
+        return [(name, self._bots[name], self._bots[name].positions(start, end))
+                for name in bots if name in self._bots]
+
+    def trades(self, bot_id: Optional[str] = None, start: Optional[float] = None, end: Optional[float] = None,
+               offset: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """A page of trades, optionally of one bot and within a timestamp range.
+
+        Trades of all bots are merged in timestamp order and each carries
+        its `bot_id`.
+        """
+        with self._lock:
+            selections = self._select(bot_id, start, end)
+            total = sum(len(positions) for _, _, positions in selections)
+
+            def rows(name, journal, positions) -> Iterator[Tuple[float, Dict[str, Any]]]:
+                for i in positions:
+                    yield journal.timestamps[i], {**journal.trades[i], 'bot_id': name}
+
+            if len(selections) == 1:
+                ordered = rows(*selections[0])
+            else:
+                ordered = merge(*(rows(*selection) for selection in selections), key=lambda row: row[0])
+            page = [trade for _, trade in islice(ordered, offset, offset + limit)]
+        return {'trades': page, 'total': total, 'offset': offset, 'limit': limit}
+
+    def iter_trades(self, bot_id: Optional[str] = None, start: Optional[float] = None,
+                    end: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """Every matching trade, bot by bot, as of the call, without copying the history.
+
+        Trade lists only grow until a clear replaces them, so the lists
+        taken here stay valid while the caller iterates.
+        """
+        with self._lock:
+            selections = [(name, journal.trades, positions)
+                          for name, journal, positions in self._select(bot_id, start, end)]
+        for name, trades, positions in selections:
+            for i in positions:
+                yield {**trades[i], 'bot_id': name}
+
+    def state(self, recent: Optional[int] = None) -> Dict[str, Any]:
+        """Every bot's trades and metrics in the legacy `bot_state.json` layout.
+
+        With `recent`, only each bot's last `recent` appended trades are
+        included, and `botCounts` gives how many are stored in total.
+        """
+        with self._lock:
+            bot_trades = {}
+            for name, journal in self._bots.items():
+                start = 0 if recent is None else max(len(journal.trades) - recent, 0)
+                bot_trades[name] = journal.trades[start:]
+            state = {
+                'botTrades': bot_trades,
+                'botMetrics': {name: journal.metrics for name, journal in self._bots.items()
+                               if journal.metrics is not None}
+            }
+            if recent is not None:
+                state['botCounts'] = {name: len(journal.trades) for name, journal in self._bots.items()}
+            return state
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: journal.metrics for name, journal in self._bots.items() if journal.metrics is not None}
@@ -4,6 +4,7 @@ ATB Web Application Startup Script
 Starts the web dashboard and backend services
 """
 
+import importlib.util
 import sys
 import os
 import subprocess
@@ -12,17 +13,15 @@ from pathlib import Path
 
 def check_dependencies():
     """Check if all required dependencies are installed."""
-    try:
-        import flask
-        import flask_cors
-        import flask_socketio
-        import yfinance
-        print("✓ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"✗ Missing dependency: {e}")
+    # Look the packages up without importing them; yfinance alone takes half a second to import
+    missing = [name for name in ('flask', 'flask_cors', 'flask_socketio', 'yfinance', 'reportlab')
+               if importlib.util.find_spec(name) is None]
+    if missing:
+        print(f"✗ Missing dependency: {', '.join(missing)}")
         print("Please install dependencies with: pip install -r requirements.txt")
         return False
+    print("✓ All dependencies are installed")
+    return True
 
 def start_web_app():
     """Start the web application."""
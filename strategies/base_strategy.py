@@ -3,9 +3,13 @@ Base strategy class for trading strategies.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, Tuple
+import numpy as np
 import pandas as pd
 
+from core.indicators import Indicator
+from core.indicator_cache import get_indicator_cache
+
 
 class BaseStrategy(ABC):
     """Abstract base class for trading strategies."""
@@ -15,6 +19,8 @@ class BaseStrategy(ABC):
         self.name = config.get('name', 'Unknown Strategy')
         self.symbol = config.get('symbol', 'AAPL')
         self.risk_per_trade = config.get('risk_per_trade', 2.0)
+        # Bars of history a strategy needs to decide on the latest bar
+        self.lookback = config.get('lookback', 200)
         
     @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -31,6 +37,42 @@ class BaseStrategy(ABC):
         """Determine if we should sell."""
         pass
     
+    def on_bar(self, window: pd.DataFrame) -> Tuple[bool, bool]:
+        """Decide (buy, sell) for the last bar of a rolling look-back window.
+        
+        The default evaluates `generate_signals` on the window, which costs
+        O(lookback) per bar; event-driven backtests avoid it through
+        `on_chunk` unless a strategy overrides this with incremental logic.
+        """
+        signals = self.generate_signals(window)
+        last = signals.iloc[-1]
+        return bool(last['buy_signal']), bool(last['sell_signal'])
+    
+    def on_chunk(self, frame: pd.DataFrame, start: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Buy and sell flags for the bars `frame[start:]`; earlier rows are look-back history.
+        
+        Used by event-driven backtests, where only a chunk of bars and the
+        `lookback` bars before it are held in memory. The default runs
+        `generate_signals` once over the whole frame, which matches `on_bar`
+        for strategies whose signals need no more than `lookback` bars; if
+        `on_bar` is overridden it is called for every bar instead.
+        """
+        if type(self).on_bar is not BaseStrategy.on_bar:
+            flags = [self.on_bar(frame.iloc[max(0, i - self.lookback + 1):i + 1]) for i in range(start, len(frame))]
+            buy, sell = zip(*flags) if flags else ((), ())
+            return np.array(buy, dtype=bool), np.array(sell, dtype=bool)
+        signals = self.generate_signals(frame).iloc[start:]
+        return signals['buy_signal'].to_numpy(dtype=bool), signals['sell_signal'].to_numpy(dtype=bool)
+    
+    def indicator(self, indicator: Indicator, data: pd.DataFrame, columns: Sequence[str] = ('Close',)):
+        """Compute an indicator over data columns through the shared indicator cache.
+        
+        Strategies asking for the same indicator and look-back on the same data
+        reuse one computed series instead of recalculating it.
+        """
+        arrays = [data[column].to_numpy(dtype='float64') for column in columns]
+        return get_indicator_cache().batch(indicator, *arrays)
+    
     def get_position_size(self, account_balance: float, current_price: float) -> int:
         """Calculate position size based on risk management."""
         risk_amount = account_balance * (self.risk_per_trade / 100)
@@ -42,4 +84,5 @@ class BaseStrategy(ABC):
         self.config.update(new_config)
         self.name = self.config.get('name', self.name)
         self.symbol = self.config.get('symbol', self.symbol)
-        self.risk_per_trade = self.config.get('risk_per_trade', self.risk_per_trade) 
\ No newline at end of file
+        self.risk_per_trade = self.config.get('risk_per_trade', self.risk_per_trade)
+        self.lookback = self.config.get('lookback', self.lookback) 
\ No newline at end of file
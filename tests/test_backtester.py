@@ -0,0 +1,91 @@
+"""
+Tests for the backtesting engine.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.backtester import Backtester
+from strategies.base_strategy import BaseStrategy
+
+
+class CrossoverStrategy(BaseStrategy):
+    """Moving average crossover strategy used as a test fixture."""
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        fast = data['Close'].rolling(window=self.config.get('fast', 5)).mean()
+        slow = data['Close'].rolling(window=self.config.get('slow', 20)).mean()
+        signals = pd.DataFrame(index=data.index)
+        signals['buy_signal'] = fast > slow
+        signals['sell_signal'] = (fast < slow) & (fast.shift(1) >= slow.shift(1))
+        return signals
+
+    def should_buy(self, data: pd.DataFrame) -> bool:
+        return bool(self.generate_signals(data)['buy_signal'].iloc[-1])
+
+    def should_sell(self, data: pd.DataFrame) -> bool:
+        return bool(self.generate_signals(data)['sell_signal'].iloc[-1])
+
+
+def make_ohlcv(n_bars: int = 750, seed: int = 7) -> pd.DataFrame:
+    """Build a deterministic random-walk OHLCV frame."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n_bars)))
+    index = pd.date_range('2020-01-01', periods=n_bars, freq='D', name='Date')
+    return pd.DataFrame({
+        'Open': close * (1 + rng.normal(0, 0.002, n_bars)),
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000, 10_000, n_bars)
+    }, index=index)
+
+
+def run_engine(mode: str, data: pd.DataFrame, signals: pd.DataFrame, initial_balance: float):
+    backtester = Backtester(initial_balance=initial_balance, execution_mode=mode)
+    backtester._initialize_backtest()
+    if mode == 'loop':
+        backtester._execute_trades(signals, data)
+    else:
+        backtester._execute_trades_vectorized(signals, data)
+    return backtester, backtester._calculate_performance()
+
+
+@pytest.mark.parametrize('initial_balance', [100000.0, 25000.0])
+@pytest.mark.parametrize('seed', [1, 7, 42])
+def test_vectorized_engine_matches_loop(seed, initial_balance):
+    data = make_ohlcv(seed=seed)
+    signals = CrossoverStrategy({'fast': 5, 'slow': 20}).generate_signals(data)
+
+    loop, loop_perf = run_engine('loop', data, signals, initial_balance)
+    vec, vec_perf = run_engine('vectorized', data, signals, initial_balance)
+
+    assert loop_perf['total_trades'] > 0
+    assert vec.trades.to_records() == loop.trades.to_records()
+    assert vec.positions == loop.positions
+    assert vec.current_balance == loop.current_balance
+    pd.testing.assert_frame_equal(pd.DataFrame(vec_perf['equity_curve']),
+                                  pd.DataFrame(loop_perf['equity_curve']), check_exact=True)
+    for key in ('total_return', 'annualized_return', 'volatility', 'sharpe_ratio',
+                'max_drawdown', 'win_rate', 'total_trades', 'final_balance'):
+        assert vec_perf[key] == loop_perf[key], key
+
+
+def test_run_backtest_uses_selected_engine(monkeypatch):
+    data = make_ohlcv()
+    strategy = CrossoverStrategy({})
+    results = {}
+    for mode in ('loop', 'vectorized'):
+        backtester = Backtester(execution_mode=mode)
+        monkeypatch.setattr(backtester, '_get_historical_data', lambda *args: data.copy())
+        results[mode] = backtester.run_backtest(strategy, 'TEST', '2020-01-01', '2022-01-01')
+
+    assert 'error' not in results['vectorized']
+    assert results['vectorized']['trades'] == results['loop']['trades']
+    assert results['vectorized']['final_balance'] == results['loop']['final_balance']
+
+
+def test_unknown_execution_mode_rejected():
+    with pytest.raises(ValueError):
+        Backtester(execution_mode='gpu')
@@ -0,0 +1,83 @@
+"""
+Tests for the Digital Bank asset store.
+"""
+
+import io
+import sqlite3
+import threading
+
+from core.bank_store import DEFAULT_BANK_ASSETS, BankAssetStore, read_assets_csv
+
+
+def persisted(db_path):
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute('SELECT id, name, ref, qty, value FROM bank_assets ORDER BY rowid').fetchall()
+    return [dict(zip(('id', 'name', 'ref', 'qty', 'value'), row)) for row in rows]
+
+
+def test_new_store_imports_legacy_csv_once(tmp_path):
+    csv_path = tmp_path / 'digital_bank.csv'
+    csv_path.write_text("id,name,ref,qty,value\nb1,Boat,B-1,2,1000\nbad,Row,R,x,1\n")
+    store = BankAssetStore(tmp_path / 'bank.db', csv_path=csv_path, flush_delay=0)
+    assert store.list() == [{'id': 'b1', 'name': 'Boat', 'ref': 'B-1', 'qty': 2, 'value': 1000.0}]
+
+    store.delete('b1')
+    store.close()
+    # An emptied store stays empty rather than re-importing the CSV
+    reopened = BankAssetStore(tmp_path / 'bank.db', csv_path=csv_path)
+    assert reopened.list() == []
+    reopened.close()
+
+
+def test_defaults_without_csv(tmp_path):
+    store = BankAssetStore(tmp_path / 'bank.db')
+    assert store.list() == [dict(asset) for asset in DEFAULT_BANK_ASSETS]
+    store.close()
+
+
+def test_changes_are_written_behind_in_batches(tmp_path):
+    db_path = tmp_path / 'bank.db'
+    store = BankAssetStore(db_path, flush_delay=0.05)
+    store.add({'id': 'car', 'name': 'Car', 'ref': 'C-1', 'qty': '1', 'value': '20000'})
+    store.update('car', {'value': 18000, 'id': 'ignored'})
+    store.update('bank_2', {'qty': 2})
+    store.delete('bank_3')
+    assert store.update('missing', {'qty': 1}) is None
+    assert store.flush(timeout=5)
+
+    assert persisted(db_path) == store.list()
+    assert store.get('car') == {'id': 'car', 'name': 'Car', 'ref': 'C-1', 'qty': 1, 'value': 18000.0}
+    assert [asset['id'] for asset in store.list()] == ['bank_1', 'bank_2', 'car']
+    store.close()
+
+    reopened = BankAssetStore(db_path)
+    assert reopened.list() == persisted(db_path)
+    reopened.close()
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    db_path = tmp_path / 'bank.db'
+    store = BankAssetStore(db_path, flush_delay=0.01)
+
+    def writer(n):
+        for i in range(200):
+            store.add({'id': f'w{n}_{i}', 'name': 'Asset', 'qty': i, 'value': n})
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    assert len(store.list()) == 3 + 8 * 200
+    assert sorted(map(str, persisted(db_path))) == sorted(map(str, store.list()))
+
+
+def test_csv_round_trip(tmp_path):
+    store = BankAssetStore(tmp_path / 'bank.db')
+    exported = store.export_csv()
+    assert read_assets_csv(io.StringIO(exported)) == store.list()
+    assert store.import_csv(io.StringIO("id,name,ref,qty,value\nbank_1,Ferrari,F-1,1,300000\n")) == 1
+    assert store.get('bank_1')['name'] == 'Ferrari'
+    store.close()
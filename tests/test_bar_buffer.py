@@ -0,0 +1,69 @@
+"""
+Tests for the OHLCV ring buffer.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtesting.synthetic import synthetic_ohlcv
+from core.bar_buffer import BarRingBuffer
+from core.market_data_serializer import frame_to_records
+
+
+def minute_bars(n_bars, seed=0, start='2024-01-02 09:30'):
+    return synthetic_ohlcv(n_bars, seed=seed, start=start).tz_localize('America/New_York')
+
+
+def test_repeated_day_snapshots_are_deduplicated():
+    day = minute_bars(390)
+    buffer = BarRingBuffer(capacity=1000)
+
+    assert buffer.update_frame(day.iloc[:100]) == 100
+    # Each cycle re-sends the whole day so far; only newer bars are appended
+    assert buffer.update_frame(day.iloc[:150]) == 50
+    assert buffer.update_frame(day.iloc[:150]) == 0
+    assert len(buffer) == 150
+    assert buffer.to_records() == frame_to_records(day.iloc[:150])
+
+
+def test_in_progress_bar_is_updated_in_place():
+    day = minute_bars(10)
+    buffer = BarRingBuffer(capacity=5)
+    buffer.update_frame(day)
+
+    forming = day.iloc[-1:].copy()
+    forming['Close'] = 999.0
+    assert buffer.update_frame(pd.concat([day.iloc[:-1], forming])) == 0
+    assert len(buffer) == 5
+    assert buffer.view()['Close'][-1] == 999.0
+    assert buffer.to_records()[-1]['price'] == 999.0
+
+
+def test_wraps_around_and_reads_are_zero_copy_views():
+    bars = minute_bars(2500, seed=3)
+    buffer = BarRingBuffer(capacity=1000)
+    for stop in range(7, 2501, 7):
+        buffer.update_frame(bars.iloc[max(0, stop - 30):stop])
+    buffer.update_frame(bars)
+
+    assert len(buffer) == 1000
+    assert buffer.to_records() == frame_to_records(bars.iloc[-1000:])
+
+    window = buffer.view()
+    assert np.shares_memory(window['Close'], buffer._values) and window['Close'].base is not None
+    np.testing.assert_array_equal(window['Close'], bars['Close'].to_numpy()[-1000:])
+
+    start, end = bars.index[-300], bars.index[-101]
+    ranged = buffer.to_records(start.isoformat(), end.isoformat())
+    assert ranged == frame_to_records(bars.loc[start:end])
+    # Naive bounds are read in the buffer's timezone
+    assert buffer.to_records(start.tz_localize(None), end.tz_localize(None)) == ranged
+    assert buffer.to_records(bars.index[-1] + pd.Timedelta(minutes=1)) == []
+
+
+def test_unsorted_batch_with_duplicates_keeps_last():
+    index = pd.DatetimeIndex(['2024-01-02 09:32', '2024-01-02 09:30', '2024-01-02 09:32'], tz='UTC')
+    values = np.array([[1.0, 2.0, 3.0]] * 5)
+    buffer = BarRingBuffer(capacity=10)
+    assert buffer.update(index, values) == 2
+    np.testing.assert_array_equal(buffer.view()['Open'], [2.0, 3.0])
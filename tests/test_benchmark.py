@@ -0,0 +1,46 @@
+"""
+Tests for the synthetic data generator and the backtest benchmark suite.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from backtesting.synthetic import synthetic_ohlcv
+from benchmarks.backtest_benchmark import STAGES, compare_reports, main, parse_size, run_benchmarks
+
+
+def test_synthetic_ohlcv_is_deterministic_and_consistent():
+    data = synthetic_ohlcv(5000, seed=3)
+    pd.testing.assert_frame_equal(data, synthetic_ohlcv(5000, seed=3))
+    assert not data.equals(synthetic_ohlcv(5000, seed=4))
+
+    assert data.index.is_monotonic_increasing and data.index.name == 'Date'
+    assert (data['High'] >= data[['Open', 'Close']].max(axis=1)).all()
+    assert (data['Low'] <= data[['Open', 'Close']].min(axis=1)).all()
+    assert (data['Low'] > 0).all()
+    np.testing.assert_array_equal(data['Open'].to_numpy()[1:], data['Close'].to_numpy()[:-1])
+
+    daily = synthetic_ohlcv(300, seed=3, freq='D', jump_intensity=0.0)
+    log_returns = np.diff(np.log(daily['Close'].to_numpy()))
+    assert 0.05 < log_returns.std() * np.sqrt(252) < 0.4
+
+
+def test_benchmark_report_covers_every_stage(tmp_path):
+    assert parse_size('10M') == 10_000_000 and parse_size('100k') == 100_000 and parse_size('750') == 750
+
+    report = run_benchmarks([500], repeats=1, memory=True)
+    stages = {(row['stage'], row['engine']) for row in report['results']}
+    assert {stage for stage, _ in stages} == set(STAGES)
+    assert ('execute_trades', 'loop') in stages and ('execute_trades', 'vectorized') in stages
+    assert all(row['seconds'] >= 0 and row['peak_bytes'] >= 0 for row in report['results'])
+
+    output = tmp_path / 'report.json'
+    main(['--sizes', '500', '--engines', 'vectorized', '--repeats', '1', '--no-memory', '--output', str(output)])
+    saved = json.loads(output.read_text())
+    assert saved['meta']['seed'] == 0
+    assert all(row['peak_bytes'] is None for row in saved['results'])
+
+    ratios = compare_reports(saved, saved)
+    assert len(ratios) == len(saved['results']) and all(row['ratio'] == 1.0 for row in ratios)
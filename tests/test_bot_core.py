@@ -0,0 +1,48 @@
+"""
+Tests for the Qt-free bot registry.
+"""
+
+import random
+
+import pytest
+
+from core.bot_core import SAMPLE_BOTS, BotRegistry
+
+
+class Log:
+    def __init__(self):
+        self.messages = []
+
+    def log_info(self, message):
+        self.messages.append(('info', message))
+
+    def log_error(self, message):
+        self.messages.append(('error', message))
+
+
+def test_sample_bots_and_config_changes():
+    registry = BotRegistry(Log())
+    assert set(registry.get_all_bots()) == set(SAMPLE_BOTS)
+    assert registry.get_bot('GOOGL_RSI_Bot')['risk_per_trade'] == 1.5
+
+    registry.set_active('AAPL_MA_Bot', True)
+    assert registry.get_active_bots() == ['AAPL_MA_Bot']
+    with pytest.raises(ValueError):
+        registry.update_bot_config('AAPL_MA_Bot', {'symbol': 'MSFT'})
+
+    registry.set_active('AAPL_MA_Bot', False)
+    registry.update_bot_config('AAPL_MA_Bot', {'symbol': 'MSFT'})
+    assert registry.get_bot('AAPL_MA_Bot')['symbol'] == 'MSFT'
+
+    registry.remove_bot('AAPL_MA_Bot')
+    with pytest.raises(ValueError):
+        registry.get_bot('AAPL_MA_Bot')
+
+
+def test_simulated_trading_returns_trades():
+    random.seed(1)
+    registry = BotRegistry(Log(), sample_bots=False)
+    registry.add_bot('bot', {'symbol': 'BTC'})
+    trades = [trade for trade in (registry.simulate_trading('bot') for _ in range(100)) if trade]
+    assert trades and all(trade['symbol'] == 'BTC' and trade['type'] in ('BUY', 'SELL') for trade in trades)
+    assert 'bot' in registry.bot_indicators
@@ -0,0 +1,83 @@
+"""
+Tests for the running bot statistics totals.
+"""
+
+import random
+import pytest
+
+from core.bot_stats import BotStatsAggregator
+
+
+def new_bot(bot_id, active=False, pnl=0.0):
+    return {'id': bot_id, 'active': active,
+            'stats': {'total_pnl': pnl, 'daily_pnl': 0.0, 'trades_count': 0, 'win_rate': 0}}
+
+
+def brute_force(bots):
+    return {
+        'total_pnl': sum(bot['stats']['total_pnl'] for bot in bots.values()),
+        'daily_pnl': sum(bot['stats']['daily_pnl'] for bot in bots.values()),
+        'active_bots': sum(1 for bot in bots.values() if bot['active']),
+        'total_trades': sum(bot['stats']['trades_count'] for bot in bots.values())
+    }
+
+
+def assert_totals_match(aggregator, bots):
+    totals = aggregator.snapshot()
+    expected = brute_force(bots)
+    assert totals['active_bots'] == expected['active_bots']
+    assert totals['total_trades'] == expected['total_trades']
+    assert totals['total_pnl'] == pytest.approx(expected['total_pnl'])
+    assert totals['daily_pnl'] == pytest.approx(expected['daily_pnl'])
+
+
+def test_totals_follow_random_bot_changes():
+    rng = random.Random(7)
+    bots = {f'bot{i}': new_bot(f'bot{i}', active=i % 3 == 0, pnl=float(i)) for i in range(50)}
+    aggregator = BotStatsAggregator()
+    aggregator.rebuild(bots.values())
+
+    for step in range(5000):
+        bot = bots[rng.choice(list(bots))]
+        action = rng.random()
+        if action < 0.5:
+            aggregator.record_trade(bot, rng.uniform(-5, 5), rng.uniform(-1, 1))
+        elif action < 0.8:
+            aggregator.set_active(bot, rng.random() < 0.5)
+        elif action < 0.9:
+            aggregator.update_bot(bot, {'risk': 'high', 'stats': {**bot['stats'], 'daily_pnl': 0.0}})
+        else:
+            new = new_bot(f'new{step}', active=rng.random() < 0.5)
+            bots[new['id']] = new
+            aggregator.add_bot(new)
+    assert_totals_match(aggregator, bots)
+    assert aggregator.bot_count == len(bots)
+
+    removed = bots.pop('bot0')
+    aggregator.remove_bot(removed)
+    assert_totals_match(aggregator, bots)
+
+
+def test_version_changes_only_with_the_totals():
+    bot = new_bot('bot1')
+    aggregator = BotStatsAggregator()
+    aggregator.add_bot(bot)
+    version = aggregator.version
+    aggregator.set_active(bot, False)
+    assert aggregator.version == version
+    aggregator.set_active(bot, True)
+    aggregator.record_trade(bot, 2.5)
+    assert aggregator.version == version + 2
+    assert aggregator.snapshot() == {'total_pnl': 2.5, 'daily_pnl': 0.0, 'active_bots': 1, 'total_trades': 1}
+
+
+def test_failed_update_leaves_bot_and_totals_alone():
+    bot = new_bot('bot1', active=True, pnl=10.0)
+    aggregator = BotStatsAggregator()
+    aggregator.add_bot(bot)
+    before = aggregator.snapshot()
+    for changes in ({'stats': {}}, {'stats': None}, None):
+        with pytest.raises((KeyError, TypeError)):
+            aggregator.update_bot(bot, changes)
+    assert aggregator.snapshot() == before
+    assert bot == new_bot('bot1', active=True, pnl=10.0)
@@ -0,0 +1,88 @@
+"""
+Tests for chart downsampling.
+"""
+
+import numpy as np
+import pytest
+
+from backtesting.synthetic import synthetic_ohlcv
+from core.downsampling import downsample_bars, downsample_records, lttb_indices
+from core.market_data_serializer import frame_to_records
+from core.timeframes import frame_values
+
+
+def reference_lttb(x, y, threshold):
+    """Straightforward LTTB, one point at a time."""
+    n = len(y)
+    n_buckets = threshold - 2
+    kept = [0]
+    a = 0
+    for i in range(n_buckets):
+        start = i * (n - 2) // n_buckets + 1
+        end = (i + 1) * (n - 2) // n_buckets + 1
+        next_start = end
+        next_end = (i + 2) * (n - 2) // n_buckets + 1 if i + 1 < n_buckets else n
+        avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+@pytest.mark.parametrize('n, threshold', [(1000, 100), (5003, 997), (50, 3), (10, 9)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n)
+    y = np.cumsum(rng.normal(size=n))
+    x = np.arange(n, dtype=np.float64)
+    assert lttb_indices(y, threshold).tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+
+
+def test_lttb_on_timestamps_handles_gaps():
+    rng = np.random.default_rng(1)
+    n = 2000
+    # Nanosecond times with an overnight gap in the middle
+    times = np.arange(n, dtype=np.int64) * 60_000_000_000 + 1_700_000_000_000_000_000
+    times[n // 2:] += 16 * 3600 * 1_000_000_000
+    y = np.cumsum(rng.normal(size=n))
+    kept = lttb_indices(y, 200, x=times)
+    scaled = ((times - times[0]) * ((n - 1) / (times[-1] - times[0]))).tolist()
+    assert kept.tolist() == reference_lttb(scaled, y.tolist(), 200)
+
+
+def test_short_series_are_returned_whole():
+    values = frame_values(synthetic_ohlcv(20))
+    for method in ('lttb', 'minmax'):
+        positions, result = downsample_bars(values, 50, method)
+        assert positions.tolist() == list(range(20))
+        np.testing.assert_array_equal(result, values)
+
+
+def test_minmax_candles_keep_extremes_and_volume():
+    hist = synthetic_ohlcv(100_003)
+    values = frame_values(hist)
+    positions, candles = downsample_bars(values, 1000, 'minmax')
+    assert candles.shape == (5, 1000)
+    assert positions[0] == 0 and np.all(np.diff(positions) > 0)
+    assert candles[1].max() == values[1].max()
+    assert candles[2].min() == values[2].min()
+    assert candles[0, 0] == values[0, 0] and candles[3, -1] == values[3, -1]
+    assert candles[4].sum() == pytest.approx(values[4].sum())
+
+
+def test_records_downsampling():
+    records = frame_to_records(synthetic_ohlcv(5000))
+    lines = downsample_records(records, 500)
+    assert len(lines) == 500 and lines[0] is records[0] and lines[-1] is records[-1]
+    candles = downsample_records(records, 250, 'minmax')
+    assert len(candles) == 250
+    assert list(candles[0]) == list(records[0])
+    assert max(bar['high'] for bar in candles) == max(bar['high'] for bar in records)
+    assert candles[-1]['price'] == records[-1]['price']
+    with pytest.raises(ValueError):
+        downsample_records(records, 100, 'average')
@@ -0,0 +1,81 @@
+"""
+Tests for the streaming NDJSON export.
+"""
+
+import gzip
+import json
+
+import pytest
+
+from core.export_stream import ExportFilter, export_records, gzip_chunks, ndjson_chunks, parse_time_ms
+from core.trade_journal import TradeJournal
+
+
+def bar(time, price):
+    return {'time': time, 'price': price, 'volume': 10, 'high': price + 1, 'low': price - 1, 'open': price}
+
+
+BOTS = {'b1': {'name': 'Apple Bot', 'asset': 'AAPL', 'active': True},
+        'b2': {'name': 'Tesla Bot', 'asset': 'TSLA', 'active': False}}
+MARKET = {'AAPL': [bar(f'2024-01-0{day}T00:00:00+00:00', 100.0 + day) for day in range(1, 6)],
+          'TSLA': [bar('2024-01-03T00:00:00+00:00', 200.0)]}
+TICKERS = {'AAPL': {'symbol': 'AAPL', 'price': 105.0}, 'TSLA': {'symbol': 'TSLA', 'price': 200.0}}
+
+
+def decode(chunks):
+    return [json.loads(line) for line in b''.join(chunks).decode('utf-8').splitlines()]
+
+
+def test_full_export_has_every_section():
+    records = decode(ndjson_chunks(export_records(ExportFilter(), BOTS, MARKET, TICKERS, timestamp='now')))
+    assert records[0] == {'type': 'export', 'timestamp': 'now', 'sections': ['bots', 'market_data', 'ticker_data',
+                                                                             'trades'],
+                          'assets': None, 'start': None, 'end': None}
+    counts = {}
+    for record in records[1:]:
+        counts[record['type']] = counts.get(record['type'], 0) + 1
+    assert counts == {'bot': 2, 'bar': 6, 'ticker': 2}
+    assert records[1] == {'type': 'bot', 'id': 'b1', 'data': BOTS['b1']}
+
+
+def test_filters_narrow_sections_assets_and_time():
+    export_filter = ExportFilter.from_args({'sections': 'market_data,bots', 'assets': 'aapl',
+                                            'start': '2024-01-02T00:00:00Z',
+                                            'end': str(parse_time_ms('2024-01-04T00:00:00Z'))})
+    records = list(export_records(export_filter, BOTS, MARKET, TICKERS))[1:]
+    assert [record['type'] for record in records] == ['bot', 'bar', 'bar', 'bar']
+    assert [record['data']['price'] for record in records[1:]] == [102.0, 103.0, 104.0]
+
+
+def test_trades_come_from_the_journal(tmp_path):
+    journal = TradeJournal(tmp_path)
+    journal.append('b1', [{'type': 'BUY', 'price': 1.0, 'timestamp': t} for t in (10, 20, 30)])
+    export_filter = ExportFilter(sections=('trades',), start=15)
+    records = list(export_records(export_filter, BOTS, MARKET, TICKERS,
+                                  trades=lambda start, end: journal.iter_trades(start=start, end=end)))
+    assert records[1] == {'type': 'trade', 'bot_id': 'b1', 'data': {'type': 'BUY', 'price': 1.0, 'timestamp': 20}}
+    assert [record['data']['timestamp'] for record in records[1:]] == [20, 30]
+
+
+def test_bad_filters_are_rejected():
+    with pytest.raises(ValueError):
+        ExportFilter.from_args({'sections': 'bots,secrets'})
+    with pytest.raises(ValueError):
+        ExportFilter.from_args({'start': 'yesterday'})
+
+
+def test_records_are_streamed_in_bounded_chunks():
+    def endless_bars():
+        for i in range(20_000):
+            yield {'type': 'bar', 'price': float(i)}
+
+    chunks = ndjson_chunks(endless_bars(), chunk_size=4096)
+    sizes = [len(chunk) for chunk in chunks]
+    assert len(sizes) > 100
+    assert max(sizes) < 4096 + 100
+
+
+def test_gzip_stream_decompresses_to_the_ndjson():
+    chunks = list(ndjson_chunks(export_records(ExportFilter(), BOTS, MARKET, TICKERS, timestamp='now'),
+                                chunk_size=64))
+    assert gzip.decompress(b''.join(gzip_chunks(iter(chunks)))) == b''.join(chunks)
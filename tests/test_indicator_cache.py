@@ -0,0 +1,57 @@
+"""
+Tests for the indicator memoization cache.
+"""
+
+import numpy as np
+import pytest
+
+from core.indicators import SMA, MACD
+from core.indicator_cache import IndicatorCache, fingerprint
+
+
+def test_cache_hits_for_same_data_and_params():
+    close = np.linspace(100, 200, 500)
+    cache = IndicatorCache()
+
+    first = cache.batch(SMA(20), close)
+    second = cache.batch(SMA(20), close.copy())
+    assert second is first
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    cache.batch(SMA(50), close)
+    cache.batch(SMA(20), close + 1)
+    assert cache.stats()['misses'] == 3
+
+    with pytest.raises(ValueError):
+        first[0] = 1.0
+
+
+def test_multi_output_indicators_are_cached():
+    close = np.random.default_rng(0).normal(100, 1, 300)
+    cache = IndicatorCache()
+    key = fingerprint(close)
+
+    macd = cache.batch(MACD(12, 26, 9), close, data_fingerprint=key)
+    again = cache.batch(MACD(12, 26, 9), close, data_fingerprint=key)
+    assert again is macd
+    np.testing.assert_array_equal(macd[0], MACD(12, 26, 9).batch(close)[0])
+
+
+def test_lru_eviction_respects_budget():
+    close = np.arange(1000, dtype=np.float64)
+    entry_bytes = close.nbytes
+    cache = IndicatorCache(budget_bytes=2 * entry_bytes)
+
+    cache.batch(SMA(5), close)
+    cache.batch(SMA(10), close)
+    cache.batch(SMA(5), close)   # refresh SMA(5) so SMA(10) is least recent
+    cache.batch(SMA(15), close)
+
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] <= stats['budget_bytes']
+
+    cache.batch(SMA(5), close)
+    assert cache.stats()['hits'] == 2
+    cache.batch(SMA(10), close)
+    assert cache.stats()['misses'] == 4
@@ -0,0 +1,108 @@
+"""
+Tests for batch/streaming agreement of technical indicators.
+"""
+
+import numpy as np
+import pytest
+
+from core.indicators import SMA, EMA, RSI, MACD, BollingerBands, ATR, IndicatorSet
+
+
+def make_bars(n_bars: int = 3000, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    close = 45000 * np.exp(np.cumsum(rng.normal(0, 0.01, n_bars)))
+    high = close * (1 + rng.uniform(0, 0.01, n_bars))
+    low = close * (1 - rng.uniform(0, 0.01, n_bars))
+    return high, low, close
+
+
+def assert_modes_agree(batch, streamed):
+    np.testing.assert_allclose(np.asarray(streamed, dtype=np.float64), batch,
+                               rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('indicator', [SMA(20), SMA(50), EMA(12), EMA(20, adjust=False), RSI(14)])
+def test_single_series_indicators_agree(indicator):
+    _, _, close = make_bars()
+    batch = indicator.batch(close)
+    streamed = [indicator.update(x) for x in close]
+    assert_modes_agree(batch, streamed)
+
+
+@pytest.mark.parametrize('indicator', [MACD(12, 26, 9), BollingerBands(20, 2.0)])
+def test_multi_output_indicators_agree(indicator):
+    _, _, close = make_bars()
+    batch = indicator.batch(close)
+    streamed = np.array([indicator.update(x) for x in close])
+    for column, expected in enumerate(batch):
+        assert_modes_agree(expected, streamed[:, column])
+
+
+@pytest.mark.parametrize('indicator', [SMA(3), SMA(20), EMA(12), EMA(20, adjust=False), RSI(14),
+                                       MACD(12, 26, 9), BollingerBands(3, 2.0), BollingerBands(20, 2.0)])
+def test_missing_bars_agree(indicator):
+    _, _, close = make_bars(600)
+    close[[0, 1, 50, 51, 52, 300, 599]] = np.nan
+    batch = indicator.batch(close)
+    streamed = np.array([indicator.update(x) for x in close])
+    for column, expected in enumerate(batch if isinstance(batch, tuple) else [batch]):
+        assert_modes_agree(expected, streamed if streamed.ndim == 1 else streamed[:, column])
+
+    sma = SMA(3)
+    assert_modes_agree([np.nan] * 5 + [5.0, 6.0, 7.0], [sma.update(x) for x in [1, 2, np.nan, 4, 5, 6, 7, 8]])
+
+
+@pytest.mark.parametrize('gaps', [[50], [0, 1, 5], [20, 21, 200, 399]])
+def test_atr_agrees_across_missing_bars(gaps):
+    high, low, close = make_bars(400)
+    for series in (high, low, close):
+        series[gaps] = np.nan
+    atr = ATR(14)
+    batch = atr.batch(high, low, close)
+    streamed = [atr.update(h, l, c) for h, l, c in zip(high, low, close)]
+    assert_modes_agree(batch, streamed)
+    assert not np.isnan(batch[-2])
+
+
+def test_indicator_set_recovers_after_missing_bar():
+    high, low, close = make_bars(100)
+    indicators = IndicatorSet()
+    for i, (h, l, c) in enumerate(zip(high, low, close)):
+        if i == 60:
+            h = l = c = float('nan')
+        snapshot = indicators.update(c, h, l)
+        if i == 60:
+            assert snapshot['atr'] is not None
+    assert isinstance(indicators.snapshot()['atr'], float)
+
+
+def test_atr_agrees():
+    high, low, close = make_bars()
+    atr = ATR(14)
+    batch = atr.batch(high, low, close)
+    streamed = [atr.update(h, l, c) for h, l, c in zip(high, low, close)]
+    assert_modes_agree(batch, streamed)
+    assert np.isnan(batch[:13]).all() and not np.isnan(batch[13:]).any()
+
+
+def test_reset_restarts_stream():
+    _, _, close = make_bars(200)
+    sma = SMA(20)
+    for x in close:
+        sma.update(x)
+    sma.reset()
+    streamed = [sma.update(x) for x in close[:40]]
+    assert_modes_agree(SMA(20).batch(close[:40]), streamed)
+
+
+def test_indicator_set_snapshot_is_json_friendly():
+    high, low, close = make_bars(60)
+    indicators = IndicatorSet()
+    snapshot = indicators.update(close[0], high[0], low[0])
+    assert snapshot['sma_20'] is None and snapshot['bars'] == 1
+
+    for h, l, c in zip(high[1:], low[1:], close[1:]):
+        snapshot = indicators.update(c, h, l)
+    assert snapshot['bars'] == 60
+    assert snapshot['sma_50'] == pytest.approx(SMA(50).batch(close)[-1])
+    assert all(isinstance(value, (float, int)) for value in snapshot.values())
@@ -0,0 +1,73 @@
+"""
+Tests for the columnar trade and equity ledgers.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.ledger import EQUITY_DTYPE, EquityLedger, TradeLedger
+from tests.test_backtester import CrossoverStrategy, make_ohlcv
+
+
+def test_trade_ledger_grows_and_round_trips_records():
+    ledger = TradeLedger(capacity=1)
+    dates = pd.date_range('2021-01-01', periods=200, freq='D', tz='America/New_York')
+    for i, date in enumerate(dates):
+        if i % 2 == 0:
+            ledger.record_buy(date, 'AAA' if i % 4 == 0 else 'BBB', 100, 10.0 + i, 1000.0 + 100 * i)
+        else:
+            ledger.record_sell(date, 'AAA', 100, 11.0 + i, 1100.0 + 100 * i, 100.0)
+
+    records = ledger.to_records()
+    assert len(ledger) == len(records) == 200
+    assert records[0] == {'date': dates[0], 'symbol': 'AAA', 'side': 'BUY', 'quantity': 100,
+                          'price': 10.0, 'cost': 1000.0}
+    assert records[1] == {'date': dates[1], 'symbol': 'AAA', 'side': 'SELL', 'quantity': 100,
+                          'price': 12.0, 'revenue': 1200.0, 'pnl': 100.0}
+    assert records[2]['symbol'] == 'BBB'
+    np.testing.assert_array_equal(ledger.pnl, np.full(100, 100.0))
+
+
+def test_result_is_lazy_and_matches_eager_records():
+    performance = Backtester().run_backtest_on_data(CrossoverStrategy({}), make_ohlcv())
+    assert 'equity_curve' in performance._lazy and 'trades' in performance._lazy
+
+    records = performance['equity_curve']
+    assert 'equity_curve' not in performance._lazy
+    assert len(records) == len(performance.equity_ledger)
+    assert set(records[0]) == {'balance', 'portfolio_value', 'equity', 'returns', 'cummax', 'drawdown'}
+    assert min(r['drawdown'] for r in records) == performance['max_drawdown']
+
+    display = performance.to_dict(max_points=50)
+    assert len(display['equity_curve']) <= 50
+    assert min(r['equity'] for r in display['equity_curve']) == performance.equity_ledger.equity.min()
+    curve = performance.equity_ledger.to_series()
+    assert all(curve[r['date']] == r['equity'] for r in display['equity_curve'])
+
+
+def test_ten_million_bar_equity_ledger():
+    n_bars = 10_000_000
+    chunk = 1_000_000
+    backtester = Backtester()
+    backtester.equity_curve = EquityLedger()
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp('2000-01-01', tz='UTC')
+
+    for offset in range(0, n_bars, chunk):
+        dates = pd.date_range(start + pd.Timedelta(minutes=offset), periods=chunk, freq='min')
+        equity = 100000.0 * np.exp(np.cumsum(rng.normal(0, 1e-5, chunk)))
+        backtester.equity_curve.extend(dates, equity, equity)
+
+    ledger = backtester.equity_curve
+    assert len(ledger) == n_bars
+    assert ledger.nbytes <= 2 * n_bars * EQUITY_DTYPE.itemsize
+
+    performance = backtester._calculate_performance()
+    assert performance['final_balance'] == ledger.equity[-1]
+    assert 'equity_curve' in performance._lazy
+
+    display = performance.to_dict(max_points=2000, include_trades=False)
+    assert len(display['equity_curve']) <= 2000
+    assert min(r['equity'] for r in display['equity_curve']) == ledger.equity.min()
+    assert max(r['equity'] for r in display['equity_curve']) == ledger.equity.max()
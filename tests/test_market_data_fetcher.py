@@ -0,0 +1,128 @@
+"""
+Tests for concurrent market data fetching.
+"""
+
+import threading
+import time
+
+import pandas as pd
+
+from core.market_data_fetcher import CircuitBreaker, MarketDataFetcher
+
+
+def bars(symbol: str) -> pd.DataFrame:
+    return pd.DataFrame({'Close': [1.0]}, index=pd.DatetimeIndex(['2024-01-02 09:30'], name=symbol))
+
+
+def test_cycle_time_scales_with_slowest_symbol():
+    symbols = [f'S{i}' for i in range(8)]
+
+    def fetch(symbol, timeout):
+        time.sleep(0.2)
+        return bars(symbol)
+
+    fetcher = MarketDataFetcher(fetch, max_workers=8, timeout=2.0)
+    start = time.monotonic()
+    results = fetcher.fetch_all(symbols)
+    elapsed = time.monotonic() - start
+    fetcher.close()
+
+    assert set(results) == set(symbols)
+    assert elapsed < 0.2 * len(symbols) / 2
+
+
+def test_slow_symbol_times_out_without_blocking_others():
+    release = threading.Event()
+
+    def fetch(symbol, timeout):
+        if symbol == 'SLOW':
+            release.wait(5)
+        return bars(symbol)
+
+    fetcher = MarketDataFetcher(fetch, max_workers=4, timeout=0.3)
+    start = time.monotonic()
+    results = fetcher.fetch_all(['A', 'SLOW', 'B'])
+    assert set(results) == {'A', 'B'}
+    assert time.monotonic() - start < 1.0
+
+    # The stuck call is not started a second time while it is still running
+    assert fetcher.stats()['in_flight'] == ['SLOW']
+    assert set(fetcher.fetch_all(['A', 'SLOW'])) == {'A'}
+    release.set()
+    fetcher.close()
+
+
+def test_cycle_ends_when_every_worker_is_stuck():
+    release = threading.Event()
+
+    def fetch(symbol, timeout):
+        if symbol.startswith('HUNG'):
+            release.wait(5)
+        return bars(symbol)
+
+    fetcher = MarketDataFetcher(fetch, max_workers=2, timeout=0.3)
+    start = time.monotonic()
+    assert fetcher.fetch_all(['HUNG1', 'HUNG2', 'A', 'B']) == {}
+    assert fetcher.fetch_all(['A']) == {}
+    assert time.monotonic() - start < 1.5
+
+    # Only the hung calls hold a slot; the cancelled symbols are fetched once a worker frees up
+    assert fetcher.stats()['in_flight'] == ['HUNG1', 'HUNG2']
+    release.set()
+    assert set(fetcher.fetch_all(['A', 'B'])) == {'A', 'B'}
+    fetcher.close()
+
+
+def test_retries_with_backoff_then_succeeds():
+    attempts = []
+
+    def fetch(symbol, timeout):
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ConnectionError('temporary')
+        return bars(symbol)
+
+    fetcher = MarketDataFetcher(fetch, timeout=2.0, retries=2, backoff=0.05)
+    assert set(fetcher.fetch_all(['A'])) == {'A'}
+    fetcher.close()
+
+    assert len(attempts) == 3
+    assert attempts[2] - attempts[1] >= attempts[1] - attempts[0] >= 0.05
+
+
+def test_circuit_opens_and_recovers_after_cooldown():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0, clock=lambda: now[0])
+
+    breaker.record_failure('X')
+    assert breaker.allow('X')
+    breaker.record_failure('X')
+    assert breaker.state('X') == CircuitBreaker.OPEN and not breaker.allow('X')
+
+    now[0] = 31.0
+    assert breaker.allow('X') and not breaker.allow('X')   # one trial call only
+    breaker.record_failure('X')
+    assert breaker.state('X') == CircuitBreaker.OPEN
+
+    now[0] = 62.0
+    assert breaker.allow('X')
+    breaker.record_success('X')
+    assert breaker.state('X') == CircuitBreaker.CLOSED
+
+
+def test_failing_symbol_is_skipped_once_circuit_opens():
+    calls = []
+
+    def fetch(symbol, timeout):
+        calls.append(symbol)
+        if symbol == 'BAD':
+            raise ValueError('no data')
+        return bars(symbol)
+
+    fetcher = MarketDataFetcher(fetch, retries=0, failure_threshold=2, reset_timeout=60.0)
+    for _ in range(4):
+        assert set(fetcher.fetch_all(['GOOD', 'BAD'])) == {'GOOD'}
+    fetcher.close()
+
+    assert calls.count('BAD') == 2 and calls.count('GOOD') == 4
+    assert fetcher.stats()['open_circuits'] == ['BAD']
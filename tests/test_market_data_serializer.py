@@ -0,0 +1,50 @@
+"""
+Tests for the vectorized market data serializer.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.synthetic import synthetic_ohlcv
+from core.market_data_serializer import frame_to_columns, frame_to_records, isoformat_index
+
+
+def reference_records(hist):
+    """The original per-row conversion."""
+    data = []
+    for timestamp, row in hist.iterrows():
+        data.append({
+            'time': timestamp.isoformat(),
+            'price': float(row['Close']),
+            'volume': int(row.get('Volume', 0) or 0),
+            'high': float(row['High']),
+            'low': float(row['Low']),
+            'open': float(row['Open'])
+        })
+    return data
+
+
+@pytest.mark.parametrize('tz', [None, 'UTC', 'America/New_York', 'Asia/Kolkata'])
+def test_records_match_iterrows(tz):
+    hist = synthetic_ohlcv(24 * 400, seed=2, freq='h')
+    if tz is not None:
+        hist = hist.tz_localize('UTC').tz_convert(tz)
+    assert frame_to_records(hist) == reference_records(hist)
+
+
+def test_sub_second_stamps_and_missing_volume():
+    index = pd.DatetimeIndex(['2024-03-10 01:59:59.5', '2024-03-10 03:00:00'], tz='America/New_York')
+    hist = pd.DataFrame({'Open': [1.0, 2.0], 'High': [2.0, 3.0], 'Low': [0.5, 1.5],
+                         'Close': [1.5, 2.5], 'Volume': [np.nan, 10.0]}, index=index)
+    # The per-row loop raised on NaN volume; it is now reported as 0
+    assert frame_to_records(hist) == reference_records(hist.fillna({'Volume': 0}))
+    assert isoformat_index(index[:0]) == []
+
+
+def test_columns_layout():
+    hist = synthetic_ohlcv(50, seed=1)
+    columns = frame_to_columns(hist)
+    assert list(columns) == ['time', 'price', 'volume', 'high', 'low', 'open']
+    assert all(len(values) == 50 for values in columns.values())
+    assert columns['price'] == hist['Close'].tolist()
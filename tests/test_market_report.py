@@ -0,0 +1,37 @@
+"""
+Tests for the market review report built from live dashboard data.
+"""
+
+from datetime import datetime
+
+from core.market_report import build_report_data, render_market_review_pdf
+
+
+def bars(closes):
+    return [{'time': f'2024-01-01T{hour:02d}:00:00', 'price': close, 'volume': 1,
+             'high': close, 'low': close, 'open': close} for hour, close in enumerate(closes)]
+
+
+MARKET = {'AAPL': bars([100.0, 100.1, 100.2, 100.1]), 'BTC': bars([100.0, 110.0, 104.0, 112.0])}
+TICKERS = {'AAPL': {'price': 100.1, 'change_percent': -0.1}}
+BOTS = {'b1': {'name': 'Apple Bot', 'asset': 'AAPL', 'active': True,
+               'stats': {'total_pnl': 12.5, 'daily_pnl': 1.0, 'trades_count': 3}}}
+TOTALS = {'total_pnl': 12.5, 'daily_pnl': 1.0, 'active_bots': 1, 'total_trades': 3}
+
+
+def test_report_uses_live_market_and_bot_data():
+    data = build_report_data(MARKET, TICKERS, BOTS, TOTALS, generated=datetime(2024, 1, 2, 9, 30))
+    assert data['generated'] == 'January 02, 2024 at 09:30 AM'
+    assert data['markets'] == [
+        {'symbol': 'AAPL', 'price': 100.1, 'change_percent': -0.1, 'volatility': 'Low'},
+        {'symbol': 'BTC', 'price': 112.0, 'change_percent': 0.0, 'volatility': 'Very High'}]
+    assert data['shifts'][0]['symbol'] == 'BTC'
+    assert round(data['shifts'][0]['change_percent'], 6) == 10.0
+    assert data['bots'] == [{'name': 'Apple Bot', 'asset': 'AAPL', 'status': 'Active', 'pnl': 12.5, 'trades': 3}]
+
+
+def test_report_renders_to_pdf():
+    trades = [{'type': 'BUY', 'price': 100.0, 'timestamp': 1_700_000_000_000}]
+    pdf = render_market_review_pdf(build_report_data(MARKET, TICKERS, BOTS, TOTALS, trades, 'b1'))
+    assert pdf.startswith(b'%PDF')
+    assert render_market_review_pdf(build_report_data({}, {}, {}, TOTALS)).startswith(b'%PDF')
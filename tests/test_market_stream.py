@@ -0,0 +1,144 @@
+"""
+Tests for the sequenced market snapshot/delta protocol.
+"""
+
+import copy
+import json
+import pytest
+from flask import Flask
+from flask_socketio import SocketIO, join_room
+
+from core.market_stream import MarketDeltaTracker, apply_asset_delta, apply_delta, split_delta
+from core.stream_rooms import RoomPublisher, event_rooms, parse_subscription, room_name
+
+
+def bar(minute, price):
+    return {'time': f'2024-01-02T09:{minute:02d}:00-05:00', 'price': price, 'volume': 100,
+            'high': price + 1, 'low': price - 1, 'open': price}
+
+
+def day(n_bars, last_price=None):
+    bars = [bar(i, 100.0 + i) for i in range(n_bars)]
+    if last_price is not None:
+        bars[-1] = bar(n_bars - 1, last_price)
+    return bars
+
+
+def test_client_state_follows_server_through_deltas():
+    tracker = MarketDeltaTracker()
+    tracker.update({'AAPL': day(30), 'BTC': day(10)}, {'AAPL': {'price': 129.0, 'volume': 5}})
+    client = copy.deepcopy(tracker.snapshot())
+
+    cycles = [
+        ({'AAPL': day(31), 'BTC': day(10)}, {'AAPL': {'price': 130.0, 'volume': 5}}),
+        ({'AAPL': day(31, last_price=131.5), 'BTC': day(12)}, {'AAPL': {'price': 131.5, 'volume': 5}}),
+        ({'AAPL': day(33), 'BTC': [bar(0, 5.0)]}, {'AAPL': {'price': 132.0, 'volume': 6}}),
+    ]
+    deltas = []
+    for market_data, ticker in cycles:
+        delta = tracker.update(market_data, ticker)
+        deltas.append(delta)
+        assert apply_delta(client, delta)
+        assert client == tracker.snapshot()
+
+    # Only the changed pieces travel
+    assert deltas[0]['bars'] == {'AAPL': [bar(30, 130.0)]}
+    assert deltas[0]['ticker'] == {'AAPL': {'price': 130.0}}
+    assert deltas[1]['bars']['AAPL'] == [bar(30, 131.5)]
+    assert deltas[1]['bars']['BTC'] == [bar(10, 110.0), bar(11, 111.0)]
+    assert deltas[2]['resets'] == {'BTC': [bar(0, 5.0)]}
+    assert [d['seq'] for d in deltas] == [2, 3, 4]
+
+
+def test_unchanged_state_emits_nothing_and_keeps_sequence():
+    tracker = MarketDeltaTracker()
+    market_data = {'AAPL': day(5)}
+    ticker = {'AAPL': {'price': 104.0}}
+    assert tracker.update(market_data, ticker)['seq'] == 1
+    assert tracker.update(market_data, ticker) is None
+    assert tracker.update({'AAPL': day(5)}, {'AAPL': {'price': 104.0}}) is None
+    assert tracker.seq == 1
+
+
+def test_gap_requires_resync():
+    tracker = MarketDeltaTracker()
+    tracker.update({'AAPL': day(5)}, {})
+    client = copy.deepcopy(tracker.snapshot())
+
+    tracker.update({'AAPL': day(6)}, {})
+    missed_then_next = tracker.update({'AAPL': day(7)}, {})
+    before = copy.deepcopy(client)
+    assert not apply_delta(client, missed_then_next)
+    assert client == before
+
+    client = copy.deepcopy(tracker.snapshot())
+    assert apply_delta(client, tracker.update({'AAPL': day(8)}, {}))
+    assert client == tracker.snapshot()
+
+
+def test_delta_is_much_smaller_than_full_broadcast():
+    tracker = MarketDeltaTracker()
+    assets = [f'A{i}' for i in range(17)]
+    tracker.update({asset: day(59) for asset in assets}, {})
+    delta = tracker.update({asset: day(60) for asset in assets}, {})
+    full = {'market_data': {asset: day(60) for asset in assets}}
+    assert len(json.dumps(delta)) * 20 < len(json.dumps(full))
+
+
+def test_per_asset_clients_follow_their_own_sequence():
+    tracker = MarketDeltaTracker()
+    tracker.update({'AAPL': day(30), 'BTC': day(10)}, {'AAPL': {'price': 129.0}})
+    client = copy.deepcopy(tracker.asset_snapshot(['BTC']))['BTC']
+
+    cycles = [
+        ({'AAPL': day(31), 'BTC': day(10)}, {'AAPL': {'price': 130.0}}),
+        ({'AAPL': day(32), 'BTC': day(11)}, {'AAPL': {'price': 131.0}, 'BTC': {'price': 110.0}}),
+        ({'AAPL': day(33), 'BTC': [bar(0, 5.0)]}, {'AAPL': {'price': 132.0}, 'BTC': {'price': 5.0}}),
+    ]
+    received = []
+    for market_data, ticker in cycles:
+        deltas = split_delta(tracker.update(market_data, ticker))
+        if 'BTC' in deltas:
+            received.append(deltas['BTC'])
+            assert apply_asset_delta(client, deltas['BTC'])
+
+    # AAPL-only cycles do not advance BTC's sequence, so there is no false gap
+    assert [d['seq'] for d in received] == [2, 3]
+    assert received[1]['reset'] == [bar(0, 5.0)]
+    assert client == tracker.asset_snapshot(['BTC'])['BTC']
+    assert not apply_asset_delta(client, {'asset': 'BTC', 'seq': 9, 'bars': []})
+
+
+def test_rooms_receive_only_their_symbols():
+    app = Flask(__name__)
+    socketio = SocketIO(app)
+
+    @socketio.on('subscribe')
+    def subscribe(data):
+        channel, symbols = parse_subscription(data)
+        for symbol in symbols:
+            join_room(room_name(channel, symbol))
+
+    publisher = RoomPublisher(socketio)
+    aapl = socketio.test_client(app)
+    everything = socketio.test_client(app)
+    aapl.emit('subscribe', {'channel': 'market', 'symbols': ['aapl']})
+    everything.emit('subscribe', {'channel': 'market'})
+
+    assert publisher.emit('symbol_delta', {'asset': 'AAPL'}, event_rooms('market', 'AAPL'))
+    assert publisher.emit('symbol_delta', {'asset': 'BTC'}, event_rooms('market', 'BTC'))
+    # Nobody follows trades, so nothing is encoded or sent
+    assert not publisher.emit('trade_executed', {'asset': 'BTC'}, event_rooms('trades', 'BTC'))
+
+    assert [m['args'][0]['asset'] for m in aapl.get_received()] == ['AAPL']
+    assert [m['args'][0]['asset'] for m in everything.get_received()] == ['AAPL', 'BTC']
+    assert publisher.subscribers() == {'market:AAPL': 1, 'market:*': 1}
+
+
+def test_subscription_messages_are_validated():
+    assert parse_subscription({'channel': 'trades', 'symbols': 'btc'}) == ('trades', ['BTC'])
+    assert parse_subscription({'channel': 'bots', 'symbols': ['bot1']}) == ('bots', ['bot1'])
+    assert parse_subscription({'channel': 'market'}) == ('market', ['*'])
+    for bad in (None, {'channel': 'news'}, {'channel': 'market', 'symbols': [1]}):
+        with pytest.raises(ValueError):
+            parse_subscription(bad)
@@ -0,0 +1,59 @@
+"""
+Tests for Monte Carlo robustness analysis.
+"""
+
+import numpy as np
+import pytest
+
+from backtesting.backtester import Backtester
+from backtesting.monte_carlo import (MonteCarloAnalyzer, block_bootstrap_indices, path_metrics,
+                                     trade_returns)
+from tests.test_backtester import CrossoverStrategy, make_ohlcv
+
+
+def test_path_metrics_match_backtester_performance():
+    performance = Backtester().run_backtest_on_data(CrossoverStrategy({}), make_ohlcv())
+    equity = np.array([point['equity'] for point in performance['equity_curve']])
+    returns = equity[1:] / equity[:-1] - 1.0
+
+    total, sharpe, drawdown = path_metrics(returns[np.newaxis, :], 252)
+    assert total[0] == pytest.approx(equity[-1] / equity[0] - 1.0)
+    assert drawdown[0] == pytest.approx(performance['max_drawdown'])
+
+
+def test_block_bootstrap_keeps_consecutive_runs():
+    rng = np.random.default_rng(0)
+    indices = block_bootstrap_indices(100, 50, 10, rng)
+    assert indices.shape == (50, 100)
+    assert indices.min() >= 0 and indices.max() < 100
+    steps = np.diff(indices, axis=1) % 100
+    assert np.all(steps[:, np.arange(99) % 10 != 9] == 1)
+
+
+def test_simulation_is_chunk_invariant_and_brackets_observed():
+    returns = np.random.default_rng(1).normal(0.0005, 0.01, 1260)
+    whole = MonteCarloAnalyzer(n_paths=2000, seed=5).run_on_returns(returns)
+    chunked = MonteCarloAnalyzer(n_paths=2000, seed=5, memory_budget_mb=0.5).run_on_returns(returns)
+    assert whole == chunked
+
+    for name in ('total_return', 'sharpe_ratio', 'max_drawdown'):
+        interval = whole[name]
+        assert interval['lower'] <= interval['median'] <= interval['upper']
+        assert interval['lower'] <= interval['observed'] <= interval['upper']
+    assert 0.0 <= whole['probability_of_loss'] <= 1.0
+
+
+def test_analyze_backtest_result_by_trades():
+    performance = Backtester().run_backtest_on_data(CrossoverStrategy({}), make_ohlcv())
+    returns = trade_returns(performance.trade_ledger.pnl, 100000.0)
+    assert len(returns) == sum(1 for trade in performance['trades'] if trade['side'] == 'SELL')
+
+    result = MonteCarloAnalyzer(n_paths=500, method='trades', seed=2).analyze(performance)
+    assert result['n_paths'] == 500
+    assert result['total_return']['observed'] == pytest.approx(np.prod(1 + returns) - 1)
+
+    assert 'BacktestResult' in MonteCarloAnalyzer(n_paths=10).analyze(performance.to_dict())['error']
+    assert MonteCarloAnalyzer().analyze({'error': 'No data'}) == {'error': 'No data'}
+
+    with pytest.raises(ValueError):
+        MonteCarloAnalyzer(method='unknown')
@@ -0,0 +1,88 @@
+"""
+Tests for the on-disk OHLCV store.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.ohlcv_store import DataSource, OHLCVStore
+
+
+class FakeSource(DataSource):
+    """Deterministic business-day bars that records every request."""
+
+    name = 'fake'
+
+    def __init__(self):
+        self.requests = []
+
+    def fetch(self, symbol, interval, start, end):
+        self.requests.append((start, end))
+        index = pd.bdate_range(start.tz_convert('America/New_York').normalize(),
+                               end.tz_convert('America/New_York'), name='Date')
+        index = index[(index >= start) & (index < end)]
+        close = 100 + (index.asi8 // 86_400_000_000_000 % 97).astype(float)
+        return pd.DataFrame({
+            'Open': close - 1, 'High': close + 1, 'Low': close - 2, 'Close': close,
+            'Volume': np.full(len(index), 1000.0), 'Dividends': 0.0
+        }, index=index)
+
+
+def test_store_fetches_only_missing_ranges(tmp_path):
+    source = FakeSource()
+    store = OHLCVStore(tmp_path, source)
+
+    first = store.get('AAPL', '2021-01-01', '2021-07-01')
+    assert len(source.requests) == 1
+    assert list(first.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert str(first.index.tz) == 'America/New_York'
+
+    # Fully covered: served from disk
+    inner = store.get('AAPL', '2021-02-01', '2021-03-01')
+    assert len(source.requests) == 1
+    pd.testing.assert_frame_equal(inner, first.loc['2021-02-01':'2021-02-28'], check_freq=False)
+
+    # Overlapping on both sides: only the two uncovered edges are fetched
+    wide = store.get('AAPL', '2020-10-01', '2021-10-01')
+    assert len(source.requests) == 3
+    assert source.requests[1][1] == pd.Timestamp('2021-01-01', tz='UTC')
+    assert source.requests[2][0] == pd.Timestamp('2021-07-01', tz='UTC')
+    assert wide.index.is_monotonic_increasing and wide.index.is_unique
+    assert store.covered_ranges('AAPL') == [(pd.Timestamp('2020-10-01', tz='UTC'),
+                                             pd.Timestamp('2021-10-01', tz='UTC'))]
+
+
+def test_store_persists_across_instances(tmp_path):
+    OHLCVStore(tmp_path, FakeSource()).get('MSFT', '2022-01-01', '2022-03-01')
+
+    offline = FakeSource()
+    reopened = OHLCVStore(tmp_path, offline).get('MSFT', '2022-01-10', '2022-02-01')
+    assert offline.requests == []
+    assert len(reopened) > 0
+
+
+def test_backtester_loads_through_store(tmp_path):
+    source = FakeSource()
+    backtester = Backtester(data_store=OHLCVStore(tmp_path, source))
+
+    data = backtester._get_historical_data('TSLA', '2021-01-01', '2021-06-01')
+    assert {'SMA_20', 'SMA_50', 'RSI', 'MACD', 'MACD_Signal'} <= set(data.columns)
+
+    backtester._get_historical_data('TSLA', '2021-01-01', '2021-06-01')
+    assert len(source.requests) == 1
+
+
+def test_reader_with_stale_meta_follows_the_new_version(tmp_path):
+    reader = OHLCVStore(tmp_path, FakeSource())
+    reader.get('AAPL', '2021-01-01', '2021-03-01')
+    stale = reader._read_meta('AAPL', '1d')
+
+    # Another process extends the series, replacing the arrays the stale meta points at
+    OHLCVStore(tmp_path, FakeSource()).get('AAPL', '2020-06-01', '2021-06-01')
+    series_dir = tmp_path / 'AAPL' / '1d'
+    assert len(list(series_dir.glob('index-*.npy'))) == len(list(series_dir.glob('values-*.npy'))) == 1
+
+    meta, (index, values) = reader._load_snapshot('AAPL', '1d', stale)
+    assert meta['version'] != stale['version']
+    assert len(index) == values.shape[1] == meta['rows']
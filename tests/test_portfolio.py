@@ -0,0 +1,62 @@
+"""
+Tests for the multi-symbol portfolio backtester.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.portfolio import PortfolioBacktester
+from tests.test_backtester import CrossoverStrategy, make_ohlcv
+
+
+def make_universe(n_symbols: int = 6):
+    """Symbols with staggered start dates and missing bars."""
+    data = {}
+    for k in range(n_symbols):
+        frame = make_ohlcv(n_bars=400, seed=100 + k)
+        frame = frame.iloc[k * 7:]
+        data[f'SYM{k}'] = frame.drop(frame.index[::11 + k])
+    return data
+
+
+def test_single_symbol_portfolio_matches_backtester():
+    data = make_ohlcv()
+    strategy = CrossoverStrategy({})
+
+    single = Backtester().run_backtest_on_data(strategy, data.copy(), 'TEST')
+    portfolio = PortfolioBacktester().run_backtest_on_data(strategy, {'TEST': data.copy()})
+
+    assert portfolio['trades'] == single['trades']
+    for key in ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'final_balance'):
+        assert portfolio[key] == single[key], key
+
+
+def test_portfolio_equity_is_cash_plus_holdings():
+    data = make_universe()
+    backtester = PortfolioBacktester(initial_balance=250000.0)
+    result = backtester.run_backtest_on_data(CrossoverStrategy({}), data)
+
+    assert result['total_trades'] > 0
+    assert {t['symbol'] for t in result['trades']} <= set(data)
+    assert len({t['symbol'] for t in result['trades']}) > 1
+
+    # Rebuild the last bar's equity from the trade ledger
+    trades = pd.DataFrame(result['trades'])
+    held = trades.assign(signed=np.where(trades['side'] == 'BUY', trades['quantity'], -trades['quantity']))
+    held = held.groupby('symbol')['signed'].sum()
+    last_prices = pd.Series({name: frame['Close'].iloc[-1] for name, frame in data.items()})
+    expected = backtester.current_balance + (held * last_prices.reindex(held.index)).sum()
+    assert np.isclose(result['final_balance'], expected)
+
+
+def test_chunking_does_not_change_results():
+    data = make_universe()
+    strategy = CrossoverStrategy({})
+
+    whole = PortfolioBacktester(memory_budget_mb=64).run_backtest_on_data(strategy, data)
+    chunked = PortfolioBacktester(memory_budget_mb=0.01).run_backtest_on_data(strategy, data)
+
+    assert PortfolioBacktester(memory_budget_mb=0.01)._chunk_bars(len(data)) < 100
+    assert chunked['trades'] == whole['trades']
+    pd.testing.assert_frame_equal(pd.DataFrame(chunked['equity_curve']), pd.DataFrame(whole['equity_curve']))
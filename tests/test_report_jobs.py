@@ -0,0 +1,87 @@
+"""
+Tests for background report rendering and its result cache.
+"""
+
+import threading
+
+from core.report_jobs import DONE, FAILED, ReportJobs
+
+
+class Clock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_identical_reports_are_rendered_once_per_bucket():
+    clock = Clock(100.0)
+    jobs = ReportJobs(workers=2, bucket_seconds=3600, clock=clock)
+    renders = []
+
+    def render():
+        renders.append(1)
+        return b'%PDF report'
+
+    first = jobs.wait(jobs.submit({'bot_id': 'a'}, render).id, timeout=5)
+    assert first.status == DONE
+    assert jobs.result(first.id) == b'%PDF report'
+
+    again = jobs.submit({'bot_id': 'a'}, render)
+    assert again.status == DONE and again.id != first.id
+    assert jobs.result(again.id) == b'%PDF report'
+    assert len(renders) == 1
+
+    # Other inputs, or the next hour, render afresh
+    jobs.wait(jobs.submit({'bot_id': 'b'}, render).id, timeout=5)
+    clock.now = 3700.0
+    jobs.wait(jobs.submit({'bot_id': 'a'}, render).id, timeout=5)
+    assert len(renders) == 3
+    assert jobs.stats()['hits'] == 1
+    jobs.shutdown()
+
+
+def test_requests_join_a_report_that_is_rendering():
+    jobs = ReportJobs(workers=2)
+    release = threading.Event()
+    renders = []
+
+    def render():
+        renders.append(1)
+        release.wait(5)
+        return b'pdf'
+
+    first = jobs.submit({'bot_id': None}, render)
+    second = jobs.submit({'bot_id': None}, render)
+    assert second is first
+    release.set()
+    assert jobs.wait(first.id, timeout=5).status == DONE
+    assert len(renders) == 1
+    jobs.shutdown()
+
+
+def test_failures_are_reported_and_not_cached():
+    jobs = ReportJobs(workers=1)
+
+    def broken():
+        raise RuntimeError('no fonts')
+
+    job = jobs.wait(jobs.submit({}, broken).id, timeout=5)
+    assert job.status == FAILED and job.error == 'no fonts'
+    assert jobs.result(job.id) is None
+    assert jobs.wait(jobs.submit({}, lambda: b'pdf').id, timeout=5).status == DONE
+    jobs.shutdown()
+
+
+def test_old_results_and_jobs_are_dropped():
+    clock = Clock()
+    jobs = ReportJobs(workers=1, cache_size=1, job_ttl=60, clock=clock)
+    first = jobs.wait(jobs.submit({'n': 1}, lambda: b'one').id, timeout=5)
+    jobs.wait(jobs.submit({'n': 2}, lambda: b'two').id, timeout=5)
+    assert jobs.result(first.id) is None
+
+    clock.now = 120.0
+    jobs.submit({'n': 2}, lambda: b'two')
+    assert jobs.get(first.id) is None
+    jobs.shutdown()
@@ -0,0 +1,52 @@
+"""
+Tests for deferred imports and the web server startup guard.
+"""
+
+import sys
+import threading
+
+from benchmarks.startup_benchmark import check_report, parse_importtime, run_importtime
+from core.lazy_imports import lazy_import
+
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     zipimport
+import time:      1805 |      94924 |   numpy
+import time:     41461 |     490825 | web_app
+"""
+
+
+def test_lazy_module_imports_on_first_attribute(tmp_path, monkeypatch):
+    (tmp_path / 'slow_module_for_test.py').write_text("LOADS = []\nLOADS.append(1)\nVALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'slow_module_for_test', raising=False)
+
+    module = lazy_import('slow_module_for_test')
+    assert 'slow_module_for_test' not in sys.modules
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(module.VALUE)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 8
+    assert sys.modules['slow_module_for_test'].LOADS == [1]
+    assert module.LOADS is sys.modules['slow_module_for_test'].LOADS
+
+
+def test_importtime_output_is_parsed():
+    rows = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [(row['module'], row['depth']) for row in rows] == [('zipimport', 2), ('numpy', 1), ('web_app', 0)]
+    assert rows[2]['cumulative_seconds'] == 0.490825
+
+    report = {'module': 'web_app', 'import_seconds': 1.5, 'deferred_loaded': ['pandas']}
+    assert len(check_report(report, budget=1.0)) == 2
+    assert check_report({**report, 'import_seconds': 0.5, 'deferred_loaded': []}, budget=1.0) == []
+
+
+def test_web_app_starts_without_heavy_imports():
+    report = run_importtime('web_app')
+    # Generous budget for slow CI machines; the deferred modules are the real guard
+    assert check_report(report, budget=2.0) == []
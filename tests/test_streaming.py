@@ -0,0 +1,80 @@
+"""
+Tests for the event-driven streaming backtester.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtesting.backtester import Backtester
+from backtesting.ohlcv_store import OHLCVStore
+from backtesting.streaming import StreamingBacktester, rolling_windows
+from tests.test_backtester import CrossoverStrategy, make_ohlcv
+from tests.test_ohlcv_store import FakeSource
+
+
+def split(frame: pd.DataFrame, size: int):
+    for start in range(0, len(frame), size):
+        yield frame.iloc[start:start + size]
+
+
+def test_streaming_matches_batch_backtest():
+    data = make_ohlcv(n_bars=600)
+    strategy = CrossoverStrategy({'fast': 5, 'slow': 20, 'lookback': 30})
+
+    batch = Backtester(execution_mode='loop').run_backtest_on_data(strategy, data.copy(), 'TEST')
+    streamed = StreamingBacktester().run_backtest_on_chunks(strategy, split(data, 64), 'TEST')
+
+    assert streamed['trades'] == batch['trades']
+    for key in ('total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'final_balance'):
+        assert streamed[key] == batch[key], key
+
+
+class CountingStrategy(CrossoverStrategy):
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def generate_signals(self, data):
+        self.calls += 1
+        return super().generate_signals(data)
+
+
+class PerBarStrategy(CrossoverStrategy):
+    def on_bar(self, window):
+        return super().on_bar(window)
+
+
+def test_signals_run_once_per_chunk_unless_on_bar_is_overridden():
+    data = make_ohlcv(n_bars=600)
+    counting = CountingStrategy({'fast': 5, 'slow': 20, 'lookback': 30})
+    chunked = StreamingBacktester().run_backtest_on_chunks(counting, split(data, 64), 'TEST')
+    assert counting.calls == len(range(0, len(data), 64))
+
+    per_bar = StreamingBacktester().run_backtest_on_chunks(
+        PerBarStrategy({'fast': 5, 'slow': 20, 'lookback': 30}), split(data, 64), 'TEST')
+    assert per_bar['trades'] == chunked['trades']
+
+
+def test_windows_are_bounded_by_lookback():
+    data = make_ohlcv(n_bars=300)
+    windows = list(rolling_windows(split(data, 37), lookback=25))
+
+    assert len(windows) == len(data)
+    assert max(len(w) for w in windows) == 25
+    for i in (0, 24, 36, 37, 299):
+        expected = data.iloc[max(0, i - 24):i + 1]
+        pd.testing.assert_frame_equal(windows[i], expected)
+
+
+def test_streaming_from_store(tmp_path):
+    store = OHLCVStore(tmp_path, FakeSource())
+    strategy = CrossoverStrategy({'lookback': 30})
+
+    streamed = StreamingBacktester(chunk_size=50, data_store=store).run_backtest(
+        strategy, 'AAPL', '2020-01-01', '2021-06-01')
+    batch = Backtester(execution_mode='loop', data_store=store).run_backtest(
+        strategy, 'AAPL', '2020-01-01', '2021-06-01')
+
+    assert 'error' not in streamed
+    assert streamed['trades'] == batch['trades']
+    assert np.isclose(streamed['final_balance'], batch['final_balance'])
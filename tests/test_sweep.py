@@ -0,0 +1,60 @@
+"""
+Tests for parallel parameter sweeps.
+"""
+
+from backtesting.backtester import Backtester
+from backtesting.sweep import (ParameterSweep, grid_samples, random_samples,
+                               latin_hypercube_samples)
+from tests.test_backtester import CrossoverStrategy, make_ohlcv
+
+
+def test_samplers_cover_parameter_space():
+    assert grid_samples({'fast': [5, 10], 'slow': [20, 50]}) == [
+        {'fast': 5, 'slow': 20}, {'fast': 5, 'slow': 50},
+        {'fast': 10, 'slow': 20}, {'fast': 10, 'slow': 50}
+    ]
+
+    space = {'fast': (2, 11), 'threshold': (0.0, 1.0), 'mode': ['a', 'b']}
+    for sampler in (random_samples, latin_hypercube_samples):
+        samples = sampler(space, 10, seed=3)
+        assert len(samples) == 10
+        assert all(2 <= s['fast'] <= 11 and isinstance(s['fast'], int) for s in samples)
+        assert all(0.0 <= s['threshold'] <= 1.0 for s in samples)
+        assert {s['mode'] for s in samples} <= {'a', 'b'}
+
+    # One sample per stratum in every dimension
+    lhs = latin_hypercube_samples({'fast': (2, 11)}, 10, seed=3)
+    assert sorted(s['fast'] for s in lhs) == list(range(2, 12))
+
+
+def test_parallel_sweep_matches_direct_backtests():
+    data = {'TEST': make_ohlcv()}
+    param_sets = grid_samples({'fast': [3, 5, 8], 'slow': [20, 30]})
+    progress = []
+
+    sweep = ParameterSweep(CrossoverStrategy, max_workers=2)
+    results = sweep.run_on_data(data, param_sets,
+                                progress_callback=lambda done, total, row: progress.append((done, total)))
+
+    assert len(results) == len(param_sets)
+    assert progress[-1] == (len(param_sets), len(param_sets))
+    assert list(results['rank']) == list(range(1, len(param_sets) + 1))
+    assert results['sharpe_ratio'].is_monotonic_decreasing
+
+    for row in results.to_dict('records'):
+        strategy = CrossoverStrategy({'fast': row['fast'], 'slow': row['slow']})
+        expected = Backtester().run_backtest_on_data(strategy, data['TEST'].copy())
+        assert row['final_balance'] == expected['final_balance']
+        assert row['total_trades'] == expected['total_trades']
+
+
+def test_sweep_cancels_remaining_jobs():
+    data = {'TEST': make_ohlcv()}
+    param_sets = grid_samples({'fast': list(range(2, 12)), 'slow': [20, 30, 40]})
+    sweep = ParameterSweep(CrossoverStrategy, max_workers=1)
+
+    results = sweep.run_on_data(data, param_sets,
+                                progress_callback=lambda done, total, row: sweep.cancel())
+
+    assert sweep.cancelled
+    assert 1 <= len(results) < len(param_sets)
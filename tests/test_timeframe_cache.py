@@ -0,0 +1,108 @@
+"""
+Tests for the timeframe TTL cache.
+"""
+
+import threading
+import time
+import pytest
+
+from backtesting.synthetic import synthetic_ohlcv
+from core.timeframe_cache import TimeframeCache, frame_etag
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_their_interval_ttl():
+    clock = Clock()
+    calls = []
+
+    def fetch(asset, period, interval):
+        calls.append((asset, period, interval))
+        return synthetic_ohlcv(50, seed=len(calls))
+
+    cache = TimeframeCache(fetch, ttls={'1m': 30, '1d': 3600}, clock=clock)
+    first = cache.get('AAPL', '1d', '1m')
+    daily = cache.get('AAPL', '1mo', '1d')
+    clock.now = 29
+    assert cache.get('AAPL', '1d', '1m') is first
+    clock.now = 31
+    refreshed = cache.get('AAPL', '1d', '1m')
+    assert refreshed is not first and refreshed.etag != first.etag
+    assert cache.get('AAPL', '1mo', '1d') is daily
+    assert len(calls) == 3
+    assert cache.stats()['hits'] == 2
+
+
+def test_concurrent_misses_share_one_fetch():
+    release = threading.Event()
+    calls = []
+
+    def fetch(asset, period, interval):
+        calls.append(asset)
+        release.wait(5)
+        return synthetic_ohlcv(20)
+
+    cache = TimeframeCache(fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get('BTC-USD', '5y', '1d')))
+               for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    while cache.stats()['coalesced'] < 9:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ['BTC-USD']
+    assert len(results) == 10 and all(result is results[0] for result in results)
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    attempts = []
+
+    def fetch(asset, period, interval):
+        attempts.append(asset)
+        if len(attempts) == 1:
+            raise ConnectionError("down")
+        return synthetic_ohlcv(10)
+
+    cache = TimeframeCache(fetch)
+    with pytest.raises(ConnectionError):
+        cache.get('AAPL', '1d', '1m')
+    assert len(cache.get('AAPL', '1d', '1m').frame) == 10
+    assert len(attempts) == 2
+
+
+def test_memory_budget_evicts_least_recently_used():
+    frame = synthetic_ohlcv(1000)
+    size = int(frame.memory_usage(index=True).sum())
+    cache = TimeframeCache(lambda asset, period, interval: frame.copy(), budget_bytes=int(size * 2.5))
+
+    cache.get('A', '1y', '1d')
+    cache.get('B', '1y', '1d')
+    cache.get('A', '1y', '1d')
+    cache.get('C', '1y', '1d')
+
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    assert stats['bytes'] <= cache.budget_bytes
+    misses = stats['misses']
+    cache.get('A', '1y', '1d')
+    assert cache.stats()['misses'] == misses
+    cache.get('B', '1y', '1d')
+    assert cache.stats()['misses'] == misses + 1
+
+
+def test_etag_tracks_content():
+    frame = synthetic_ohlcv(100)
+    assert frame_etag(frame) == frame_etag(frame.copy())
+    changed = frame.copy()
+    changed.iloc[-1, changed.columns.get_loc('Close')] += 0.01
+    assert frame_etag(changed) != frame_etag(frame)
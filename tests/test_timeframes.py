@@ -0,0 +1,91 @@
+"""
+Tests for OHLCV timeframe resampling.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.synthetic import synthetic_ohlcv
+from core.timeframes import PERIODS, TimeframeStore, resample_frame
+
+
+AGGREGATIONS = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+PANDAS_RULES = {'5m': '5min', '15m': '15min', '1h': '1h', '4h': '4h', '1d': '1D', '1M': 'MS'}
+
+
+def minute_bars(n_bars, seed=0, start='2024-03-08 05:00', tz='America/New_York'):
+    # Starts at local midnight and spans the March DST change in New York
+    return synthetic_ohlcv(n_bars, seed=seed, start=start).tz_localize('UTC').tz_convert(tz)
+
+
+def expected(hist, timeframe):
+    # Buckets follow the local wall clock, so 4h bars stay on 00:00, 04:00, ... across DST
+    local = hist.tz_localize(None)
+    if timeframe == '1w':
+        grouped = local.resample('W-MON', label='left', closed='left')
+    else:
+        grouped = local.resample(PANDAS_RULES[timeframe])
+    return grouped.agg(AGGREGATIONS).dropna(subset=['Close']).tz_localize(hist.index.tz)
+
+
+def stored(store, asset, timeframe):
+    index, values = store.bars(asset, timeframe)
+    return pd.DataFrame(dict(zip(['Open', 'High', 'Low', 'Close', 'Volume'], values)), index=index)
+
+
+@pytest.mark.parametrize('timeframe', ['5m', '15m', '1h', '4h', '1d', '1w', '1M'])
+def test_resample_matches_pandas(timeframe):
+    hist = minute_bars(3 * 1440 + 17)
+    if timeframe in ('1w', '1M'):
+        hist = synthetic_ohlcv(400, freq='D', start='2023-01-01').tz_localize('America/New_York')
+    result = resample_frame(hist, timeframe)
+    reference = expected(hist, timeframe)
+    np.testing.assert_array_equal(result.index.to_numpy(dtype='datetime64[ns]'),
+                                  reference.index.to_numpy(dtype='datetime64[ns]'))
+    np.testing.assert_allclose(result.to_numpy(), reference[result.columns].to_numpy())
+
+
+def test_incremental_minute_updates_match_full_resample():
+    day = minute_bars(2 * 1440, start='2024-03-09 05:00')
+    store = TimeframeStore()
+    # Every cycle re-sends the bars so far, the last one still forming
+    for end in range(100, len(day) + 1, 173):
+        snapshot = day.iloc[:end].copy()
+        snapshot.iloc[-1, snapshot.columns.get_loc('Close')] *= 1.001
+        store.update('AAPL', '1m', snapshot)
+    store.update('AAPL', '1m', day)
+
+    for timeframe in ('5m', '15m', '1h', '4h', '1d', '1w'):
+        result = stored(store, 'AAPL', timeframe)
+        reference = expected(day, timeframe)
+        assert len(result) == len(reference), timeframe
+        np.testing.assert_allclose(result.to_numpy(), reference[result.columns].to_numpy(),
+                                   err_msg=timeframe)
+
+
+def test_minute_bars_extend_daily_backfill():
+    daily = synthetic_ohlcv(300, freq='D', start='2023-05-01').tz_localize('UTC')
+    store = TimeframeStore()
+    store.update('BTC', '1d', daily.iloc[:-1])
+    today = synthetic_ohlcv(600, seed=1, start=daily.index[-1].tz_localize(None)).tz_localize('UTC')
+    store.update('BTC', '1m', today)
+
+    result = stored(store, 'BTC', '1d')
+    assert len(result) == 300
+    np.testing.assert_allclose(result.iloc[:-1].to_numpy(), daily.iloc[:-1][result.columns].to_numpy())
+    np.testing.assert_allclose(result.iloc[-1].to_numpy(), expected(today, '1d').iloc[-1][result.columns].to_numpy())
+    weeks = stored(store, 'BTC', '1w')
+    assert weeks.index[-1] <= result.index[-1] < weeks.index[-1] + pd.Timedelta(days=7)
+    assert weeks['Volume'].sum() == pytest.approx(result['Volume'].sum())
+
+
+def test_lookback_window_and_unknown_data():
+    store = TimeframeStore()
+    store.update('AAPL', '1m', minute_bars(3 * 1440))
+    index, values = store.bars('AAPL', '1h', PERIODS['1d'])
+    assert index[-1] - index[0] == pd.Timedelta(hours=24)
+    assert values.shape == (5, 25)
+    assert store.bars('MSFT', '1h') is None
+    with pytest.raises(ValueError):
+        store.update('AAPL', '2h', minute_bars(10))
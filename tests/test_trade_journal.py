@@ -0,0 +1,122 @@
+"""
+Tests for the append-only bot trade journal.
+"""
+
+import json
+
+import pytest
+
+from core import trade_journal
+from core.trade_journal import TradeJournal
+
+
+def trade(i, timestamp=None):
+    return {'type': 'BUY' if i % 2 == 0 else 'SELL', 'index': i, 'price': 100.0 + i,
+            'timestamp': 1_000 * i if timestamp is None else timestamp}
+
+
+def lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_append_skips_resent_trades_and_refuses_gaps(tmp_path):
+    journal = TradeJournal(tmp_path)
+    assert journal.append('bot 1', [trade(0), trade(1)], offset=0) == 2
+    # A retried batch overlapping the stored trades only adds the new one
+    assert journal.append('bot 1', [trade(1), trade(2)], offset=1) == 3
+    with pytest.raises(ValueError):
+        journal.append('bot 1', [trade(9)], offset=5)
+
+    path = tmp_path / 'bot%201.jsonl'
+    assert [record['trade']['index'] for record in lines(path)] == [0, 1, 2]
+    assert TradeJournal(tmp_path).state()['botTrades'] == {'bot 1': [trade(0), trade(1), trade(2)]}
+
+
+def test_sync_appends_only_new_trades_and_records_clears(tmp_path):
+    journal = TradeJournal(tmp_path)
+    journal.sync('b', [trade(0)], {'qty': 1})
+    journal.sync('b', [trade(0), trade(1)], {'qty': 1})
+    assert len(lines(tmp_path / 'b.jsonl')) == 3
+
+    journal.sync('b', [trade(5)], {'qty': 0})
+    assert journal.state() == {'botTrades': {'b': [trade(5)]}, 'botMetrics': {'b': {'qty': 0}}}
+    assert TradeJournal(tmp_path).state() == journal.state()
+
+
+def test_non_object_trades_are_refused_before_anything_is_stored(tmp_path):
+    journal = TradeJournal(tmp_path)
+    with pytest.raises(TypeError):
+        journal.append('b', [trade(0), 5])
+    assert journal.count('b') == 0
+    assert not (tmp_path / 'b.jsonl').exists()
+
+    journal.sync('b', [trade(0), trade(1)])
+    with pytest.raises(TypeError):
+        journal.sync('b', ['cleared'])
+    assert TradeJournal(tmp_path).state()['botTrades']['b'] == journal.state()['botTrades']['b'] == [trade(0), trade(1)]
+
+
+def test_state_can_be_bounded_to_recent_trades(tmp_path):
+    journal = TradeJournal(tmp_path)
+    journal.append('a', [trade(i) for i in range(5)], metrics={'qty': 1})
+    journal.append('b', [trade(0)])
+    assert journal.state(recent=2) == {'botTrades': {'a': [trade(3), trade(4)], 'b': [trade(0)]},
+                                       'botMetrics': {'a': {'qty': 1}}, 'botCounts': {'a': 5, 'b': 1}}
+    assert journal.state(recent=0)['botTrades'] == {'a': [], 'b': []}
+
+
+def test_trades_are_paginated_and_filtered_by_time(tmp_path):
+    journal = TradeJournal(tmp_path)
+    journal.append('a', [trade(i, timestamp=10 * i) for i in range(10)])
+    journal.append('b', [trade(i, timestamp=10 * i + 5) for i in range(10)])
+
+    page = journal.trades('a', start=20, end=60, offset=1, limit=2)
+    assert page['total'] == 5
+    assert [t['timestamp'] for t in page['trades']] == [30, 40]
+
+    merged = journal.trades(start=20, end=40, limit=10)
+    assert [(t['bot_id'], t['timestamp']) for t in merged['trades']] == [
+        ('a', 20), ('b', 25), ('a', 30), ('b', 35), ('a', 40)]
+    assert journal.trades('missing')['total'] == 0
+
+
+def test_out_of_order_timestamps_are_still_filtered(tmp_path):
+    journal = TradeJournal(tmp_path)
+    journal.append('a', [trade(0, 50), trade(1, 10), trade(2, 30)])
+    assert [t['timestamp'] for t in journal.trades('a', start=20)['trades']] == [50, 30]
+
+
+def test_superseded_records_are_compacted(tmp_path, monkeypatch):
+    monkeypatch.setattr(trade_journal, 'COMPACT_MIN_GARBAGE', 5)
+    journal = TradeJournal(tmp_path)
+    journal.append('a', [trade(0)])
+    for qty in range(1, 8):
+        journal.append('a', [], metrics={'qty': qty})
+
+    records = lines(tmp_path / 'a.jsonl')
+    assert len(records) < 8
+    assert TradeJournal(tmp_path).state() == journal.state()
+    assert journal.metrics() == {'a': {'qty': 7}}
+
+
+def test_torn_last_line_is_dropped_before_the_next_append(tmp_path):
+    journal = TradeJournal(tmp_path)
+    journal.append('a', [trade(0), trade(1)])
+    with open(tmp_path / 'a.jsonl', 'a') as f:
+        f.write('{"k": "t", "tra')
+
+    reopened = TradeJournal(tmp_path)
+    assert reopened.count('a') == 2
+    assert reopened.append('a', [trade(2)]) == 3
+    assert TradeJournal(tmp_path).state()['botTrades']['a'] == [trade(0), trade(1), trade(2)]
+
+
+def test_legacy_state_is_imported_once(tmp_path):
+    legacy = tmp_path / 'bot_state.json'
+    legacy.write_text(json.dumps({'botTrades': {'a': [trade(0)]}, 'botMetrics': {'a': {'qty': 1}, 'b': {'qty': 2}}}))
+    journal = TradeJournal(tmp_path / 'journal', legacy_state_path=legacy)
+    assert journal.state() == {'botTrades': {'a': [trade(0)], 'b': []},
+                               'botMetrics': {'a': {'qty': 1}, 'b': {'qty': 2}}}
+
+    legacy.write_text(json.dumps({'botTrades': {'c': [trade(1)]}, 'botMetrics': {}}))
+    assert 'c' not in TradeJournal(tmp_path / 'journal', legacy_state_path=legacy).state()['botTrades']
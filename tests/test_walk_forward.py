@@ -0,0 +1,62 @@
+"""
+Tests for walk-forward optimization.
+"""
+
+import pytest
+
+from backtesting.backtester import Backtester
+from backtesting.sweep import grid_samples
+from backtesting.walk_forward import WalkForwardOptimizer, walk_forward_windows
+from tests.test_backtester import CrossoverStrategy, make_ohlcv
+
+
+def test_windows_roll_and_anchor():
+    rolling = walk_forward_windows(1000, train_bars=300, test_bars=100)
+    assert len(rolling) == 7
+    assert (rolling[0].train_start, rolling[0].train_end, rolling[0].test_end) == (0, 300, 400)
+    assert (rolling[1].train_start, rolling[1].test_start) == (100, 400)
+    assert rolling[-1].test_end <= 1000
+
+    anchored = walk_forward_windows(1000, train_bars=300, test_bars=100, anchored=True)
+    assert all(window.train_start == 0 for window in anchored)
+
+    with pytest.raises(ValueError):
+        walk_forward_windows(1000, train_bars=Backtester.WARMUP_PERIODS, test_bars=100)
+
+
+def test_walk_forward_matches_direct_backtests():
+    data = make_ohlcv()
+    param_sets = grid_samples({'fast': [3, 5, 8], 'slow': [20, 30]})
+    optimizer = WalkForwardOptimizer(CrossoverStrategy, train_bars=250, test_bars=100, max_workers=2)
+    progress = []
+
+    result = optimizer.run_on_data(data, param_sets, 'TEST',
+                                   progress_callback=lambda done, total, row: progress.append((done, total)))
+
+    windows = walk_forward_windows(len(data), 250, 100)
+    summary = result['windows']
+    assert len(summary) == len(windows)
+    assert progress[-1] == (len(windows) * (len(param_sets) + 1),) * 2
+    assert len(result['equity_curve']) == sum(w.test_end - w.test_start for w in windows)
+
+    trades = result['trades']
+    assert trades and all(
+        windows[trade['window']].test_start <= data.index.get_loc(trade['date']) < windows[trade['window']].test_end
+        for trade in trades)
+
+    capital = 100000.0
+    for window, entry in zip(windows, summary.to_dict('records')):
+        train = data.iloc[window.train_start:window.train_end]
+        scores = [
+            Backtester().run_backtest_on_data(CrossoverStrategy(params), train.copy())['sharpe_ratio']
+            for params in param_sets
+        ]
+        assert entry['train_sharpe_ratio'] == max(scores)
+
+        strategy = CrossoverStrategy({'fast': entry['fast'], 'slow': entry['slow']})
+        test = data.iloc[window.test_start - Backtester.WARMUP_PERIODS:window.test_end]
+        expected = Backtester().run_backtest_on_data(strategy, test.copy())
+        assert entry['final_balance'] == expected['final_balance']
+        capital *= expected['final_balance'] / 100000.0
+
+    assert result['final_balance'] == pytest.approx(capital)
@@ -9,115 +9,65 @@ import os
 import json
 import time
 import threading
-import io
+import atexit
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import random
 
 # Add project root to Python path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from flask import Flask, jsonify, request, send_from_directory, make_response
+from flask import Flask, Response, jsonify, request, send_from_directory, make_response
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
-import yfinance as yf
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
-import pandas as pd
-import csv
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import numpy as np
 from io import StringIO
 
 # Import existing ATB components
-from core.bot_manager import BotManager
+from core.bank_store import BankAssetStore
+from core.bar_buffer import BarRingBuffer
+from core.bot_stats import BotStatsAggregator
+from core.downsampling import DOWNSAMPLE_METHODS, MIN_POINTS, downsample_bars, downsample_records
+from core.export_stream import (EXPORT_FORMATS, ExportFilter, export_records, gzip_chunks, ndjson_chunks,
+                                parse_time_ms)
+from core.indicators import IndicatorSet
+from core.market_data_fetcher import MarketDataFetcher
+from core.market_data_serializer import bars_to_columns, columns_to_records, frame_to_records
+from core.market_report import build_report_data, render_market_review_pdf
+from core.market_stream import MarketDeltaTracker, split_delta
+from core.trade_journal import TradeJournal
+from core.report_jobs import DONE, FAILED, ReportJobs
+from core.timeframe_cache import TimeframeCache, bars_etag
+from core.timeframes import (BACKFILL_SOURCES, CHART_TIMEFRAMES, DEFAULT_CHART_TIMEFRAME, PERIODS,
+                             YFINANCE_INTERVALS, TimeframeStore, frame_values, resample_frame)
+from core.stream_rooms import ALL, RoomPublisher, event_rooms, parse_subscription, room_name
 from atb_logging.log_manager import LogManager
 from config.settings import load_settings
 
 app = Flask(__name__)
 CORS(app)
 socketio = SocketIO(app, cors_allowed_origins="*")
-# Simple CSV persistence for Digital Bank assets
+publisher = RoomPublisher(socketio)
+# Digital Bank assets live in SQLite; a legacy CSV is imported once on first start
+BANK_DB_PATH = project_root / 'data' / 'digital_bank.db'
 BANK_CSV_PATH = project_root / 'data' / 'digital_bank.csv'
+# Dashboard trades and metrics are journaled per bot; the legacy state file is imported once
 BOT_STATE_PATH = project_root / 'data' / 'bot_state.json'
-BOT_STATE_PATH = project_root / 'data' / 'bot_state.json'
-
-def ensure_bank_csv():
-    BANK_CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if not BANK_CSV_PATH.exists():
-        with open(BANK_CSV_PATH, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['id','name','ref','qty','value'])
-            writer.writerow(['bank_1','Lamborghini','LAM-001','1','250000'])
-            writer.writerow(['bank_2','A Seat in the Kop','KOP-1892','1','50000'])
-            writer.writerow(['bank_3','Crypto-currency','CRY-001','3','15000'])
-
-def read_bank_csv():
-    ensure_bank_csv()
-    assets = []
-    with open(BANK_CSV_PATH, 'r') as f:
-        rdr = csv.DictReader(f)
-        for row in rdr:
-            try:
-                assets.append({
-                    'id': row['id'],
-                    'name': row['name'],
-                    'ref': row['ref'],
-                    'qty': int(row['qty']),
-                    'value': float(row['value'])
-                })
-            except Exception:
-                continue
-    return assets
-
-def write_bank_csv(assets):
-    ensure_bank_csv()
-    with open(BANK_CSV_PATH, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['id','name','ref','qty','value'])
-        for a in assets:
-            writer.writerow([a.get('id'), a.get('name'), a.get('ref'), a.get('qty'), a.get('value')])
-
-def ensure_bot_state():
-    BOT_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if not BOT_STATE_PATH.exists():
-        BOT_STATE_PATH.write_text(json.dumps({ 'botTrades': {}, 'botMetrics': {} }))
-
-def read_bot_state():
-    ensure_bot_state()
-    try:
-        return json.loads(BOT_STATE_PATH.read_text())
-    except Exception:
-        return { 'botTrades': {}, 'botMetrics': {} }
-
-def write_bot_state(state: Dict[str, Any]):
-    ensure_bot_state()
-    BOT_STATE_PATH.write_text(json.dumps(state))
-
-def ensure_bot_state():
-    BOT_STATE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if not BOT_STATE_PATH.exists():
-        BOT_STATE_PATH.write_text(json.dumps({ 'botTrades': {}, 'botMetrics': {} }))
-
-def read_bot_state():
-    ensure_bot_state()
-    try:
-        return json.loads(BOT_STATE_PATH.read_text())
-    except Exception:
-        return { 'botTrades': {}, 'botMetrics': {} }
-
-def write_bot_state(state: Dict[str, Any]):
-    ensure_bot_state()
-    BOT_STATE_PATH.write_text(json.dumps(state))
+BOT_JOURNAL_DIR = project_root / 'data' / 'bot_journal'
+# Trades per bot the dashboard loads on start; the rest stay behind the paginated routes
+BOT_STATE_RECENT_TRADES = 200
+# Bot fields kept by the bot manager itself, not by configuration updates
+RUNTIME_BOT_FIELDS = frozenset({'stats', 'active'})
 
 # Global instances
 log_manager = LogManager()
-bot_manager = BotManager(log_manager)
 settings = load_settings()
+bank_store = BankAssetStore(BANK_DB_PATH, csv_path=BANK_CSV_PATH)
+atexit.register(bank_store.close)
+trade_journal = TradeJournal(BOT_JOURNAL_DIR, legacy_state_path=BOT_STATE_PATH)
 
 # Market data cache
 market_data_cache = {}
@@ -298,6 +248,11 @@ class WebBotManager:
             }
         }
         
+        # Totals for /api/stats, adjusted on every bot change instead of summed per request
+        self.bot_stats = BotStatsAggregator()
+        self.bot_stats.rebuild(self.bots.values())
+        self._published_stats_version = self.bot_stats.version
+        
         self.market_data_thread = None
         self.running = False
         self.live_trading_enabled = False
@@ -305,7 +260,20 @@ class WebBotManager:
         self.account_balances = {}
         self.investments = []
         self.available_markets = {}
-        self.market_data_history = {}
+        self.market_data_history: Dict[str, BarRingBuffer] = {}
+        self.indicators: Dict[str, IndicatorSet] = {}
+        self._indicator_cursor: Dict[str, str] = {}
+        self.market_data_fetcher = MarketDataFetcher(
+            max_workers=settings.get('market_data.fetch_workers', 8),
+            timeout=settings.get('market_data.fetch_timeout', 8.0),
+            retries=settings.get('market_data.fetch_retries', 2),
+            backoff=settings.get('market_data.retry_backoff', 0.5),
+            failure_threshold=settings.get('market_data.breaker_failures', 3),
+            reset_timeout=settings.get('market_data.breaker_cooldown', 60.0),
+            log_manager=log_manager
+        )
+        self.market_stream = MarketDeltaTracker()
+        self.timeframe_store = TimeframeStore()
         
     def start_market_data_updates(self):
         """Start background thread for market data updates."""
@@ -323,19 +291,23 @@ class WebBotManager:
     
     def _update_market_data_loop(self):
         """Background loop for updating market data."""
+        # History first: minute updates only extend what is already stored
+        try:
+            self._backfill_timeframes()
+        except Exception as e:
+            log_manager.log_error(f"Timeframe backfill error: {str(e)}")
+        
         while self.running:
             try:
                 self._update_market_data()
                 self._update_ticker_data()
                 self._simulate_trading_activity()
+                self._publish_stats()
                 
-                # Emit updates to connected clients
-                if connected_clients:
-                    socketio.emit('market_update', {
-                        'market_data': market_data_cache,
-                        'ticker_data': ticker_data_cache,
-                        'timestamp': datetime.now().isoformat()
-                    })
+                # Emit only what changed since the last cycle, once per subscribed room
+                delta = self.market_stream.update(market_data_cache, ticker_data_cache)
+                if delta:
+                    self._publish_market_delta(delta)
                 
                 time.sleep(5)  # Update every 5 seconds
                 
@@ -343,52 +315,96 @@ class WebBotManager:
                 log_manager.log_error(f"Market data update error: {str(e)}")
                 time.sleep(10)  # Wait longer on error
     
-    def _update_market_data(self):
-        """Update market data for all assets."""
+    def _publish_market_delta(self, delta: Dict[str, Any]):
+        """Send a delta to the market:* room and each changed asset to its own room."""
+        timestamp = datetime.now().isoformat()
+        publisher.emit('market_delta', {**delta, 'timestamp': timestamp}, room_name('market', ALL))
+        for asset, asset_delta in split_delta(delta).items():
+            asset_delta['timestamp'] = timestamp
+            publisher.emit('symbol_delta', asset_delta, room_name('market', asset))
+    
+    def _market_assets(self) -> List[str]:
+        """Symbols fetched every cycle."""
         # Standard assets
         assets = ['AAPL', 'GOOGL', 'MSFT', 'TSLA', 'AMZN', 'BTC-USD', 'ETH-USD']
         
         # Add commodity futures
         commodity_assets = ['SI=F', 'GC=F', 'CL=F', 'HG=F', 'PL=F', 'PA=F', 'NG=F', 'ZW=F', 'ZC=F', 'ZS=F']
         assets.extend(commodity_assets)
+        return assets
+    
+    def _backfill_timeframes(self):
+        """Seed the timeframe store with daily, hourly and minute history of every asset."""
+        def backfill(asset):
+            clean_asset = asset.replace('-USD', '').replace('=F', '')
+            for timeframe, period, interval in BACKFILL_SOURCES:
+                try:
+                    hist = timeframe_cache.get(asset, period, interval).frame
+                    if not hist.empty:
+                        self.timeframe_store.update(clean_asset, timeframe, hist)
+                except Exception as e:
+                    log_manager.log_error(f"Error backfilling {interval} data for {asset}: {str(e)}")
+        
+        with ThreadPoolExecutor(max_workers=settings.get('market_data.fetch_workers', 8)) as executor:
+            list(executor.map(backfill, self._market_assets()))
+    
+    def _update_market_data(self):
+        """Update market data for all assets."""
+        assets = self._market_assets()
+        
+        # Fetch all assets concurrently; failed, timed-out or circuit-broken
+        # assets are missing from the result
+        fetched = self.market_data_fetcher.fetch_all(assets)
         
         for asset in assets:
+            hist = fetched.get(asset)
+            if hist is None:
+                # The fetcher already logged why; fall back to simulated data
+                self._generate_simulated_data(asset.replace('-USD', '').replace('=F', ''))
+                continue
+            
             try:
-                # Use yfinance for real data
-                ticker = yf.Ticker(asset)
-                hist = ticker.history(period="1d", interval="1m")
-                
                 if not hist.empty:
                     # Convert to our format
-                    data = []
-                    for timestamp, row in hist.iterrows():
-                        data.append({
-                            'time': timestamp.isoformat(),
-                            'price': float(row['Close']),
-                            'volume': int(row['Volume']),
-                            'high': float(row['High']),
-                            'low': float(row['Low']),
-                            'open': float(row['Open'])
-                        })
+                    data = frame_to_records(hist)
                     
                     # Store in cache and history
                     clean_asset = asset.replace('-USD', '').replace('=F', '')
                     market_data_cache[clean_asset] = data
                     
-                    # Store historical data for zoom functionality
+                    # Keep the last 1000 distinct bars for zoom functionality
                     if clean_asset not in self.market_data_history:
-                        self.market_data_history[clean_asset] = []
+                        self.market_data_history[clean_asset] = BarRingBuffer(1000)
+                    self.market_data_history[clean_asset].update_frame(hist)
                     
-                    # Keep last 1000 data points for historical analysis
-                    self.market_data_history[clean_asset].extend(data)
-                    if len(self.market_data_history[clean_asset]) > 1000:
-                        self.market_data_history[clean_asset] = self.market_data_history[clean_asset][-1000:]
+                    # Higher timeframes are rebuilt from the new minute bars
+                    self.timeframe_store.update(clean_asset, '1m', hist)
+                    
+                    self._update_indicators(clean_asset, data)
                     
             except Exception as e:
-                log_manager.log_error(f"Error fetching data for {asset}: {str(e)}")
+                log_manager.log_error(f"Error processing data for {asset}: {str(e)}")
                 # Fallback to simulated data
                 self._generate_simulated_data(asset.replace('-USD', '').replace('=F', ''))
     
+    def _update_indicators(self, asset: str, data: List[Dict[str, Any]]):
+        """Feed bars completed since the last cycle into the asset's streaming indicators."""
+        indicators = self.indicators.setdefault(asset, IndicatorSet())
+        cursor = self._indicator_cursor.get(asset, '')
+        
+        # The last bar is still forming, so it is picked up on a later cycle
+        for bar in data[:-1]:
+            if bar['time'] > cursor:
+                indicators.update(bar['price'], bar['high'], bar['low'])
+                cursor = bar['time']
+        
+        self._indicator_cursor[asset] = cursor
+    
+    def get_indicators(self, asset: str) -> Dict[str, Any]:
+        """Get the latest indicator values for an asset."""
+        indicators = self.indicators.get(asset)
+        return indicators.snapshot() if indicators else {}
+    
     def _generate_simulated_data(self, asset):
         """Generate simulated market data."""
         base_prices = {
@@ -435,7 +451,8 @@ class WebBotManager:
                     'change': change,
                     'change_percent': change_percent,
                     'volume': latest['volume'],
-                    'timestamp': latest['time']
+                    'timestamp': latest['time'],
+                    'indicators': self.get_indicators(asset)
                 }
     
     def _simulate_trading_activity(self):
@@ -453,23 +470,52 @@ class WebBotManager:
                     
                     # Update bot stats
                     if trade_type == 'BUY':
-                        bot['stats']['total_pnl'] -= trade_amount * 0.001  # Simulate fees
+                        pnl = -trade_amount * 0.001  # Simulate fees
                     else:
-                        bot['stats']['total_pnl'] += trade_amount * 0.001
+                        pnl = trade_amount * 0.001
                     
-                    bot['stats']['trades_count'] += 1
+                    self.bot_stats.record_trade(bot, pnl)
                     
-                    # Emit trade event
-                    if connected_clients:
-                        socketio.emit('trade_executed', {
-                            'bot_id': bot_id,
-                            'bot_name': bot['name'],
-                            'asset': asset,
-                            'trade_type': trade_type,
-                            'quantity': quantity,
-                            'price': current_price,
-                            'timestamp': datetime.now().isoformat()
-                        })
+                    # Emit trade event to the asset's trade subscribers
+                    publisher.emit('trade_executed', {
+                        'bot_id': bot_id,
+                        'bot_name': bot['name'],
+                        'asset': asset,
+                        'trade_type': trade_type,
+                        'quantity': quantity,
+                        'price': current_price,
+                        'timestamp': datetime.now().isoformat()
+                    }, event_rooms('trades', asset))
+                    self._publish_bot_status(bot_id)
+    
+    def _publish_bot_status(self, bot_id: str):
+        """Send a bot's state to its bot status subscribers."""
+        rooms = event_rooms('bots', bot_id)
+        if publisher.has_members(rooms):
+            bot = self.bots[bot_id]
+            publisher.emit('bot_status', {
+                'bot_id': bot_id,
+                'active': bot['active'],
+                'stats': dict(bot['stats']),
+                'timestamp': datetime.now().isoformat()
+            }, rooms)
+    
+    def _publish_stats(self):
+        """Push the bot totals to bot status subscribers if they changed since the last push."""
+        version = self.bot_stats.version
+        if version == self._published_stats_version:
+            return
+        self._published_stats_version = version
+        publisher.emit('stats_update', {
+            **self.bot_stats.snapshot(),
+            'timestamp': datetime.now().isoformat()
+        }, room_name('bots', ALL))
+    
+    def add_bot(self, bot: Dict[str, Any]):
+        """Register a new bot."""
+        self.bots[bot['id']] = bot
+        self.bot_stats.add_bot(bot)
+        self._publish_stats()
     
     def get_bot(self, bot_id: str) -> Dict[str, Any]:
         """Get bot information."""
@@ -480,15 +526,22 @@ class WebBotManager:
         return self.bots.copy()
     
     def update_bot_config(self, bot_id: str, config: Dict[str, Any]) -> bool:
-        """Update bot configuration."""
-        if bot_id not in self.bots:
+        """Update bot configuration.
+        
+        Runtime fields (stats, active flag) are managed by the bot manager and
+        cannot be set through a configuration update.
+        """
+        if bot_id not in self.bots or not isinstance(config, dict):
+            return False
+        if RUNTIME_BOT_FIELDS & config.keys():
             return False
         
         # Don't allow config changes while bot is active
         if self.bots[bot_id]['active']:
             return False
         
-        self.bots[bot_id].update(config)
+        self.bot_stats.update_bot(self.bots[bot_id], config)
+        self._publish_stats()
         return True
     
     def start_bot(self, bot_id: str) -> bool:
@@ -496,8 +549,10 @@ class WebBotManager:
         if bot_id not in self.bots:
             return False
         
-        self.bots[bot_id]['active'] = True
+        self.bot_stats.set_active(self.bots[bot_id], True)
         self.bots[bot_id]['started'] = time.time()
+        self._publish_bot_status(bot_id)
+        self._publish_stats()
         
         log_manager.log_info(f"Started bot: {self.bots[bot_id]['name']}")
         return True
@@ -507,8 +562,10 @@ class WebBotManager:
         if bot_id not in self.bots:
             return False
         
-        self.bots[bot_id]['active'] = False
+        self.bot_stats.set_active(self.bots[bot_id], False)
         self.bots[bot_id]['stopped'] = time.time()
+        self._publish_bot_status(bot_id)
+        self._publish_stats()
         
         log_manager.log_info(f"Stopped bot: {self.bots[bot_id]['name']}")
         return True
@@ -595,9 +652,13 @@ class WebBotManager:
             
             log_manager.log_info(f"Live trade executed: {trade_type} {quantity} {symbol} @ ${price}")
             
-            # Emit trade event to connected clients
-            if connected_clients:
-                socketio.emit('live_trade_executed', trade_result)
+            if bot_id in self.bots:
+                self.bot_stats.record_trade(self.bots[bot_id])
+                self._publish_bot_status(bot_id)
+                self._publish_stats()
+            
+            # Emit trade event to the symbol's trade subscribers
+            publisher.emit('live_trade_executed', trade_result, event_rooms('trades', symbol.upper()))
             
             return True
             
@@ -649,66 +710,111 @@ def stop_bot(bot_id):
 @app.route('/api/bots/<bot_id>/config', methods=['PUT'])
 def update_bot_config(bot_id):
     """Update bot configuration."""
-    config = request.get_json()
+    config = request.get_json(silent=True)
     if web_bot_manager.update_bot_config(bot_id, config):
         return jsonify({'success': True, 'message': 'Configuration updated'})
     return jsonify({'error': 'Failed to update configuration'}), 400
 
+def _downsample_args():
+    """The `max_points` and `method` query parameters; max_points is None when absent.
+    
+    `method=lttb` (default) keeps the bars that best preserve the price line,
+    `method=minmax` merges bars into one candle per bucket.
+    """
+    raw = request.args.get('max_points')
+    method = request.args.get('method', 'lttb')
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"Unknown method: {method}. Use one of {', '.join(DOWNSAMPLE_METHODS)}")
+    if raw is None:
+        return None, method
+    try:
+        max_points = int(raw)
+    except ValueError:
+        raise ValueError(f"max_points must be an integer, got {raw}")
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+    return max_points, method
+
 @app.route('/api/market-data', methods=['GET'])
 def get_market_data():
-    """Get market data for all assets."""
-    return jsonify(market_data_cache)
+    """Get market data for all assets; `max_points` limits the bars per asset."""
+    try:
+        max_points, method = _downsample_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if max_points is None:
+        return jsonify(market_data_cache)
+    return jsonify({asset: downsample_records(data, max_points, method)
+                    for asset, data in list(market_data_cache.items())})
 
 @app.route('/api/market-data/<asset>', methods=['GET'])
 def get_asset_market_data(asset):
-    """Get market data for specific asset."""
+    """Get market data for specific asset; `max_points` limits the bars returned."""
     timeframe = request.args.get('timeframe', '1h')
+    try:
+        max_points, method = _downsample_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     data = web_bot_manager.get_market_data(asset, timeframe)
+    if max_points is not None:
+        data = downsample_records(data, max_points, method)
     return jsonify(data)
 
+@app.route('/api/market-data/<asset>/indicators', methods=['GET'])
+def get_asset_indicators(asset):
+    """Get streaming indicator values for specific asset."""
+    indicators = web_bot_manager.get_indicators(asset)
+    if not indicators:
+        return jsonify({'error': 'No indicator data available'}), 404
+    return jsonify(indicators)
+
 @app.route('/api/bank/assets', methods=['GET'])
 def bank_list_assets():
-    return jsonify({'assets': read_bank_csv()})
+    return jsonify({'assets': bank_store.list()})
 
 @app.route('/api/bank/assets', methods=['POST'])
 def bank_add_asset():
     incoming = request.get_json() or {}
-    assets = read_bank_csv()
-    assets.append({
-        'id': incoming.get('id') or f"bank_{int(time.time())}",
-        'name': incoming.get('name', ''),
-        'ref': incoming.get('ref', ''),
-        'qty': int(incoming.get('qty') or 0),
-        'value': float(incoming.get('value') or 0)
-    })
-    write_bank_csv(assets)
+    try:
+        bank_store.add({**incoming, 'id': incoming.get('id') or f"bank_{int(time.time())}"})
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid asset: {str(e)}'}), 400
     return jsonify({'success': True})
 
 @app.route('/api/bank/assets/<asset_id>', methods=['PUT'])
 def bank_update_asset(asset_id):
     incoming = request.get_json() or {}
-    assets = read_bank_csv()
-    updated = False
-    for a in assets:
-        if a['id'] == asset_id:
-            a['name'] = incoming.get('name', a['name'])
-            a['ref'] = incoming.get('ref', a['ref'])
-            a['qty'] = int(incoming.get('qty', a['qty']))
-            a['value'] = float(incoming.get('value', a['value']))
-            updated = True
-            break
+    try:
+        updated = bank_store.update(asset_id, incoming)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid asset: {str(e)}'}), 400
     if updated:
-        write_bank_csv(assets)
         return jsonify({'success': True})
     return jsonify({'error': 'Not found'}), 404
 
 @app.route('/api/bank/assets/<asset_id>', methods=['DELETE'])
 def bank_delete_asset(asset_id):
-    assets = read_bank_csv()
-    assets = [a for a in assets if a['id'] != asset_id]
-    write_bank_csv(assets)
+    bank_store.delete(asset_id)
     return jsonify({'success': True})
 
+@app.route('/api/bank/assets/export', methods=['GET'])
+def bank_export_assets():
+    """Download all Digital Bank assets as CSV."""
+    response = make_response(bank_store.export_csv())
+    response.headers['Content-Type'] = 'text/csv'
+    response.headers['Content-Disposition'] = 'attachment; filename=digital_bank.csv'
+    return response
+
+@app.route('/api/bank/assets/import', methods=['POST'])
+def bank_import_assets():
+    """Add or replace assets from an uploaded CSV (`id,name,ref,qty,value` header)."""
+    upload = request.files.get('file')
+    text = upload.read().decode('utf-8') if upload else request.get_data(as_text=True)
+    if not text.strip():
+        return jsonify({'error': 'CSV data required'}), 400
+    imported = bank_store.import_csv(StringIO(text))
+    return jsonify({'success': True, 'imported': imported})
+
 @app.route('/api/ticker', methods=['GET'])
 def get_ticker_data():
     """Get ticker data."""
@@ -717,43 +823,126 @@ def get_ticker_data():
 @app.route('/api/stats', methods=['GET'])
 def get_stats():
     """Get overall statistics."""
-    total_pnl = sum(bot['stats']['total_pnl'] for bot in web_bot_manager.bots.values())
-    daily_pnl = sum(bot['stats']['daily_pnl'] for bot in web_bot_manager.bots.values())
-    active_bots = sum(1 for bot in web_bot_manager.bots.values() if bot['active'])
-    total_trades = sum(bot['stats']['trades_count'] for bot in web_bot_manager.bots.values())
-    
     return jsonify({
-        'total_pnl': total_pnl,
-        'daily_pnl': daily_pnl,
-        'active_bots': active_bots,
-        'total_trades': total_trades,
+        **web_bot_manager.bot_stats.snapshot(),
         'timestamp': datetime.now().isoformat()
     })
 
 @app.route('/api/export', methods=['GET'])
 def export_data():
-    """Export all data."""
-    export_data = {
-        'bots': web_bot_manager.get_all_bots(),
-        'market_data': market_data_cache,
-        'ticker_data': ticker_data_cache,
-        'timestamp': datetime.now().isoformat()
-    }
-    return jsonify(export_data)
+    """Stream an export as NDJSON, one record per line.
+
+    `sections` (bots, market_data, ticker_data, trades), `assets` and a
+    `start`/`end` time range narrow it down; `format=gzip` compresses it.
+    """
+    try:
+        export_filter = ExportFilter.from_args(request.args)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unknown format: {export_format}. Use one of {', '.join(EXPORT_FORMATS)}"}), 400
+
+    records = export_records(export_filter, web_bot_manager.get_all_bots(), market_data_cache, ticker_data_cache,
+                             trades=lambda start, end: trade_journal.iter_trades(start=start, end=end))
+    chunks = ndjson_chunks(records)
+    filename = f"atb_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+    if export_format == 'gzip':
+        chunks, mimetype, filename = gzip_chunks(chunks), 'application/gzip', filename + '.gz'
+    else:
+        mimetype = 'application/x-ndjson'
+    response = Response(chunks, mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
 
 @app.route('/api/bots/state', methods=['GET'])
 def bots_state_get():
-    return jsonify(read_bot_state())
+    """Each bot's metrics, trade count (`botCounts`) and most recent trades.
+    
+    `recent` sets how many trades per bot are returned (default
+    BOT_STATE_RECENT_TRADES); older ones are paged through /api/bots/trades.
+    `recent=all` returns the legacy full dump.
+    """
+    recent = request.args.get('recent', str(BOT_STATE_RECENT_TRADES))
+    if recent == 'all':
+        return jsonify(trade_journal.state())
+    try:
+        recent = int(recent)
+    except ValueError:
+        return jsonify({'error': 'recent must be an integer or "all"'}), 400
+    if recent < 0:
+        return jsonify({'error': 'recent must be non-negative'}), 400
+    return jsonify(trade_journal.state(recent))
 
 @app.route('/api/bots/state', methods=['POST'])
 def bots_state_post():
+    """Save full per-bot trade lists; only trades the journal lacks are appended."""
     payload = request.get_json() or {}
-    safe = {
-        'botTrades': payload.get('botTrades', {}),
-        'botMetrics': payload.get('botMetrics', {})
-    }
-    write_bot_state(safe)
-    return jsonify({'success': True})
+    bot_trades = payload.get('botTrades') or {}
+    bot_metrics = payload.get('botMetrics') or {}
+    if not isinstance(bot_trades, dict) or not isinstance(bot_metrics, dict):
+        return jsonify({'error': 'botTrades and botMetrics must be objects keyed by bot id'}), 400
+    if not all(trades is None or (isinstance(trades, list) and all(isinstance(t, dict) for t in trades))
+               for trades in bot_trades.values()):
+        return jsonify({'error': 'botTrades must map bot ids to lists of trade objects'}), 400
+    if not all(metrics is None or isinstance(metrics, dict) for metrics in bot_metrics.values()):
+        return jsonify({'error': 'botMetrics must map bot ids to objects'}), 400
+    counts = {}
+    for bot_id in set(bot_trades) | set(bot_metrics):
+        trades = bot_trades.get(bot_id)
+        if trades is None:
+            counts[bot_id] = trade_journal.append(bot_id, [], metrics=bot_metrics.get(bot_id))
+        else:
+            counts[bot_id] = trade_journal.sync(bot_id, trades, bot_metrics.get(bot_id))
+    return jsonify({'success': True, 'counts': counts})
+
+def _time_arg(name: str) -> Optional[float]:
+    """A time query parameter as epoch milliseconds, given as milliseconds or ISO 8601."""
+    raw = request.args.get(name)
+    return parse_time_ms(raw, name) if raw else None
+
+@app.route('/api/bots/trades', methods=['GET'])
+def get_journal_trades():
+    """Page through journaled trades, filtered by `bot_id` and a `start`/`end` time range."""
+    return _journal_page(request.args.get('bot_id'))
+
+@app.route('/api/bots/<bot_id>/trades', methods=['GET'])
+def get_bot_trades(bot_id):
+    """Page through one bot's journaled trades."""
+    return _journal_page(bot_id)
+
+def _journal_page(bot_id: Optional[str]):
+    try:
+        start, end = _time_arg('start'), _time_arg('end')
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 100))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if offset < 0 or not 1 <= limit <= 1000:
+        return jsonify({'error': 'offset must be non-negative and limit between 1 and 1000'}), 400
+    return jsonify(trade_journal.trades(bot_id, start, end, offset, limit))
+
+@app.route('/api/bots/<bot_id>/trades', methods=['POST'])
+def append_bot_trades(bot_id):
+    """Append a bot's new trades.
+
+    `offset` is the position of the first trade sent, so a retried batch is
+    not stored twice; an offset past the stored trades is refused with 409.
+    """
+    payload = request.get_json() or {}
+    trades = payload.get('trades', [])
+    metrics = payload.get('metrics')
+    if (not isinstance(trades, list) or not all(isinstance(trade, dict) for trade in trades)
+            or (metrics is not None and not isinstance(metrics, dict))):
+        return jsonify({'error': 'trades must be a list of objects and metrics an object'}), 400
+    offset = payload.get('offset')
+    if offset is not None and (not isinstance(offset, int) or isinstance(offset, bool)):
+        return jsonify({'error': 'offset must be an integer'}), 400
+    try:
+        count = trade_journal.append(bot_id, trades, offset, metrics)
+    except ValueError as e:
+        return jsonify({'error': str(e), 'count': trade_journal.count(bot_id)}), 409
+    return jsonify({'success': True, 'count': count})
 
 @app.route('/api/broker/connect', methods=['POST'])
 def connect_broker():
@@ -857,7 +1046,7 @@ def add_market():
     bot_id = f"bot_{int(time.time())}"
     bot_name = f"{market_data['name']} Bot"
     
-    web_bot_manager.bots[bot_id] = {
+    web_bot_manager.add_bot({
         'id': bot_id,
         'name': bot_name,
         'asset': market_data['symbol'],
@@ -877,7 +1066,7 @@ def add_market():
             'trades_count': 0,
             'win_rate': 0
         }
-    }
+    })
     
     return jsonify({'success': True, 'bot_id': bot_id, 'message': f'Added {bot_name}'})
 
@@ -916,184 +1105,165 @@ def remove_investment(investment_id):
 
 @app.route('/api/market-data/<asset>/history', methods=['GET'])
 def get_market_history(asset):
-    """Get historical market data for zoom functionality."""
-    history = web_bot_manager.market_data_history.get(asset, [])
-    return jsonify(history)
+    """Get historical market data for zoom functionality.
+    
+    Optional `start` and `end` query parameters (ISO timestamps) limit the range,
+    and `max_points` the number of bars.
+    """
+    history = web_bot_manager.market_data_history.get(asset)
+    if history is None:
+        return jsonify([])
+    try:
+        max_points, method = _downsample_args()
+        if max_points is None:
+            return jsonify(history.to_records(request.args.get('start'), request.args.get('end')))
+        times, values = history.copy(request.args.get('start'), request.args.get('end'))
+        positions, values = downsample_bars(values, max_points, method, x=times)
+        columns = bars_to_columns(history.index(times[positions]), values[0], values[1], values[2],
+                                  values[3], values[4])
+        return jsonify(columns_to_records(columns))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+def _fetch_timeframe(asset: str, period: str, interval: str):
+    """An OHLCV frame from Yahoo Finance; yfinance is imported on the first download."""
+    import yfinance as yf
+    return yf.Ticker(asset).history(period=period, interval=interval)
+
+# Timeframe charts are shared by every browser, so identical requests reuse one download
+timeframe_cache = TimeframeCache(
+    _fetch_timeframe,
+    ttls=settings.get('market_data.timeframe_ttl', {}),
+    budget_bytes=int(settings.get('market_data.timeframe_cache_mb', 64) * 1024 * 1024)
+)
 
 @app.route('/api/market-data/<asset>/timeframe', methods=['GET'])
 def get_market_data_timeframe(asset):
-    """Get market data for specific timeframe."""
+    """Get market data for specific timeframe.
+    
+    Bars come from the timeframe store, resampled from minute and daily
+    history, and from a cached yfinance download until the asset is stored.
+    `format=columns` returns one list per field instead of a list of bars,
+    and `max_points` limits the number of bars.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
+    """
     timeframe = request.args.get('timeframe', '1d')
-    tf_map = {
-        '1m': ('1d', '1m'),
-        '5m': ('5d', '5m'),
-        '15m': ('5d', '15m'),
-        '1h': ('7d', '60m'),
-        '4h': ('1mo', '60m'),
-        '1d': ('1mo', '1d'),
-        '1w': ('3mo', '1d'),
-        '1M': ('6mo', '1d'),
-        '3M': ('1y', '1d'),
-        '6M': ('2y', '1d'),
-        '1y': ('5y', '1d')
-    }
-    period, interval = tf_map.get(timeframe, ('1mo', '1d'))
+    layout = request.args.get('format', 'records')
+    bar_timeframe, period = CHART_TIMEFRAMES.get(timeframe, DEFAULT_CHART_TIMEFRAME)
     try:
-        ticker = yf.Ticker(asset)
-        hist = ticker.history(period=period, interval=interval)
-        if not hist.empty:
-            data = []
-            for timestamp, row in hist.iterrows():
-                data.append({
-                    'time': timestamp.isoformat(),
-                    'price': float(row['Close']),
-                    'volume': int(row.get('Volume', 0) or 0),
-                    'high': float(row['High']),
-                    'low': float(row['Low']),
-                    'open': float(row['Open'])
-                })
-            return jsonify(data)
-        return jsonify({'error': 'No data available'}), 404
+        max_points, method = _downsample_args()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    try:
+        clean_asset = asset.replace('-USD', '').replace('=F', '')
+        etag = None
+        bars = web_bot_manager.timeframe_store.bars(clean_asset, bar_timeframe, PERIODS[period])
+        if bars is None:
+            entry = timeframe_cache.get(asset, period, YFINANCE_INTERVALS[bar_timeframe])
+            # The cached frame's tag and the shaping options identify the response without rehashing
+            etag = f"{entry.etag}-{bar_timeframe}-{max_points}-{method}-{layout}"
+            if request.if_none_match.contains(etag):
+                return _timeframe_response(make_response('', 304), etag)
+            hist = entry.frame
+            if bar_timeframe == '4h' and not hist.empty:
+                hist = resample_frame(hist, bar_timeframe)
+            bars = hist.index, frame_values(hist)
+        index, values = bars
+        if len(index) == 0:
+            return jsonify({'error': 'No data available'}), 404
+        if max_points is not None:
+            positions, values = downsample_bars(values, max_points, method,
+                                                x=index.to_numpy(dtype='datetime64[ns]').view(np.int64))
+            index = index[positions]
+        
+        if etag is None:
+            # Stored bars change with every update, so they are hashed per request
+            etag = f"{bars_etag(index, values)}-{layout}"
+            if request.if_none_match.contains(etag):
+                return _timeframe_response(make_response('', 304), etag)
+        columns = bars_to_columns(index, values[0], values[1], values[2], values[3], values[4])
+        return _timeframe_response(jsonify(columns if layout == 'columns' else columns_to_records(columns)), etag)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _timeframe_response(response, etag: str):
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+# Market review PDFs render on a worker pool and are reused within the hour
+report_jobs = ReportJobs(
+    workers=settings.get('reports.workers', 2),
+    cache_size=settings.get('reports.cache_size', 32),
+    bucket_seconds=settings.get('reports.cache_seconds', 3600)
+)
+atexit.register(report_jobs.shutdown)
+
+def _render_market_review(bot_id: Optional[str]) -> bytes:
+    trades = None
+    if bot_id:
+        total = trade_journal.count(bot_id)
+        trades = trade_journal.trades(bot_id, offset=max(total - 50, 0), limit=50)['trades']
+    data = build_report_data(dict(market_data_cache), dict(ticker_data_cache), web_bot_manager.get_all_bots(),
+                             web_bot_manager.bot_stats.snapshot(), trades, bot_id)
+    return render_market_review_pdf(data)
+
+def _submit_market_review():
+    """Queue a market review for the request's `bot_id`, or join an identical one."""
+    bot_id = request.args.get('bot_id') or (request.get_json(silent=True) or {}).get('bot_id') or None
+    # New trades for the bot change the report; otherwise it is reused within the hour
+    inputs = {'report': 'market_review', 'bot_id': bot_id,
+              'trades': trade_journal.count(bot_id) if bot_id else None}
+    return report_jobs.submit(inputs, lambda: _render_market_review(bot_id))
+
+def _job_status(job):
+    status = job.to_dict()
+    status['status_url'] = f"/api/market-review/jobs/{job.id}"
+    status['download_url'] = f"/api/market-review/jobs/{job.id}/pdf"
+    return status
+
+def _pdf_response(job):
+    result = report_jobs.result(job.id)
+    if result is None:
+        return jsonify({'error': 'Report is no longer cached; request it again'}), 410
+    response = make_response(result)
+    response.headers['Content-Type'] = 'application/pdf'
+    response.headers['Content-Disposition'] = f'attachment; filename=market_review_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+    return response
+
+@app.route('/api/market-review/jobs', methods=['POST'])
+def submit_market_review():
+    """Start rendering a market review PDF; poll the returned job until it is done."""
+    job = _submit_market_review()
+    return jsonify(_job_status(job)), 200 if job.status == DONE else 202
+
+@app.route('/api/market-review/jobs/<job_id>', methods=['GET'])
+def market_review_status(job_id):
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(_job_status(job))
+
+@app.route('/api/market-review/jobs/<job_id>/pdf', methods=['GET'])
+def download_market_review(job_id):
+    job = report_jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.status == FAILED:
+        return jsonify({'error': f'PDF generation failed: {job.error}'}), 500
+    if job.status != DONE:
+        return jsonify(_job_status(job)), 202
+    return _pdf_response(job)
+
 @app.route('/api/market-review/pdf', methods=['GET'])
 def generate_market_review_pdf():
-    """Generate PDF report for market review."""
-    try:
-        # Create PDF buffer
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
-        
-        # Get styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24, spaceAfter=30, alignment=TA_CENTER)
-        heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=16, spaceAfter=12)
-        
-        # Build PDF content
-        story = []
-        
-        # Title
-        story.append(Paragraph("ATB - Auto Trading Bot Market Review", title_style))
-        story.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y at %I:%M %p')}", styles['Normal']))
-        story.append(Spacer(1, 20))
-        
-        # Market Summary
-        story.append(Paragraph("Market Summary", heading_style))
-        story.append(Paragraph("Daily market performance analysis and dramatic shifts.", styles['Normal']))
-        story.append(Spacer(1, 12))
-        
-        # Market Performance Table
-        markets_data = [
-            ['Market', 'Symbol', 'Current Price', 'Daily Change', 'Volatility'],
-            ['Silver Futures', 'SI=F', '$24.50', '+2.1%', 'Medium'],
-            ['Gold Futures', 'GC=F', '$1,950.00', '-0.5%', 'Low'],
-            ['Crude Oil', 'CL=F', '$75.30', '+3.2%', 'High'],
-            ['Bitcoin', 'BTC-USD', '$45,000.00', '+15.2%', 'Very High'],
-            ['Apple', 'AAPL', '$150.00', '+1.8%', 'Low'],
-            ['Tesla', 'TSLA', '$200.00', '+12.3%', 'High']
-        ]
-        
-        market_table = Table(markets_data)
-        market_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(market_table)
-        story.append(Spacer(1, 20))
-        
-        # Dramatic Shifts
-        story.append(Paragraph("Dramatic Market Shifts", heading_style))
-        shifts_data = [
-            ['Time', 'Market', 'Event', 'Impact'],
-            ['09:30 AM', 'BTC', 'Bitcoin surged 15% in the last hour', '+15.2%'],
-            ['10:15 AM', 'SI=F', 'Silver dropped 8% due to volatility', '-8.1%'],
-            ['11:00 AM', 'TSLA', 'Tesla gained 12% on earnings', '+12.3%'],
-            ['02:30 PM', 'GC=F', 'Gold stabilized after morning dip', '+2.1%']
-        ]
-        
-        shifts_table = Table(shifts_data)
-        shifts_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(shifts_table)
-        story.append(Spacer(1, 20))
-        
-        # Bot Performance
-        story.append(Paragraph("Bot Performance Summary", heading_style))
-        bot_data = [
-            ['Bot Name', 'Asset', 'Status', 'P&L', 'Trades'],
-            ['Stock Bot 1', 'AAPL', 'Active', '+$1,250.00', '15'],
-            ['Crypto Bot 1', 'BTC', 'Active', '+$3,450.00', '8'],
-            ['Commodity Bot 1', 'SI=F', 'Paused', '-$150.00', '3'],
-            ['Stock Bot 2', 'GOOGL', 'Active', '+$890.00', '12']
-        ]
-        
-        bot_table = Table(bot_data)
-        bot_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkgreen),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgreen),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(bot_table)
-        story.append(Spacer(1, 20))
-        
-        # If requested, include a specific bot's trades (simple example)
-        bot_id = request.args.get('bot_id')
-        if bot_id:
-            state = read_bot_state()
-            trades = state.get('botTrades', {}).get(bot_id, [])
-            story.append(Paragraph(f"Trades for {bot_id}", heading_style))
-            trades_data = [['Time', 'Type', 'Price']]
-            for t in trades[-50:]:
-                ts = datetime.fromtimestamp(t.get('timestamp', time.time())/1000.0).strftime('%Y-%m-%d %H:%M') if t.get('timestamp') else '-'
-                trades_data.append([ts, t.get('type','-'), f"${t.get('price',0):.2f}"])
-            ttable = Table(trades_data)
-            ttable.setStyle(TableStyle([
-                ('GRID', (0,0), (-1,-1), 1, colors.black),
-                ('BACKGROUND', (0,0), (-1,0), colors.darkgrey),
-                ('TEXTCOLOR', (0,0), (-1,0), colors.whitesmoke),
-            ]))
-            story.append(ttable)
-        
-        # Footer
-        story.append(Paragraph("This report was generated automatically by the ATB Auto Trading Bot Dashboard.", styles['Normal']))
-        story.append(Paragraph("For more information, visit the dashboard at http://localhost:5000", styles['Normal']))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        
-        # Create response
-        response = make_response(buffer.getvalue())
-        response.headers['Content-Type'] = 'application/pdf'
-        response.headers['Content-Disposition'] = f'attachment; filename=market_review_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
-        
-        return response
-        
-    except Exception as e:
-        return jsonify({'error': f'PDF generation failed: {str(e)}'}), 500
+    """Market review PDF in one request: waits for the background job, or a cached report."""
+    job = report_jobs.wait(_submit_market_review().id, timeout=settings.get('reports.wait_timeout', 60.0))
+    if job.status == FAILED:
+        return jsonify({'error': f'PDF generation failed: {job.error}'}), 500
+    if job.status != DONE:
+        return jsonify(_job_status(job)), 202
+    return _pdf_response(job)
 
 # WebSocket Events
 @socketio.on('connect')
@@ -1102,11 +1272,15 @@ def handle_connect():
     connected_clients.add(request.sid)
     log_manager.log_info(f"Client connected: {request.sid}")
     
-    # Send initial data
+    # Every channel for every symbol until the client narrows it with subscribe/unsubscribe
+    for channel in ('market', 'trades', 'bots'):
+        join_room(room_name(channel, ALL))
+    
+    # Send initial data; market_delta events continue from its seq
+    snapshot = web_bot_manager.market_stream.snapshot()
     emit('initial_data', {
         'bots': web_bot_manager.get_all_bots(),
-        'market_data': market_data_cache,
-        'ticker_data': ticker_data_cache
+        **snapshot
     })
 
 @socketio.on('disconnect')
@@ -1115,6 +1289,48 @@ def handle_disconnect():
     connected_clients.discard(request.sid)
     log_manager.log_info(f"Client disconnected: {request.sid}")
 
+@socketio.on('market_resync')
+def handle_market_resync(data=None):
+    """Send a fresh snapshot to a client that missed a market_delta sequence number."""
+    emit('market_snapshot', web_bot_manager.market_stream.snapshot())
+
+@socketio.on('subscribe')
+def handle_subscribe(data):
+    """Join the rooms of a channel for some symbols and send their current state."""
+    try:
+        channel, symbols = parse_subscription(data)
+    except ValueError as e:
+        emit('subscription_error', {'error': str(e)})
+        return
+    
+    for symbol in symbols:
+        join_room(room_name(channel, symbol))
+    
+    result = {'channel': channel, 'symbols': symbols}
+    if channel == 'market':
+        if ALL in symbols:
+            result['snapshot'] = web_bot_manager.market_stream.snapshot()
+        else:
+            # symbol_delta events continue from each asset's seq
+            result['assets'] = web_bot_manager.market_stream.asset_snapshot(symbols)
+    elif channel == 'bots':
+        bots = web_bot_manager.get_all_bots()
+        result['bots'] = bots if ALL in symbols else {bot_id: bots[bot_id] for bot_id in symbols if bot_id in bots}
+    emit('subscribed', result)
+
+@socketio.on('unsubscribe')
+def handle_unsubscribe(data):
+    """Leave the rooms of a channel for some symbols."""
+    try:
+        channel, symbols = parse_subscription(data)
+    except ValueError as e:
+        emit('subscription_error', {'error': str(e)})
+        return
+    
+    for symbol in symbols:
+        leave_room(room_name(channel, symbol))
+    emit('unsubscribed', {'channel': channel, 'symbols': symbols})
+
 @socketio.on('bot_action')
 def handle_bot_action(data):
     """Handle bot actions from client."""